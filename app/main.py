@@ -3,7 +3,7 @@ import sys
 from pathlib import Path
 
 from PyQt5.QtCore import QSize, Qt
-from PyQt5.QtGui import QColor, QFont, QIcon, QPixmap
+from PyQt5.QtGui import QColor, QFont, QIcon, QKeySequence, QPixmap
 from PyQt5.QtWidgets import (
     QApplication,
     QFrame,
@@ -12,6 +12,7 @@ from PyQt5.QtWidgets import (
     QLabel,
     QMainWindow,
     QPushButton,
+    QShortcut,
     QSizePolicy,
     QSpacerItem,
     QStackedWidget,
@@ -20,6 +21,8 @@ from PyQt5.QtWidgets import (
 )
 
 from db import connection
+from db.change_listener import change_listener
+from db.dashboard_refresh import dashboard_refresher
 
 # Import your views
 from ui import crud_view
@@ -28,10 +31,15 @@ from ui.audit_log_view import AuditLogView
 from ui.report_analytics_view import Report_analytics
 from ui.reservation_view import ReservationView
 from ui.results_processing_view import ResultsProcessingView
+from ui.view_cache import ViewCache
 
 BASE_DIR = Path(__file__).parent.resolve()
 LOGO_PATH = os.path.join(BASE_DIR, "image_9038d0.png")
 
+# Navigation cache: how many section views stay alive, and an optional RSS budget
+MAX_CACHED_VIEWS = 4
+VIEW_MEMORY_BUDGET_MB = None
+
 
 class SideButton(QPushButton):
     """Sleek minimalist sidebar button"""
@@ -128,6 +136,28 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(self.sidebar)
         main_layout.addWidget(self.content_stack)
 
+        # One live view per section, created on first visit
+        self.view_cache = ViewCache(
+            self.content_stack,
+            max_views=MAX_CACHED_VIEWS,
+            memory_budget_mb=VIEW_MEMORY_BUDGET_MB,
+        )
+        self.view_cache.register("crud", lambda: crud_view.CrudView())
+        self.view_cache.register("scheduling", lambda: ReservationView(self))
+        self.view_cache.register("analytics", lambda: Report_analytics())
+        self.view_cache.register("academic", lambda: AcademicRecordsView(self))
+        self.view_cache.register("audit", lambda: AuditLogView(self))
+        self.view_cache.register("results", lambda: ResultsProcessingView(self))
+        self.current_section = None
+
+        # F5 reloads the visible section
+        QShortcut(QKeySequence("F5"), self, activated=self.refresh_current_section)
+
+        # Drop cached lookups when another workstation writes to the database
+        change_listener.start()
+        # Keep the statistics dashboards' materialized views fresh
+        dashboard_refresher.start()
+
     def apply_cyber_style(self):
         self.setStyleSheet(
             """
@@ -186,35 +216,36 @@ class MainWindow(QMainWindow):
             btn.setChecked(False)
         sender.setChecked(True)
 
+    def show_section(self, key):
+        self.current_section = key
+        return self.view_cache.show(key)
+
+    def refresh_current_section(self):
+        if self.current_section:
+            self.view_cache.refresh(self.current_section)
+
+    def closeEvent(self, event):
+        dashboard_refresher.stop()
+        change_listener.stop()
+        super().closeEvent(event)
+
     def show_crud_menu(self):
-        inst = crud_view.CrudView()
-        self.content_stack.addWidget(inst)
-        self.content_stack.setCurrentWidget(inst)
+        self.show_section("crud")
 
     def show_staff_scheduling(self):
-        inst = ReservationView(self)
-        self.content_stack.addWidget(inst)
-        self.content_stack.setCurrentWidget(inst)
+        self.show_section("scheduling")
 
     def show_reports_analytics(self):
-        inst = Report_analytics()
-        self.content_stack.addWidget(inst)
-        self.content_stack.setCurrentWidget(inst)
+        self.show_section("analytics")
 
     def show_academic_records(self):
-        inst = AcademicRecordsView(self)
-        self.content_stack.addWidget(inst)
-        self.content_stack.setCurrentWidget(inst)
+        self.show_section("academic")
 
     def show_audit_records(self):
-        inst = AuditLogView(self)
-        self.content_stack.addWidget(inst)
-        self.content_stack.setCurrentWidget(inst)
+        self.show_section("audit")
 
     def show_results_processing(self):
-        inst = ResultsProcessingView(self)
-        self.content_stack.addWidget(inst)
-        self.content_stack.setCurrentWidget(inst)
+        self.show_section("results")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
 from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.lookup_cache import cached_lookup, invalidates
 
 
 class ActivityCRUD:
     @staticmethod
+    @invalidates("Activity")
     def create_activity(course_id, department_id, activity_type):
         """
         Create an activity and its corresponding subtype (Lecture/Tutorial/Practical)
@@ -121,6 +123,7 @@ class ActivityCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Activity")
     def update_activity(activity_id, course_id, department_id, activity_type):
         """
         Update activity - NOTE: Changing activity_type will require special handling
@@ -221,6 +224,7 @@ class ActivityCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Activity")
     def delete_activity(activity_id):
         """
         Delete activity - CASCADE will handle subtype table deletion
@@ -269,6 +273,7 @@ class ActivityCRUD:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Course")
     def get_all_courses():
         """Helper method to get courses for dropdown"""
         connection = None
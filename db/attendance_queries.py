@@ -1,6 +1,8 @@
 # db/attendance_queries.py
 
 from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.lookup_cache import cached_lookup
+from db.pagination import DEFAULT_PAGE_SIZE, Keyset
 
 
 class AttendanceQueries:
@@ -78,18 +80,155 @@ class AttendanceQueries:
             close_cursor(cursor)
             close_connection(connection)
 
+    @staticmethod
+    def _attendance_query(activity_type=None, search_term="", keyset=None):
+        """
+        Statement behind get_all_attendance. With a keyset, the page is cut in
+        `listed`, so percentages are only computed for its rows, and the last
+        two columns are the page_sort/page_key of Keyset.page().
+        """
+        page_columns = ", " + keyset.columns() if keyset else ""
+        page_tail = ", L.page_sort, L.page_key" if keyset else ""
+
+        # Base SQL query using UNION to combine all attendance types
+        sql = """
+            WITH matched AS (
+            SELECT
+                S.first_name || ' ' || S.last_name AS student_name,
+                'Lecture' AS activity_type,
+                LA.attendance_date,
+                LA.attended,
+                LA.attendance_time,
+                LA.special_accommodations,
+                LA.student_id,
+                LA.activity_id
+            FROM Student_Lecture_Attendance LA
+            JOIN Student S ON LA.student_id = S.student_id
+            WHERE 1=1
+        """
+        params = []
+
+        # Add activity type filter for Lecture
+        if activity_type and activity_type != "Lecture":
+            sql += " AND 1=0"  # Exclude lectures if filtering for other types
+
+        # Add search filter
+        if search_term:
+            sql += " AND (S.first_name ILIKE %s OR S.last_name ILIKE %s)"
+            params.extend([f"%{search_term}%", f"%{search_term}%"])
+
+        # UNION with Tutorial attendance
+        sql += """
+            UNION ALL
+            SELECT
+                S.first_name || ' ' || S.last_name AS student_name,
+                'Tutorial' AS activity_type,
+                TA.attendance_date,
+                TA.attended,
+                TA.attendance_time,
+                TA.special_accommodations,
+                TA.student_id,
+                TA.activity_id
+            FROM Student_Tutorial_Attendance TA
+            JOIN Student S ON TA.student_id = S.student_id
+            WHERE 1=1
+        """
+
+        # Add filters for Tutorial
+        if activity_type and activity_type != "Tutorial":
+            sql += " AND 1=0"
+
+        if search_term:
+            sql += " AND (S.first_name ILIKE %s OR S.last_name ILIKE %s)"
+            params.extend([f"%{search_term}%", f"%{search_term}%"])
+
+        # UNION with Practical attendance
+        sql += """
+            UNION ALL
+            SELECT
+                S.first_name || ' ' || S.last_name AS student_name,
+                'Practical' AS activity_type,
+                PA.attendance_date,
+                PA.attended,
+                PA.attendance_time,
+                PA.special_accommodations,
+                PA.student_id,
+                PA.activity_id
+            FROM Student_Practical_Attendance PA
+            JOIN Student S ON PA.student_id = S.student_id
+            WHERE 1=1
+        """
+
+        # Add filters for Practical
+        if activity_type and activity_type != "Practical":
+            sql += " AND 1=0"
+
+        if search_term:
+            sql += " AND (S.first_name ILIKE %s OR S.last_name ILIKE %s)"
+            params.extend([f"%{search_term}%", f"%{search_term}%"])
+
+        sql += f"""
+            ),
+            listed AS (
+                SELECT M.*{page_columns} FROM matched M
+        """
+        if keyset:
+            condition, keyset_params = keyset.condition()
+            sql += f" WHERE {condition}" + keyset.order_by() + keyset.limit()
+            params += keyset_params
+
+        # Percentage per (student, activity) over all three tables, only for listed pairs
+        sql += f"""
+            ),
+            totals AS (
+                SELECT
+                    A.student_id,
+                    A.activity_id,
+                    COUNT(*) AS total,
+                    COUNT(*) FILTER (WHERE A.attended) AS attended_count
+                FROM (
+                    SELECT student_id, activity_id, attended FROM Student_Lecture_Attendance
+                    UNION ALL
+                    SELECT student_id, activity_id, attended FROM Student_Tutorial_Attendance
+                    UNION ALL
+                    SELECT student_id, activity_id, attended FROM Student_Practical_Attendance
+                ) AS A
+                WHERE (A.student_id, A.activity_id) IN (
+                    SELECT student_id, activity_id FROM listed
+                )
+                GROUP BY A.student_id, A.activity_id
+            )
+            SELECT
+                L.student_name, L.activity_type, L.attendance_date, L.attended,
+                L.attendance_time, L.special_accommodations, L.student_id, L.activity_id,
+                (T.attended_count * 100.0 / T.total)::float8 AS attendance_percent{page_tail}
+            FROM listed L
+            JOIN totals T
+                ON T.student_id = L.student_id AND T.activity_id = L.activity_id
+        """
+
+        # Order results
+        if keyset:
+            sql += keyset.order_by("L.page_sort", "L.page_key") + ";"
+        else:
+            sql += " ORDER BY L.attendance_date DESC, L.student_name;"
+        return sql, params
+
     @staticmethod
     def get_all_attendance(activity_type=None, search_term=""):
         """
         Retrieves all attendance records with optional filtering.
         Uses UNION to combine results from all three attendance tables.
+        The attendance percentage of each (student, activity) pair is computed
+        in the same statement, over all of its records (filters do not apply).
 
         Args:
             activity_type: Filter by activity type ("Lecture", "Tutorial", "Practical") or None for all
             search_term: Search by student name (partial match)
 
         Returns:
-            list: List of tuples (student_name, activity_type, date, attended, time, accommodations, student_id, activity_id)
+            list: List of tuples (student_name, activity_type, date, attended, time, accommodations,
+                  student_id, activity_id, attendance_percent)
         """
         connection = None
         cursor = None
@@ -97,91 +236,45 @@ class AttendanceQueries:
             connection = get_connection()
             cursor = get_cursor(connection)
 
-            # Base SQL query using UNION to combine all attendance types
-            sql = """
-                SELECT
-                    S.first_name || ' ' || S.last_name AS student_name,
-                    'Lecture' AS activity_type,
-                    LA.attendance_date,
-                    LA.attended,
-                    LA.attendance_time,
-                    LA.special_accommodations,
-                    LA.student_id,
-                    LA.activity_id
-                FROM Student_Lecture_Attendance LA
-                JOIN Student S ON LA.student_id = S.student_id
-                WHERE 1=1
-            """
-            params = []
-
-            # Add activity type filter for Lecture
-            if activity_type and activity_type != "Lecture":
-                sql += " AND 1=0"  # Exclude lectures if filtering for other types
-
-            # Add search filter
-            if search_term:
-                sql += " AND (S.first_name ILIKE %s OR S.last_name ILIKE %s)"
-                params.extend([f"%{search_term}%", f"%{search_term}%"])
-
-            # UNION with Tutorial attendance
-            sql += """
-                UNION ALL
-                SELECT
-                    S.first_name || ' ' || S.last_name AS student_name,
-                    'Tutorial' AS activity_type,
-                    TA.attendance_date,
-                    TA.attended,
-                    TA.attendance_time,
-                    TA.special_accommodations,
-                    TA.student_id,
-                    TA.activity_id
-                FROM Student_Tutorial_Attendance TA
-                JOIN Student S ON TA.student_id = S.student_id
-                WHERE 1=1
-            """
-
-            # Add filters for Tutorial
-            if activity_type and activity_type != "Tutorial":
-                sql += " AND 1=0"
-
-            if search_term:
-                sql += " AND (S.first_name ILIKE %s OR S.last_name ILIKE %s)"
-                params.extend([f"%{search_term}%", f"%{search_term}%"])
-
-            # UNION with Practical attendance
-            sql += """
-                UNION ALL
-                SELECT
-                    S.first_name || ' ' || S.last_name AS student_name,
-                    'Practical' AS activity_type,
-                    PA.attendance_date,
-                    PA.attended,
-                    PA.attendance_time,
-                    PA.special_accommodations,
-                    PA.student_id,
-                    PA.activity_id
-                FROM Student_Practical_Attendance PA
-                JOIN Student S ON PA.student_id = S.student_id
-                WHERE 1=1
-            """
-
-            # Add filters for Practical
-            if activity_type and activity_type != "Practical":
-                sql += " AND 1=0"
+            sql, params = AttendanceQueries._attendance_query(activity_type, search_term)
+            cursor.execute(sql, params)
+            return cursor.fetchall()
 
-            if search_term:
-                sql += " AND (S.first_name ILIKE %s OR S.last_name ILIKE %s)"
-                params.extend([f"%{search_term}%", f"%{search_term}%"])
+        except Exception as e:
+            print(f"❌ Error fetching attendance: {e}")
+            return []
 
-            # Order results
-            sql += " ORDER BY attendance_date DESC, student_name;"
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
 
+    @staticmethod
+    def get_attendance_page(activity_type=None, search_term="",
+                            page_size=DEFAULT_PAGE_SIZE, after=None):
+        """
+        One page of get_all_attendance, newest first. Within a day rows are
+        ordered by (student_id, activity_id), packed into one bigint key;
+        activity ids are unique across the three attendance tables.
+        Returns (rows, next_after), or None on error; pass next_after back
+        for the next page.
+        """
+        connection = None
+        cursor = None
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+            keyset = Keyset(
+                "M.attendance_date",
+                "((M.student_id::bigint << 32) | M.activity_id)",
+                "DESC", after, page_size,
+            )
+            sql, params = AttendanceQueries._attendance_query(activity_type, search_term, keyset)
             cursor.execute(sql, params)
-            return cursor.fetchall()
+            return keyset.page(cursor.fetchall())
 
         except Exception as e:
             print(f"❌ Error fetching attendance: {e}")
-            return []
+            return None
 
         finally:
             close_cursor(cursor)
@@ -378,6 +471,7 @@ class AttendanceQueries:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Activity", "Course")
     def get_activities():
         """
         Retrieves all activities from Activity table with course names.
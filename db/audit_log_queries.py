@@ -1,6 +1,40 @@
 from db.connection import get_connection, get_cursor, close_connection, close_cursor
+from db.pagination import DEFAULT_PAGE_SIZE, Keyset
+
+# Sort names offered by the view -> audit_log column
+AUDIT_SORTS = {
+    'audit_id': 'audit_id',
+    'table_name': 'table_name',
+    'operation': 'operation_type',
+    'timestamp': 'operation_time',
+}
+
 
 class AuditLogQueries:
+    @staticmethod
+    def _audit_logs_query(search_field=None, search_value=None, extra_columns=""):
+        """SELECT shared by get_audit_logs and get_audit_logs_page, ending in a WHERE"""
+        sql = f"select *{extra_columns} from audit_log where true"
+        params = []
+
+        if search_field and search_value:
+            if search_field == 'ID':
+                sql += " and cast(audit_id as text) like %s"
+                params.append(f"%{search_value}%")
+            elif search_field == 'Table Name':
+                sql += " and lower(table_name) like lower(%s)"
+                params.append(f"%{search_value}%")
+            elif search_field == 'Operation':
+                sql += " and lower(operation_type) like lower(%s)"
+                params.append(f"%{search_value}%")
+            elif search_field == 'Timestamp':
+                sql += " and cast(operation_time as text) like %s"
+                params.append(f"%{search_value}%")
+            elif search_field == 'User':
+                sql += " and lower(username) like lower(%s)"
+                params.append(f"%{search_value}%")
+        return sql, params
+
     @staticmethod
     def get_audit_logs(search_field=None, search_value=None, sort_by='log_id', sort_order='ASC'):
         conn = None
@@ -8,31 +42,12 @@ class AuditLogQueries:
         try:
             conn = get_connection()
             cursor = get_cursor(conn)
-            sql = "select * from audit_log"
-            params = []
-
-            if search_field and search_value:
-                if search_field == 'ID':
-                    sql += " where cast(audit_id as text) like %s"
-                    params.append(f"%{search_value}%")
-                elif search_field == 'Table Name':
-                    sql += " where lower(table_name) like lower(%s)"
-                    params.append(f"%{search_value}%")
-                elif search_field == 'Operation':
-                    sql += " where lower(operation) like lower(%s)"
-                    params.append(f"%{search_value}%")
-                elif search_field == 'Timestamp':
-                    sql += " where cast(timestamp as text) like %s"
-                    params.append(f"%{search_value}%")
-                elif search_field == 'User':
-                    sql += " where lower(user_name) like lower(%s)"
-                    params.append(f"%{search_value}%")
-
-            if sort_by not in ['audit_id', 'table_name', 'operation', 'timestamp']:
-                sort_by = 'audit_id'
+            sql, params = AuditLogQueries._audit_logs_query(search_field, search_value)
+
+            sort_col = AUDIT_SORTS.get(sort_by, 'audit_id')
             if sort_order not in ['ASC', 'DESC']:
                 sort_order = 'ASC'
-            sql += f" order by {sort_by} {sort_order}"
+            sql += f" order by {sort_col} {sort_order}"
 
             cursor.execute(sql, params)
             results = cursor.fetchall()
@@ -44,4 +59,33 @@ class AuditLogQueries:
             return []
         finally:
             close_cursor(cursor)
-            close_connection(conn)
\ No newline at end of file
+            close_connection(conn)
+
+    @staticmethod
+    def get_audit_logs_page(search_field=None, search_value=None, sort_by='audit_id', sort_order='ASC',
+                            page_size=DEFAULT_PAGE_SIZE, after=None):
+        """
+        One page of get_audit_logs, with audit_id as tiebreaker.
+        Returns (rows, next_after), or None on error; pass next_after back
+        for the next page.
+        """
+        conn = None
+        cursor = None
+        try:
+            conn = get_connection()
+            cursor = get_cursor(conn)
+            keyset = Keyset(AUDIT_SORTS.get(sort_by, 'audit_id'), 'audit_id', sort_order, after, page_size)
+            sql, params = AuditLogQueries._audit_logs_query(
+                search_field, search_value, ", " + keyset.columns()
+            )
+            condition, keyset_params = keyset.condition()
+            sql += f" and {condition}" + keyset.order_by() + keyset.limit()
+
+            cursor.execute(sql, params + keyset_params)
+            return keyset.page(cursor.fetchall())
+        except Exception as e:
+            print(f"❌ Error fetching audit logs: {e}")
+            return None
+        finally:
+            close_cursor(cursor)
+            close_connection(conn)
@@ -0,0 +1,463 @@
+# db/bulk_import.py
+# Purpose: Bulk CSV import of students, enrollments and grades.
+# Rows are read and validated in batches of IMPORT_BATCH_SIZE. Foreign keys
+# (student, group, course/department, semester, exam) are resolved against
+# lookup maps loaded once per import, by ID or by name. Valid rows are
+# COPYed into a temporary staging table; set-based checks then reject rows
+# that clash with existing data (already enrolled, not enrolled, duplicate
+# grade), and the rest is merged into the real table with a single
+# INSERT ... SELECT. Everything runs in one transaction: either all valid
+# rows are imported or none. Every rejected row is listed in the report
+# with its CSV line number.
+
+import csv
+import io
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.grade_queries import GRADE_WEIGHTS
+from db.lookup_cache import invalidates
+
+IMPORT_BATCH_SIZE = 5000
+
+ENROLLMENT_STATUSES = ("Enrolled", "Passed", "Failed", "Excluded", "Resit Eligible")
+# Enrollment statuses that allow grades (see check_student_enrollment())
+GRADABLE_STATUSES = ("Enrolled", "Passed", "Failed", "Resit Eligible")
+GRADE_TYPES = tuple(GRADE_WEIGHTS)
+
+
+class ImportReport:
+    """Outcome of one import: counts plus (line_no, message) for every rejected row."""
+
+    def __init__(self, kind, dry_run=False):
+        self.kind = kind
+        self.dry_run = dry_run
+        self.total = 0
+        self.inserted = 0
+        self.errors = []
+
+    def add_error(self, line_no, message):
+        self.errors.append((line_no, message))
+
+    def summary(self):
+        action = "would be imported" if self.dry_run else "imported"
+        return (
+            f"{self.total} {self.kind} rows read, {self.inserted} {action}, "
+            f"{len(self.errors)} rejected"
+        )
+
+    def write_errors_csv(self, path):
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["line", "error"])
+            writer.writerows(sorted(self.errors))
+
+
+# ---------- field parsing ----------
+
+def _text(row, column, max_length, required=False):
+    value = (row.get(column) or "").strip()
+    if not value:
+        if required:
+            raise ValueError(f"{column} is required")
+        return None
+    if len(value) > max_length:
+        raise ValueError(f"{column} is longer than {max_length} characters")
+    return value
+
+
+def _int(row, column, required=True):
+    value = (row.get(column) or "").strip()
+    if not value:
+        if required:
+            raise ValueError(f"{column} is required")
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{column} '{value}' is not a whole number") from None
+
+
+def _date(row, column, required=True):
+    value = (row.get(column) or "").strip()
+    if not value:
+        if required:
+            raise ValueError(f"{column} is required")
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{column} '{value}' is not a date (YYYY-MM-DD)") from None
+
+
+def _decimal(row, column):
+    value = (row.get(column) or "").strip()
+    if not value:
+        raise ValueError(f"{column} is required")
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"{column} '{value}' is not a number") from None
+    if not number.is_finite() or abs(number) >= 1000:
+        raise ValueError(f"{column} '{value}' is out of range")
+    return number
+
+
+# ---------- foreign key lookups ----------
+
+class LookupMaps:
+    """In-memory ID/name maps for resolving CSV references, loaded once per import."""
+
+    def __init__(self, cursor):
+        cursor.execute("SELECT Student_ID FROM Student;")
+        self.student_ids = {row[0] for row in cursor.fetchall()}
+
+        cursor.execute('SELECT Group_ID, Group_Name FROM "Group";')
+        self.group_ids, self.groups_by_name = self._index(cursor.fetchall())
+
+        cursor.execute("SELECT Department_ID, name FROM Department;")
+        self.department_ids, self.departments_by_name = self._index(cursor.fetchall())
+
+        cursor.execute("SELECT Semester_ID, Name FROM Semester;")
+        self.semester_ids, self.semesters_by_name = self._index(cursor.fetchall())
+
+        cursor.execute("SELECT Course_ID, Department_ID, name FROM Course;")
+        self.courses = set()
+        self.courses_by_name = {}  # (department_id, lower name) -> course_id
+        for course_id, department_id, name in cursor.fetchall():
+            self.courses.add((course_id, department_id))
+            self.courses_by_name[(department_id, name.lower())] = course_id
+
+        cursor.execute("SELECT Course_ID, Department_ID, Exam_ID FROM Exam;")
+        self.exams = {tuple(row) for row in cursor.fetchall()}
+
+    @staticmethod
+    def _index(rows):
+        ids = {row[0] for row in rows}
+        by_name = {}
+        for row_id, name in rows:
+            # A name shared by several rows cannot be resolved by name
+            by_name[name.lower()] = None if name.lower() in by_name else row_id
+        return ids, by_name
+
+    @staticmethod
+    def _resolve(value, ids, by_name, what):
+        if value.isdigit() and int(value) in ids:
+            return int(value)
+        row_id = by_name.get(value.lower())
+        if row_id is None:
+            reason = "is ambiguous" if value.lower() in by_name else "does not exist"
+            raise ValueError(f"{what} '{value}' {reason}")
+        return row_id
+
+    def student(self, row):
+        student_id = _int(row, "student_id")
+        if student_id not in self.student_ids:
+            raise ValueError(f"student_id {student_id} does not exist")
+        return student_id
+
+    def group(self, row):
+        value = (row.get("group") or "").strip()
+        if not value:
+            return None
+        return self._resolve(value, self.group_ids, self.groups_by_name, "group")
+
+    def semester(self, row):
+        value = (row.get("semester") or "").strip()
+        if not value:
+            raise ValueError("semester is required")
+        return self._resolve(value, self.semester_ids, self.semesters_by_name, "semester")
+
+    def course(self, row):
+        """(course_id, department_id) from the course and department columns."""
+        department = (row.get("department") or "").strip()
+        course = (row.get("course") or "").strip()
+        if not department or not course:
+            raise ValueError("course and department are required")
+        department_id = self._resolve(
+            department, self.department_ids, self.departments_by_name, "department"
+        )
+        if course.isdigit() and (int(course), department_id) in self.courses:
+            return int(course), department_id
+        course_id = self.courses_by_name.get((department_id, course.lower()))
+        if course_id is None:
+            raise ValueError(f"course '{course}' does not exist in department '{department}'")
+        return course_id, department_id
+
+    def exam(self, row, course_id, department_id):
+        exam_id = _int(row, "exam_id", required=False)
+        if exam_id is not None and (course_id, department_id, exam_id) not in self.exams:
+            raise ValueError(f"exam_id {exam_id} does not exist for this course")
+        return exam_id
+
+
+# ---------- import kinds ----------
+
+class _StudentImport:
+    kind = "students"
+    table = "Student"
+    required_columns = ("first_name", "last_name", "dob")
+    staging_columns = (
+        ("group_id", "INTEGER"), ("last_name", "VARCHAR(25)"), ("first_name", "VARCHAR(25)"),
+        ("dob", "DATE"), ("address", "VARCHAR(50)"), ("city", "VARCHAR(25)"),
+        ("zip_code", "VARCHAR(9)"), ("phone", "VARCHAR(10)"), ("email", "VARCHAR(100)"),
+    )
+    checks = ()
+
+    def __init__(self):
+        self.seen_emails = set()
+
+    def validate(self, row, maps):
+        email = _text(row, "email", 100)
+        if email:
+            if email.lower() in self.seen_emails:
+                raise ValueError(f"email {email} appears twice in the file")
+            self.seen_emails.add(email.lower())
+        return (
+            maps.group(row),
+            _text(row, "last_name", 25, required=True),
+            _text(row, "first_name", 25, required=True),
+            _date(row, "dob"),
+            _text(row, "address", 50),
+            _text(row, "city", 25),
+            _text(row, "zip_code", 9),
+            _text(row, "phone", 10),
+            email,
+        )
+
+    merge_sql = """
+        INSERT INTO Student (Group_ID, Last_Name, First_Name, DOB, Address, City, Zip_Code, Phone, Email)
+        SELECT group_id, last_name, first_name, dob, address, city, zip_code, phone, email
+        FROM import_staging ORDER BY line_no;
+    """
+
+
+class _EnrollmentImport:
+    kind = "enrollments"
+    table = "Enrollment"
+    required_columns = ("student_id", "course", "department", "semester")
+    staging_columns = (
+        ("student_id", "INTEGER"), ("course_id", "INTEGER"), ("department_id", "INTEGER"),
+        ("semester_id", "INTEGER"), ("status", "VARCHAR(20)"),
+    )
+    checks = (
+        """
+        SELECT s.line_no, 'Student is already enrolled in this course for the semester'
+        FROM import_staging s
+        JOIN Enrollment e
+            ON e.Student_ID = s.student_id AND e.Course_ID = s.course_id
+           AND e.Department_ID = s.department_id AND e.Semester_ID = s.semester_id
+        """,
+    )
+
+    def __init__(self):
+        self.seen = set()
+
+    def validate(self, row, maps):
+        student_id = maps.student(row)
+        course_id, department_id = maps.course(row)
+        semester_id = maps.semester(row)
+        status = (row.get("status") or "").strip() or "Enrolled"
+        if status not in ENROLLMENT_STATUSES:
+            raise ValueError(f"status '{status}' is not one of {', '.join(ENROLLMENT_STATUSES)}")
+        key = (student_id, course_id, department_id, semester_id)
+        if key in self.seen:
+            raise ValueError("the same enrollment appears twice in the file")
+        self.seen.add(key)
+        return student_id, course_id, department_id, semester_id, status
+
+    merge_sql = """
+        INSERT INTO Enrollment (Student_ID, Course_ID, Department_ID, Semester_ID, Status)
+        SELECT student_id, course_id, department_id, semester_id, status
+        FROM import_staging ORDER BY line_no;
+    """
+
+
+class _GradeImport:
+    kind = "grades"
+    table = "Grade"
+    required_columns = (
+        "student_id", "course", "department", "semester", "grade_type", "grade_value", "max_points",
+    )
+    staging_columns = (
+        ("student_id", "INTEGER"), ("course_id", "INTEGER"), ("department_id", "INTEGER"),
+        ("exam_id", "INTEGER"), ("semester_id", "INTEGER"), ("grade_type", "VARCHAR(30)"),
+        ("grade_date", "DATE"), ("grade_source", "VARCHAR(10)"), ("grade_value", "NUMERIC(5,2)"),
+        ("max_points", "NUMERIC(5,2)"), ("comments", "VARCHAR(500)"),
+    )
+    checks = (
+        f"""
+        SELECT s.line_no, 'Student is not enrolled in this course for the semester'
+        FROM import_staging s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM Enrollment e
+            WHERE e.Student_ID = s.student_id AND e.Course_ID = s.course_id
+              AND e.Department_ID = s.department_id AND e.Semester_ID = s.semester_id
+              AND e.Status IN ({", ".join(f"'{status}'" for status in GRADABLE_STATUSES)})
+        )
+        """,
+        """
+        SELECT s.line_no, 'A grade of this type already exists for this student, course and date'
+        FROM import_staging s
+        JOIN Grade g
+            ON g.Student_ID = s.student_id AND g.Course_ID = s.course_id
+           AND g.Department_ID = s.department_id AND g.Grade_Type = s.grade_type
+           AND g.Grade_Date = s.grade_date
+        """,
+    )
+
+    def __init__(self):
+        self.seen = set()
+
+    def validate(self, row, maps):
+        student_id = maps.student(row)
+        course_id, department_id = maps.course(row)
+        semester_id = maps.semester(row)
+        exam_id = maps.exam(row, course_id, department_id)
+
+        grade_type = (row.get("grade_type") or "").strip()
+        if grade_type not in GRADE_TYPES:
+            raise ValueError(f"grade_type '{grade_type}' is not one of {', '.join(GRADE_TYPES)}")
+        grade_date = _date(row, "grade_date", required=False) or date.today()
+        grade_value = _decimal(row, "grade_value")
+        max_points = _decimal(row, "max_points")
+        if max_points <= 0:
+            raise ValueError("max_points must be greater than 0")
+        if not 0 <= grade_value <= max_points:
+            raise ValueError("grade_value must be between 0 and max_points")
+
+        key = (student_id, course_id, department_id, grade_type, grade_date)
+        if key in self.seen:
+            raise ValueError("the same grade (type and date) appears twice in the file")
+        self.seen.add(key)
+        return (
+            student_id, course_id, department_id, exam_id, semester_id, grade_type, grade_date,
+            "Exam" if exam_id is not None else "Other",
+            grade_value, max_points, _text(row, "comments", 500),
+        )
+
+    merge_sql = """
+        INSERT INTO Grade (Student_ID, Course_ID, Department_ID, Exam_ID, Semester_ID, Grade_Type,
+                           Grade_Date, Grade_Source, Grade_Value, Max_Points, Comments)
+        SELECT student_id, course_id, department_id, exam_id, semester_id, grade_type,
+               grade_date, grade_source, grade_value, max_points, comments
+        FROM import_staging ORDER BY line_no;
+    """
+
+
+# ---------- pipeline ----------
+
+def _read_batches(file, spec):
+    """Yields lists of (line_no, csv row dict) from a CSV file with a header row."""
+    reader = csv.DictReader(file)
+    if reader.fieldnames is None:
+        raise ValueError("The file is empty")
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    missing = [column for column in spec.required_columns if column not in reader.fieldnames]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    batch = []
+    for row in reader:
+        batch.append((reader.line_num, row))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy_batch(cursor, spec, rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    columns = ", ".join(["line_no"] + [name for name, _ in spec.staging_columns])
+    cursor.copy_expert(f"COPY import_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _run_import(spec, path, dry_run=False, progress=None):
+    report = ImportReport(spec.kind, dry_run)
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = get_cursor(connection)
+        maps = LookupMaps(cursor)
+
+        columns = ", ".join(f"{name} {pg_type}" for name, pg_type in spec.staging_columns)
+        cursor.execute(
+            f"CREATE TEMP TABLE import_staging (line_no INTEGER PRIMARY KEY, {columns}) ON COMMIT DROP;"
+        )
+
+        # Validate and stage batch by batch
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            for batch in _read_batches(file, spec):
+                valid = []
+                for line_no, row in batch:
+                    try:
+                        valid.append((line_no,) + spec.validate(row, maps))
+                    except ValueError as e:
+                        report.add_error(line_no, str(e))
+                report.total += len(batch)
+                if valid:
+                    _copy_batch(cursor, spec, valid)
+                if progress:
+                    progress(report.total)
+
+        # Set-based checks against existing data
+        for check in spec.checks:
+            cursor.execute(check)
+            rejected = cursor.fetchall()
+            for line_no, message in rejected:
+                report.add_error(line_no, message)
+            if rejected:
+                cursor.execute(
+                    "DELETE FROM import_staging WHERE line_no = ANY(%s);",
+                    ([line_no for line_no, _ in rejected],),
+                )
+
+        cursor.execute(spec.merge_sql)
+        report.inserted = cursor.rowcount
+        if dry_run:
+            connection.rollback()
+        else:
+            connection.commit()
+        print(f"✅ Import of {spec.kind}: {report.summary()}")
+        return report
+    except Exception as e:
+        if connection:
+            connection.rollback()
+        print(f"❌ Error importing {spec.kind}: {e}")
+        raise
+    finally:
+        close_cursor(cursor)
+        close_connection(connection)
+
+
+class BulkImport:
+    """
+    CSV columns (header names, case-insensitive; course/department/semester/group
+    accept an ID or a name):
+        students:    first_name, last_name, dob, [group, email, phone, address, city, zip_code]
+        enrollments: student_id, course, department, semester, [status]
+        grades:      student_id, course, department, semester, grade_type, grade_value,
+                     max_points, [grade_date, exam_id, comments]
+    Each method returns an ImportReport and raises on file or database errors.
+    With dry_run=True everything is validated and merged, then rolled back.
+    """
+
+    @staticmethod
+    @invalidates("Student")
+    def import_students(path, dry_run=False, progress=None):
+        return _run_import(_StudentImport(), path, dry_run, progress)
+
+    @staticmethod
+    @invalidates("Enrollment")
+    def import_enrollments(path, dry_run=False, progress=None):
+        return _run_import(_EnrollmentImport(), path, dry_run, progress)
+
+    @staticmethod
+    @invalidates("Grade")
+    def import_grades(path, dry_run=False, progress=None):
+        return _run_import(_GradeImport(), path, dry_run, progress)
@@ -0,0 +1,148 @@
+# db/change_listener.py
+# Purpose: Keep client caches valid when other workstations write to the
+# database. Listens on the 'table_change' channel fed by the
+# notify_statement_change() triggers (sql_scripts/dbtables.sql) and
+# invalidates the cached lookups of the changed table.
+
+import select
+import threading
+
+from psycopg2 import extensions
+
+from db.connection import open_dedicated_connection
+from db.lookup_cache import lookup_cache
+
+CHANNEL = "table_change"
+POLL_TIMEOUT = 5  # seconds between checks of the stop flag
+RECONNECT_DELAY = 5  # seconds, doubled after each failed attempt
+MAX_RECONNECT_DELAY = 60
+
+
+class ChangeListener:
+    """
+    Background thread holding a dedicated LISTEN connection.
+
+    Listeners registered with add_listener(callback) receive
+    callback(table, operation) on the listener thread; Qt code must hand the
+    event over to the GUI thread (e.g. by emitting a signal).
+    add_channel_listener(channel, callback) subscribes to another channel and
+    receives callback(payload); register it before start().
+    """
+
+    def __init__(self, channel=CHANNEL):
+        self.channel = channel
+        self._listeners = []
+        self._channel_listeners = {}  # channel -> [callback(payload)]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._connection = None
+
+    def add_listener(self, callback):
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def add_channel_listener(self, channel, callback):
+        with self._lock:
+            self._channel_listeners.setdefault(channel, []).append(callback)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="db-change-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=POLL_TIMEOUT + 1)
+        self._thread = None
+
+    # ---------- internals ----------
+
+    def _connect(self):
+        connection = open_dedicated_connection()
+        connection.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with self._lock:
+            channels = [self.channel] + list(self._channel_listeners)
+        cursor = connection.cursor()
+        for channel in channels:
+            cursor.execute(f"LISTEN {channel};")
+        cursor.close()
+        return connection
+
+    def _run(self):
+        delay = RECONNECT_DELAY
+        while not self._stop.is_set():
+            try:
+                self._connection = self._connect()
+                delay = RECONNECT_DELAY
+                # Anything may have changed while we were not listening
+                self._dispatch_all()
+                self._listen_loop()
+            except Exception as e:
+                print(f"❌ Change listener error: {e}")
+                self._stop.wait(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            finally:
+                if self._connection is not None:
+                    try:
+                        self._connection.close()
+                    except Exception:
+                        pass
+                    self._connection = None
+
+    def _listen_loop(self):
+        connection = self._connection
+        while not self._stop.is_set():
+            ready, _, _ = select.select([connection], [], [], POLL_TIMEOUT)
+            if not ready:
+                continue
+            connection.poll()
+            while connection.notifies:
+                notify = connection.notifies.pop(0)
+                if notify.channel == self.channel:
+                    table, _, operation = notify.payload.partition(":")
+                    self._dispatch(table.lower(), operation)
+                else:
+                    self._dispatch_channel(notify.channel, notify.payload)
+
+    def _dispatch(self, table, operation):
+        lookup_cache.invalidate(table)
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(table, operation)
+            except Exception as e:
+                print(f"❌ Error in change listener callback: {e}")
+
+    def _dispatch_channel(self, channel, payload):
+        with self._lock:
+            listeners = list(self._channel_listeners.get(channel, ()))
+        for callback in listeners:
+            try:
+                callback(payload)
+            except Exception as e:
+                print(f"❌ Error in change listener callback: {e}")
+
+    def _dispatch_all(self):
+        lookup_cache.clear()
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback("*", "RECONNECT")
+            except Exception as e:
+                print(f"❌ Error in change listener callback: {e}")
+
+
+change_listener = ChangeListener()
@@ -1,4 +1,10 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+
 import psycopg2
+from psycopg2 import extensions
 
 DATABASE = "University"
 USER = "postgres"
@@ -6,19 +12,286 @@ PASSWORD = "moussa03kh"
 HOST = "localhost"
 PORT = "5432"
 
+# Pool settings
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 10
+POOL_IDLE_TIMEOUT = 300  # seconds an idle connection is kept above min size
+POOL_CHECKOUT_TIMEOUT = 30  # seconds to wait for a free connection
+POOL_PING_AFTER = 30  # idle seconds after which a connection is pinged on checkout
+
+
+class PoolExhaustedError(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of warm psycopg2 connections.
+
+    Connections are handed out by acquire() and given back by release().
+    On checkout a connection is health checked (closed / broken state, and a
+    SELECT 1 ping if it sat idle for a while). On release any open
+    transaction is rolled back so the next borrower starts clean.
+    """
+
+    def __init__(
+        self,
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        idle_timeout=POOL_IDLE_TIMEOUT,
+        checkout_timeout=POOL_CHECKOUT_TIMEOUT,
+        ping_after=POOL_PING_AFTER,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size: need 0 <= min_size <= max_size, max_size >= 1")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.ping_after = ping_after
+
+        self._idle = []  # list of (connection, released_at), most recent last
+        self._in_use = {}  # id(connection) -> (connection, owning thread ident)
+        self._opening = 0  # connections currently being opened outside the lock
+        self._closed = False
+        self._cond = threading.Condition()
+
+    # ---------- internals ----------
+
+    @staticmethod
+    def _connect():
+        return psycopg2.connect(
+            database=DATABASE, user=USER, password=PASSWORD, host=HOST, port=PORT
+        )
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _size(self):
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def _is_healthy(self, connection, idle_for):
+        if connection.closed:
+            return False
+        if connection.get_transaction_status() == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if idle_for < self.ping_after:
+            return True
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1;")
+            cursor.close()
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _prune_idle(self):
+        """Drops connections idle longer than idle_timeout, keeping min_size. Caller holds the lock."""
+        now = time.monotonic()
+        keep = []
+        expired = []
+        # Oldest first, so the warmest connections survive
+        for connection, released_at in self._idle:
+            surplus = self._size() - len(expired) > self.min_size
+            if surplus and now - released_at > self.idle_timeout:
+                expired.append(connection)
+            else:
+                keep.append((connection, released_at))
+        self._idle = keep
+        return expired
+
+    # ---------- public API ----------
+
+    def acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise PoolExhaustedError("Connection pool is closed")
+
+                for connection in self._prune_idle():
+                    self._discard(connection)
+
+                candidate = None
+                idle_for = 0
+                if self._idle:
+                    candidate, released_at = self._idle.pop()
+                    idle_for = time.monotonic() - released_at
+                    self._opening += 1  # reserve the slot while checking health
+                elif self._size() < self.max_size:
+                    self._opening += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolExhaustedError(
+                            f"No free connection after {self.checkout_timeout}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                    continue
+
+            # Health check / connect outside the lock so other threads are not blocked on I/O
+            try:
+                if candidate is not None and not self._is_healthy(candidate, idle_for):
+                    self._discard(candidate)
+                    candidate = None
+                if candidate is None:
+                    candidate = self._connect()
+            except Exception:
+                with self._cond:
+                    self._opening -= 1
+                    self._cond.notify()
+                raise
+
+            with self._cond:
+                self._opening -= 1
+                self._in_use[id(candidate)] = (candidate, threading.get_ident())
+            return candidate
+
+    def release(self, connection):
+        with self._cond:
+            owned = self._in_use.pop(id(connection), None) is not None
+
+        if not owned:
+            # Not from this pool (or already released): just close it
+            if not connection.closed:
+                self._discard(connection)
+            return
+
+        reusable = not connection.closed
+        if reusable:
+            try:
+                if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except Exception:
+                reusable = False
+
+        with self._cond:
+            if reusable and not self._closed:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._discard(connection)
+            self._cond.notify()
+
+    def cancel_thread_queries(self, thread_ident):
+        """
+        Asks the server to cancel whatever is running on the connections
+        checked out by the given thread. The running execute() then raises
+        QueryCanceled in that thread and the usual except/finally cleanup runs.
+        Returns the number of connections a cancel was sent on.
+        """
+        with self._cond:
+            targets = [
+                connection
+                for connection, owner in self._in_use.values()
+                if owner == thread_ident
+            ]
+        sent = 0
+        for connection in targets:
+            try:
+                connection.cancel()
+                sent += 1
+            except Exception as e:
+                print(f"❌ Error cancelling query: {e}")
+        return sent
+
+    def close_all(self):
+        with self._cond:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle = []
+            self._cond.notify_all()
+        for connection in idle:
+            self._discard(connection)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "max_size": self.max_size,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def configure_pool(**settings):
+    """Replaces the process-wide pool, e.g. configure_pool(max_size=20)."""
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, ConnectionPool(**settings)
+    if old is not None:
+        old.close_all()
+    return _pool
+
 
 def get_connection():
+    return get_pool().acquire()
 
-    connection = psycopg2.connect(
-        database=DATABASE, user=USER, password=PASSWORD, host=HOST, port=PORT
-    )
 
-    return connection
+def open_dedicated_connection():
+    """Unpooled connection for long-lived uses such as LISTEN. Caller closes it."""
+    return ConnectionPool._connect()
 
 
 def close_connection(connection):
+    # Returns the connection to the pool instead of closing the socket
     if connection:
-        connection.close()
+        get_pool().release(connection)
+
+
+@contextmanager
+def pooled_connection():
+    """
+    Context-manager form of get_connection/close_connection:
+
+        with pooled_connection() as connection:
+            ...
+            connection.commit()
+
+    Uncommitted work is rolled back when the block exits.
+    """
+    connection = get_connection()
+    try:
+        yield connection
+    except Exception:
+        if not connection.closed:
+            connection.rollback()
+        raise
+    finally:
+        close_connection(connection)
+
+
+def cancel_thread_queries(thread_ident):
+    return get_pool().cancel_thread_queries(thread_ident)
+
+
+def close_all_connections():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close_all()
+
+
+atexit.register(close_all_connections)
 
 
 def get_cursor(connection):
@@ -1,9 +1,11 @@
 # New file: db/course_crud_queries.py
 from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.lookup_cache import cached_lookup, invalidates
 
 
 class CourseCRUD:
     @staticmethod
+    @invalidates("Course")
     def create_course(department_id, name, description):
         connection = None
         cursor = None
@@ -85,6 +87,7 @@ class CourseCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Course")
     def update_course(course_id, department_id, name, description):
         connection = None
         cursor = None
@@ -131,6 +134,7 @@ class CourseCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Course")
     def delete_course(course_id, department_id):
         connection = None
         cursor = None
@@ -161,6 +165,7 @@ class CourseCRUD:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Department")
     def get_all_departments():
         """Helper method to get departments for dropdown"""
         connection = None
@@ -0,0 +1,118 @@
+# db/dashboard_refresh.py
+# Purpose: Keep the semester dashboard materialized views
+# (mv_semester_overview, mv_course_comparison in sql_scripts/dashboard_views_schema.sql)
+# reasonably fresh without making anyone wait for them.
+# A background thread refreshes them CONCURRENTLY, so the statistics pages
+# keep reading the previous data while a refresh runs. It refreshes when the
+# underlying tables changed (table_change notifications) at most once per
+# REFRESH_INTERVAL, and right away when asked to (request_refresh(), e.g.
+# after enrollment statuses were recomputed).
+
+import threading
+
+from db.change_listener import change_listener
+from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.lookup_cache import lookup_cache
+
+DASHBOARD_VIEWS = ("mv_semester_overview", "mv_course_comparison")
+
+# Tables the dashboard views are computed from
+SOURCE_TABLES = {"enrollment", "grade", "course"}
+
+REFRESH_INTERVAL = 300  # seconds between refreshes of changed data
+
+# Only one workstation refreshes at a time; the others skip their turn
+_ADVISORY_LOCK_KEY = 7308201
+
+
+def refresh_dashboards():
+    """
+    Refreshes the dashboard views. Returns True when refreshed, False when
+    another session is already refreshing them or on error.
+    """
+    connection = None
+    cursor = None
+    try:
+        connection = get_connection()
+        cursor = get_cursor(connection)
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s);", (_ADVISORY_LOCK_KEY,))
+        if not cursor.fetchone()[0]:
+            connection.rollback()
+            return False
+        for view in DASHBOARD_VIEWS:
+            cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view};")
+            # Other workstations drop their cached snapshot results on commit
+            cursor.execute("SELECT pg_notify('table_change', %s);", (f"{view}:REFRESH",))
+        # "Data as of", committed together with the refreshed views
+        cursor.execute(
+            """
+            INSERT INTO dashboard_refresh_state (refreshed_at) VALUES (now())
+            ON CONFLICT (id) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at;
+            """
+        )
+        connection.commit()
+        lookup_cache.invalidate(*DASHBOARD_VIEWS)
+        print("✅ Dashboard views refreshed")
+        return True
+    except Exception as e:
+        if connection:
+            connection.rollback()
+        print(f"❌ Error refreshing dashboard views: {e}")
+        return False
+    finally:
+        close_cursor(cursor)
+        close_connection(connection)
+
+
+class DashboardRefresher:
+    """Background thread that refreshes the dashboard views when their data changed."""
+
+    def __init__(self, interval=REFRESH_INTERVAL):
+        self.interval = interval
+        self._dirty = threading.Event()
+        self._now = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        # Data may have changed while the application was closed
+        self._dirty.set()
+        change_listener.add_listener(self._table_changed)
+        self._thread = threading.Thread(
+            target=self._run, name="dashboard-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        change_listener.remove_listener(self._table_changed)
+        self._stop.set()
+        self._now.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def request_refresh(self):
+        """Refresh as soon as possible instead of waiting for the next interval."""
+        self._dirty.set()
+        self._now.set()
+
+    # ---------- internals ----------
+
+    def _table_changed(self, table, operation):
+        if table in SOURCE_TABLES or table == "*":
+            self._dirty.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._dirty.is_set():
+                self._dirty.clear()
+                if not refresh_dashboards():
+                    self._dirty.set()  # retry next round
+            self._now.wait(self.interval)
+            self._now.clear()
+
+
+dashboard_refresher = DashboardRefresher()
@@ -1,7 +1,9 @@
 from db.connection import get_connection , get_cursor , close_connection , close_cursor
+from db.lookup_cache import invalidates
 
 class DepartmentCRUD:
     @staticmethod
+    @invalidates("Department")
     def create_department(name):
         connection = None
         cursor = None
@@ -67,6 +69,7 @@ class DepartmentCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Department")
     def update_department(department_id, name ):
         connection = None
         cursor = None
@@ -99,6 +102,7 @@ class DepartmentCRUD:
 
 
     @staticmethod
+    @invalidates("Department")
     def delete_department(dept_id):
         """DELETE a department"""
         connection = None
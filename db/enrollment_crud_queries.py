@@ -1,9 +1,12 @@
 # Fixed file: db/enrollment_crud_queries.py
 from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.lookup_cache import cached_lookup, invalidates
+from db.pagination import DEFAULT_PAGE_SIZE, Keyset
 
 
 class EnrollmentCRUD:
     @staticmethod
+    @invalidates("Enrollment")
     def create_enrollment(
         student_id, course_id, department_id, semester_id, status="Enrolled"
     ):
@@ -33,6 +36,60 @@ class EnrollmentCRUD:
             close_cursor(cursor)
             close_connection(connection)
 
+    # Sortable columns of the enrollment listing -> SQL expression
+    ENROLLMENT_SORTS = {
+        "enrollment_id": "e.enrollment_id",
+        "student_name": "s.first_name || ' ' || s.last_name",
+        "course_name": "c.name",
+        "status": "e.status",
+    }
+
+    @staticmethod
+    def _enrollments_query(search_field=None, search_value=None, extra_columns=""):
+        """SELECT shared by get_all_enrollments and get_enrollments_page, ending in a WHERE"""
+        sql = f"""
+            SELECT
+                e.enrollment_id,
+                e.student_id,
+                s.first_name || ' ' || s.last_name AS student_name,
+                e.course_id,
+                c.name AS course_name,
+                e.department_id,
+                d.name AS department_name,
+                e.semester_id,
+                sem.name AS semester_name,
+                e.status{extra_columns}
+            FROM enrollment e
+            INNER JOIN student s ON e.student_id = s.student_id
+            INNER JOIN course c ON e.course_id = c.course_id AND e.department_id = c.department_id
+            INNER JOIN department d ON e.department_id = d.department_id
+            INNER JOIN semester sem ON e.semester_id = sem.semester_id
+            WHERE TRUE
+        """
+        params = []
+
+        # Search filtering
+        if search_field and search_value:
+            if search_field == "ID":
+                sql += " AND CAST(e.enrollment_id AS TEXT) LIKE %s"
+                params.append(f"%{search_value}%")
+            elif search_field == "Student ID":
+                sql += " AND CAST(e.student_id AS TEXT) LIKE %s"
+                params.append(f"%{search_value}%")
+            elif search_field == "Student Name":
+                sql += " AND LOWER(s.first_name || ' ' || s.last_name) LIKE LOWER(%s)"
+                params.append(f"%{search_value}%")
+            elif search_field == "Course Name":
+                sql += " AND LOWER(c.name) LIKE LOWER(%s)"
+                params.append(f"%{search_value}%")
+            elif search_field == "Department Name":
+                sql += " AND LOWER(d.name) LIKE LOWER(%s)"
+                params.append(f"%{search_value}%")
+            elif search_field == "Status":
+                sql += " AND LOWER(e.status) LIKE LOWER(%s)"
+                params.append(f"%{search_value}%")
+        return sql, params
+
     @staticmethod
     def get_all_enrollments(
         search_field=None, search_value=None, sort_by="enrollment_id", sort_order="ASC"
@@ -46,56 +103,10 @@ class EnrollmentCRUD:
             connection = get_connection()
             cursor = get_cursor(connection)
 
-            sql = """
-                SELECT
-                    e.enrollment_id,
-                    e.student_id,
-                    s.first_name || ' ' || s.last_name AS student_name,
-                    e.course_id,
-                    c.name AS course_name,
-                    e.department_id,
-                    d.name AS department_name,
-                    e.semester_id,
-                    sem.name AS semester_name,
-                    e.status
-                FROM enrollment e
-                INNER JOIN student s ON e.student_id = s.student_id
-                INNER JOIN course c ON e.course_id = c.course_id AND e.department_id = c.department_id
-                INNER JOIN department d ON e.department_id = d.department_id
-                INNER JOIN semester sem ON e.semester_id = sem.semester_id
-            """
-            params = []
-
-            # Search filtering
-            if search_field and search_value:
-                if search_field == "ID":
-                    sql += " WHERE CAST(e.enrollment_id AS TEXT) LIKE %s"
-                    params.append(f"%{search_value}%")
-                elif search_field == "Student ID":
-                    sql += " WHERE CAST(e.student_id AS TEXT) LIKE %s"
-                    params.append(f"%{search_value}%")
-                elif search_field == "Student Name":
-                    sql += " WHERE LOWER(s.first_name || ' ' || s.last_name) LIKE LOWER(%s)"
-                    params.append(f"%{search_value}%")
-                elif search_field == "Course Name":
-                    sql += " WHERE LOWER(c.name) LIKE LOWER(%s)"
-                    params.append(f"%{search_value}%")
-                elif search_field == "Department Name":
-                    sql += " WHERE LOWER(d.name) LIKE LOWER(%s)"
-                    params.append(f"%{search_value}%")
-                elif search_field == "Status":
-                    sql += " WHERE LOWER(e.status) LIKE LOWER(%s)"
-                    params.append(f"%{search_value}%")
+            sql, params = EnrollmentCRUD._enrollments_query(search_field, search_value)
 
             # Sorting
-            valid_sorts = {
-                "enrollment_id": "e.enrollment_id",
-                "student_name": "student_name",
-                "course_name": "course_name",
-                "status": "e.status",
-            }
-
-            sort_col = valid_sorts.get(sort_by, "e.enrollment_id")
+            sort_col = EnrollmentCRUD.ENROLLMENT_SORTS.get(sort_by, "e.enrollment_id")
             if sort_order not in ["ASC", "DESC"]:
                 sort_order = "ASC"
 
@@ -113,6 +124,40 @@ class EnrollmentCRUD:
             close_connection(connection)
 
     @staticmethod
+    def get_enrollments_page(
+        search_field=None, search_value=None, sort_by="enrollment_id", sort_order="ASC",
+        page_size=DEFAULT_PAGE_SIZE, after=None
+    ):
+        """
+        One page of get_all_enrollments, with enrollment_id as tiebreaker.
+        Returns (rows, next_after), or None on error; pass next_after back
+        for the next page.
+        """
+        connection = None
+        cursor = None
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            sort_col = EnrollmentCRUD.ENROLLMENT_SORTS.get(sort_by, "e.enrollment_id")
+            keyset = Keyset(sort_col, "e.enrollment_id", sort_order, after, page_size)
+            sql, params = EnrollmentCRUD._enrollments_query(
+                search_field, search_value, ", " + keyset.columns()
+            )
+            condition, keyset_params = keyset.condition()
+            sql += f" AND {condition}" + keyset.order_by() + keyset.limit()
+
+            cursor.execute(sql, params + keyset_params)
+            return keyset.page(cursor.fetchall())
+        except Exception as e:
+            print(f"❌ Error fetching enrollments: {e}")
+            return None
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    @staticmethod
+    @cached_lookup("Student")
     def get_students_for_dropdown():
         """Get all students for dropdown"""
         connection = None
@@ -135,6 +180,7 @@ class EnrollmentCRUD:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Course")
     def get_courses_for_dropdown(department_id=None):
         """Get courses, optionally filtered by department"""
         connection = None
@@ -166,6 +212,7 @@ class EnrollmentCRUD:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Department")
     def get_departments_for_dropdown():
         """Get all departments"""
         connection = None
@@ -184,6 +231,7 @@ class EnrollmentCRUD:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Semester")
     def get_semesters_for_dropdown():
         """Get all semesters"""
         connection = None
@@ -202,6 +250,7 @@ class EnrollmentCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Enrollment")
     def update_enrollment(
         enrollment_id, student_id, course_id, department_id, semester_id, status
     ):
@@ -245,6 +294,7 @@ class EnrollmentCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Enrollment")
     def delete_enrollment(enrollment_id):
         connection = None
         cursor = None
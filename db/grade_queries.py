@@ -4,9 +4,28 @@
 
 
 from db.connection import get_connection, get_cursor, close_connection, close_cursor
+from db.lookup_cache import cached_lookup, invalidates
+from db.pagination import DEFAULT_PAGE_SIZE, Keyset
+
+# Weight of each grade type in the grade list's course average (0-20 scale),
+# normalised by the weights of the grades present. Not the report weighting:
+# results use grade_weighted_score() in sql_scripts/student_course_score_schema.sql.
+GRADE_WEIGHTS = {
+    "Quiz": 0.10,
+    "Assignment": 0.10,
+    "Homework": 0.05,
+    "Project": 0.10,
+    "Midterm": 0.30,
+    "Final": 0.40,
+    "Practical Test": 0.10,
+    "Oral Exam": 0.15,
+    "Resit": 0.40,
+}
+
 
 class GradeQueries:
     @staticmethod
+    @invalidates("Grade")
     def create_grade(
         student_id,
         course_id,
@@ -58,6 +77,139 @@ class GradeQueries:
             close_cursor(cursor)
             close_connection(connection)
 
+    @staticmethod
+    @invalidates("Grade")
+    def create_grade_sheet(
+        course_id,
+        department_id,
+        semester_id,
+        exam_id,
+        grade_type,
+        grade_date,
+        max_points,
+        entries,
+    ):
+        """
+        Inserts a whole sheet of grades (one exam / grade type for many
+        students) in a single INSERT ... SELECT. Students without a gradable
+        enrollment for the course and semester, and grades that already
+        exist, are skipped by the statement itself, so the enrollment
+        trigger never rejects the sheet and the audit log gets one entry.
+
+        Args:
+            entries: list of (student_id, grade_value, comments)
+        Returns:
+            (inserted_count, skipped) where skipped is a list of
+            (student_id, reason); None on database error
+        """
+        skipped = []
+        sheet = {}
+        for student_id, grade_value, comments in entries:
+            if student_id in sheet:
+                skipped.append((student_id, "listed more than once"))
+            elif grade_value is None or not 0 <= grade_value <= max_points:
+                skipped.append((student_id, f"grade must be between 0 and {max_points}"))
+            else:
+                sheet[student_id] = (grade_value, comments or None)
+        if not sheet:
+            return 0, skipped
+
+        connection = None
+        cursor = None
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+            sql = """
+                WITH sheet AS (
+                    SELECT *
+                    FROM unnest(%(student_ids)s::int[], %(grade_values)s::numeric[], %(comments)s::text[])
+                         AS v(student_id, grade_value, comments)
+                ),
+                checked AS (
+                    SELECT s.*, EXISTS (
+                        SELECT 1 FROM Enrollment e
+                        WHERE e.Student_ID = s.student_id
+                          AND e.Course_ID = %(course_id)s
+                          AND e.Department_ID = %(department_id)s
+                          AND e.Semester_ID = %(semester_id)s
+                          AND e.Status IN ('Enrolled', 'Passed', 'Failed', 'Resit Eligible')
+                    ) AS enrolled
+                    FROM sheet s
+                ),
+                inserted AS (
+                    INSERT INTO Grade (student_id, course_id, department_id, exam_id, semester_id, grade_type, grade_date, grade_source, grade_value, max_points, comments)
+                    SELECT c.student_id, %(course_id)s, %(department_id)s, %(exam_id)s, %(semester_id)s,
+                           %(grade_type)s, %(grade_date)s, %(grade_source)s, c.grade_value, %(max_points)s, c.comments
+                    FROM checked c
+                    WHERE c.enrolled
+                    ON CONFLICT ON CONSTRAINT UN_Student_Grade DO NOTHING
+                    RETURNING student_id
+                )
+                SELECT c.student_id, c.enrolled, i.student_id IS NOT NULL
+                FROM checked c
+                LEFT JOIN inserted i ON i.student_id = c.student_id;
+            """
+            cursor.execute(
+                sql,
+                {
+                    "student_ids": list(sheet),
+                    "grade_values": [value for value, _ in sheet.values()],
+                    "comments": [comments for _, comments in sheet.values()],
+                    "course_id": course_id,
+                    "department_id": department_id,
+                    "semester_id": semester_id,
+                    "exam_id": exam_id,
+                    "grade_type": grade_type,
+                    "grade_date": grade_date,
+                    "grade_source": "Exam" if exam_id else "Other",
+                    "max_points": max_points,
+                },
+            )
+            inserted = 0
+            for student_id, enrolled, was_inserted in cursor.fetchall():
+                if was_inserted:
+                    inserted += 1
+                elif not enrolled:
+                    skipped.append((student_id, "not enrolled in this course for the semester"))
+                else:
+                    skipped.append((student_id, f"already has a {grade_type} grade on this date"))
+            connection.commit()
+            print(f"✅ Grade sheet saved: {inserted} grades, {len(skipped)} skipped")
+            return inserted, skipped
+        except Exception as e:
+            if connection:
+                connection.rollback()
+            print(f"❌ Error saving grade sheet: {e}")
+            return None
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    @staticmethod
+    def get_enrolled_students(course_id, department_id, semester_id):
+        """Students with a gradable enrollment in the course for the semester, for grade sheets."""
+        connection = None
+        cursor = None
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+            sql = """
+                SELECT S.Student_ID, S.First_Name || ' ' || S.Last_Name AS full_name
+                FROM Enrollment E
+                JOIN Student S ON S.Student_ID = E.Student_ID
+                WHERE E.Course_ID = %s AND E.Department_ID = %s AND E.Semester_ID = %s
+                  AND E.Status IN ('Enrolled', 'Passed', 'Failed', 'Resit Eligible')
+                ORDER BY S.Last_Name, S.First_Name;
+            """
+            cursor.execute(sql, (course_id, department_id, semester_id))
+            return cursor.fetchall()
+        except Exception as e:
+            print(f"❌ Error fetching enrolled students: {e}")
+            return []
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
     @staticmethod
     def get_all_grades(search_term="", semester_id=None, grade_type=None):
         connection = None
@@ -90,6 +242,111 @@ class GradeQueries:
             close_connection(connection)
 
     @staticmethod
+    def _grades_with_avg_query(search_term="", semester_id=None, grade_type=None, keyset=None):
+        """
+        Statement behind get_all_grades_with_avg. With a keyset, the page is
+        cut inside `listed`, so averages are only computed for its rows.
+        """
+        weights_sql = ", ".join("(%s, %s::numeric)" for _ in GRADE_WEIGHTS)
+        params = [v for item in GRADE_WEIGHTS.items() for v in item]
+        sql = f"""
+            WITH weights (grade_type, weight) AS (
+                VALUES {weights_sql}
+            ),
+            listed AS (
+                SELECT G.grade_id, S.first_name || ' ' || S.last_name AS student_name, C.name AS course_name,
+                       G.grade_type, G.grade_value, G.max_points, G.grade_date,
+                       G.student_id, G.course_id, G.department_id
+                FROM Grade G
+                JOIN Student S ON G.student_id = S.student_id
+                JOIN Course C ON G.course_id = C.course_id AND G.department_id = C.department_id
+                WHERE (S.first_name ILIKE %s OR S.last_name ILIKE %s OR C.name ILIKE %s)
+        """
+        params += [f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"]
+        if semester_id:
+            sql += " AND G.semester_id = %s"
+            params.append(semester_id)
+        if grade_type and grade_type != 'All':
+            sql += " AND G.grade_type = %s"
+            params.append(grade_type)
+        page_columns = ""
+        order_by = " ORDER BY L.grade_date DESC"
+        if keyset:
+            condition, keyset_params = keyset.condition()
+            sql += f" AND {condition}" + keyset.order_by() + keyset.limit()
+            params += keyset_params
+            page_columns = ", L.grade_date AS page_sort, L.grade_id AS page_key"
+            order_by = keyset.order_by("L.grade_date", "L.grade_id")
+        sql += f"""
+            ),
+            averages AS (
+                SELECT G.student_id, G.course_id, G.department_id,
+                       SUM(G.grade_value / G.max_points * 20 * W.weight) / SUM(W.weight) AS weighted_avg
+                FROM Grade G
+                JOIN weights W ON W.grade_type = G.grade_type
+                WHERE (G.student_id, G.course_id, G.department_id) IN (
+                    SELECT student_id, course_id, department_id FROM listed
+                )
+                GROUP BY G.student_id, G.course_id, G.department_id
+            )
+            SELECT L.grade_id, L.student_name, L.course_name, L.grade_type, L.grade_value, L.max_points,
+                   COALESCE(A.weighted_avg, 0) AS weighted_avg{page_columns}
+            FROM listed L
+            LEFT JOIN averages A
+                ON A.student_id = L.student_id AND A.course_id = L.course_id AND A.department_id = L.department_id
+            {order_by};
+        """
+        return sql, params
+
+    @staticmethod
+    def get_all_grades_with_avg(search_term="", semester_id=None, grade_type=None):
+        """
+        Same rows and filters as get_all_grades, plus the student's weighted
+        average for the course as a 7th column, computed in one statement.
+        The average covers all of the student's grades for that course, not
+        only the filtered rows.
+        """
+        connection = None
+        cursor = None
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+            sql, params = GradeQueries._grades_with_avg_query(search_term, semester_id, grade_type)
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        except Exception as e:
+            print(f"❌ Error reading grades with averages: {e}")
+            return []
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    @staticmethod
+    def get_grades_with_avg_page(search_term="", semester_id=None, grade_type=None,
+                                 page_size=DEFAULT_PAGE_SIZE, after=None):
+        """
+        One page of get_all_grades_with_avg (newest first, grade_id as tiebreaker).
+        Returns (rows, next_after), or None on error; pass next_after back
+        for the next page.
+        """
+        connection = None
+        cursor = None
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+            keyset = Keyset("G.grade_date", "G.grade_id", "DESC", after, page_size)
+            sql, params = GradeQueries._grades_with_avg_query(search_term, semester_id, grade_type, keyset)
+            cursor.execute(sql, params)
+            return keyset.page(cursor.fetchall())
+        except Exception as e:
+            print(f"❌ Error reading grades with averages: {e}")
+            return None
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    @staticmethod
+    @invalidates("Grade")
     def update_grade(grade_id, student_id, course_id, department_id, exam_id, semester_id, grade_type, grade_date, grade_source, grade_value, max_points, comments):
         connection = None
         cursor = None
@@ -114,6 +371,7 @@ class GradeQueries:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Grade")
     def delete_grade(grade_id):
         connection = None
         cursor = None
@@ -135,6 +393,7 @@ class GradeQueries:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Student")
     def get_students():
         connection = None
         cursor = None
@@ -156,6 +415,7 @@ class GradeQueries:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Course")
     def get_courses():
         connection = None
         cursor = None
@@ -177,6 +437,7 @@ class GradeQueries:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Exam")
     def get_exams():
         connection = None
         cursor = None
@@ -198,6 +459,7 @@ class GradeQueries:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Semester")
     def get_semesters():
         connection = None
         cursor = None
@@ -1,8 +1,10 @@
 from db.connection import get_connection, get_cursor, close_connection, close_cursor
+from db.lookup_cache import invalidates
 
 
 class GroupCRUD:
     @staticmethod
+    @invalidates("Group")
     def create_group(name, section_id):
         """Create a new group"""
         connection = None
@@ -159,6 +161,7 @@ class GroupCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Group")
     def update_group(group_id, name, section_id):
         """Update a group - can update name and/or section"""
         connection = None
@@ -210,6 +213,7 @@ class GroupCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Group")
     def delete_group(group_id):
         """Delete a group by ID"""
         connection = None
@@ -1,9 +1,11 @@
 # New file: db/instructor_crud_queries.py
 from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.lookup_cache import invalidates
 
 
 class InstructorCRUD:
     @staticmethod
+    @invalidates("Instructor")
     def create_instructor(
         department_id, last_name, first_name, rank, phone, fax, email
     ):
@@ -91,6 +93,7 @@ class InstructorCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Instructor")
     def update_instructor(
         instructor_id, department_id, last_name, first_name, rank, phone, fax, email
     ):
@@ -136,6 +139,7 @@ class InstructorCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Instructor")
     def delete_instructor(instructor_id):
         connection = None
         cursor = None
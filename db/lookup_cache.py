@@ -0,0 +1,137 @@
+# db/lookup_cache.py
+# Purpose: Process-wide cache for reference data used by dropdowns
+# (semesters, courses, departments, students, instructors, rooms, ...).
+# Entries expire after a TTL and are dropped as soon as a CRUD method
+# writes one of the tables they were read from.
+
+import functools
+import threading
+import time
+
+DEFAULT_TTL = 300  # seconds
+
+# Writes to a table can change rows of these tables too: every foreign key
+# in sql_scripts/dbtables.sql with ON DELETE CASCADE / SET NULL or ON UPDATE
+# CASCADE, from the referenced table to the referencing ones
+CASCADES = {
+    "section": {"group"},
+    "group": {"student"},
+    "student": {
+        "enrollment", "grade", "student_exam",
+        "student_lecture_attendance", "student_tutorial_attendance",
+        "student_practical_attendance",
+    },
+    "course": {"activity", "exam", "enrollment", "grade"},
+    "semester": {"enrollment", "grade"},
+    "activity": {"lecture", "tutorial", "practical", "reservation"},
+    "lecture": {"student_lecture_attendance"},
+    "tutorial": {"student_tutorial_attendance"},
+    "practical": {"student_practical_attendance"},
+    "exam": {"exam_schedule", "student_exam", "grade"},
+    "exam_schedule": {"student_exam"},
+    "room": {"exam_schedule", "reservation"},
+    "instructor": {"exam_schedule", "reservation"},
+}
+
+
+def _normalize(tables):
+    found = set()
+    pending = [t.strip('"').lower() for t in tables]
+    while pending:
+        table = pending.pop()
+        if table not in found:
+            found.add(table)
+            pending.extend(CASCADES.get(table, ()))
+    return found
+
+
+class LookupCache:
+    def __init__(self, default_ttl=DEFAULT_TTL):
+        self.default_ttl = default_ttl
+        self._entries = {}  # key -> (expires_at, tables, rows)
+        self._listeners = []
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a load that overlapped one is not stored
+        self._generation = 0
+
+    def get_or_load(self, key, tables, loader, ttl=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return list(entry[2])
+            generation = self._generation
+
+        rows = loader()
+        # Query helpers return [] on error, so empty results are never cached
+        if rows:
+            expires_at = now + (self.default_ttl if ttl is None else ttl)
+            with self._lock:
+                # A write during the load may not be reflected in these rows
+                if generation == self._generation:
+                    self._entries[key] = (expires_at, _normalize(tables), list(rows))
+        return rows
+
+    def invalidate(self, *tables):
+        """Drops every entry read from any of the given tables."""
+        affected = _normalize(tables)
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, entry in self._entries.items() if entry[1] & affected]
+            for key in stale:
+                del self._entries[key]
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(affected)
+            except Exception as e:
+                print(f"❌ Error in cache invalidation listener: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def add_invalidation_listener(self, callback):
+        """callback(tables) is called with the lowercase table names after each invalidation."""
+        with self._lock:
+            self._listeners.append(callback)
+
+
+lookup_cache = LookupCache()
+
+
+def cached_lookup(*tables, ttl=None):
+    """
+    Caches a query helper's rows, keyed by function and arguments.
+    tables: the tables the query reads; writes to any of them invalidate it.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            return lookup_cache.get_or_load(
+                key, tables, lambda: fn(*args, **kwargs), ttl
+            )
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
+
+
+def invalidates(*tables):
+    """Marks a write method: cached lookups on these tables are dropped after it runs."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                lookup_cache.invalidate(*tables)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,273 @@
+# db/migrations.py
+# Purpose: Versioned schema migrations, applied as a deploy step (not by the
+# application: index builds can take minutes and must not hold up the UI).
+# Each migration is a numbered list of statements; applied versions are
+# recorded in schema_migrations so every migration runs once per database.
+# Indexes are built CONCURRENTLY (the tables stay writable while they
+# build), so migrations run on a dedicated autocommit connection. A session
+# advisory lock keeps two runs from migrating at once; the second one skips
+# instead of waiting, since a session waiting on the lock holds a snapshot
+# that the concurrent build would in turn wait for.
+#
+# verify_indexes() EXPLAINs the hot queries and checks that the planner
+# uses the indexes created here:
+#     python -m db.migrations            apply pending migrations
+#     python -m db.migrations --verify   apply, then check the plans
+
+import json
+import sys
+
+from psycopg2 import extensions
+
+from db.connection import open_dedicated_connection
+
+_ADVISORY_LOCK_KEY = 7308202
+
+
+def _index(name, table, definition, using="btree", where=None):
+    """CREATE INDEX CONCURRENTLY statement for a migration step."""
+    sql = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING {using} ({definition})"
+    if where:
+        sql += f" WHERE {where}"
+    return name, sql
+
+
+# (version, description, [(index name or None, statement)])
+MIGRATIONS = [
+    (
+        1,
+        "Secondary indexes for the hot filter and join paths",
+        [
+            # Grade listings, reports and score maintenance filter by course and semester
+            _index("idx_grade_course_semester", "Grade", "Course_ID, Department_ID, Semester_ID"),
+            # Enrollment by course/semester (grade sheets, reports, status updates)
+            _index(
+                "idx_enrollment_course_semester_status",
+                "Enrollment",
+                "Course_ID, Department_ID, Semester_ID, Status",
+            ),
+            # The resit and exclusion reports only ever look at these two statuses
+            _index(
+                "idx_enrollment_course_attention",
+                "Enrollment",
+                "Course_ID, Department_ID",
+                where="Status IN ('Resit Eligible', 'Excluded')",
+            ),
+            # Instructor timetables and conflict checks; date ranges for calendars
+            _index("idx_reservation_instructor_date", "Reservation", "Instructor_ID, Reserv_Date"),
+            _index("idx_reservation_date", "Reservation", "Reserv_Date"),
+            # Students by group; ungrouped students (group deleted) are never looked up
+            _index("idx_student_group", "Student", "Group_ID", where="Group_ID IS NOT NULL"),
+            # Attendance by activity (their primary keys start with Student_ID)
+            _index("idx_lecture_attendance_activity", "Student_Lecture_Attendance", "Activity_ID, Attendance_Date"),
+            _index("idx_tutorial_attendance_activity", "Student_Tutorial_Attendance", "Activity_ID, Attendance_Date"),
+            _index("idx_practical_attendance_activity", "Student_Practical_Attendance", "Activity_ID, Attendance_Date"),
+        ],
+    ),
+    (
+        2,
+        "Trigram indexes for the substring searches",
+        [
+            (None, "CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+            # first_name / last_name ILIKE '%...%' (grade and attendance listings)
+            _index("idx_student_first_name_trgm", "Student", "First_Name gin_trgm_ops", using="gin"),
+            _index("idx_student_last_name_trgm", "Student", "Last_Name gin_trgm_ops", using="gin"),
+            # LOWER(first_name || ' ' || last_name) LIKE LOWER(...) (enrollment search)
+            _index(
+                "idx_student_full_name_trgm",
+                "Student",
+                "LOWER(First_Name || ' ' || Last_Name) gin_trgm_ops",
+                using="gin",
+            ),
+            # C.name ILIKE ... and LOWER(c.name) LIKE LOWER(...)
+            _index("idx_course_name_trgm", "Course", "name gin_trgm_ops", using="gin"),
+            _index("idx_course_lower_name_trgm", "Course", "LOWER(name) gin_trgm_ops", using="gin"),
+            # Audit log search by table name
+            _index("idx_audit_log_table_name_trgm", "audit_log", "LOWER(table_name) gin_trgm_ops", using="gin"),
+        ],
+    ),
+]
+
+# (description, query, indexes any of which the plan must use)
+PLAN_CHECKS = [
+    (
+        "Grade by course and semester",
+        "SELECT * FROM Grade WHERE Course_ID = 1 AND Department_ID = 1 AND Semester_ID = 1",
+        ("idx_grade_course_semester",),
+    ),
+    (
+        "Enrollment by course, semester and status",
+        "SELECT * FROM Enrollment WHERE Course_ID = 1 AND Department_ID = 1 "
+        "AND Semester_ID = 1 AND Status = 'Enrolled'",
+        ("idx_enrollment_course_semester_status",),
+    ),
+    (
+        "Excluded students of a course",
+        "SELECT * FROM Enrollment WHERE Course_ID = 1 AND Department_ID = 1 AND Status = 'Excluded'",
+        ("idx_enrollment_course_attention", "idx_enrollment_course_semester_status"),
+    ),
+    (
+        "Instructor reservations in a date range",
+        "SELECT * FROM Reservation WHERE Instructor_ID = 1 "
+        "AND Reserv_Date BETWEEN '2025-01-01' AND '2025-01-31'",
+        ("idx_reservation_instructor_date",),
+    ),
+    (
+        "Students of a group",
+        "SELECT * FROM Student WHERE Group_ID = 1",
+        ("idx_student_group",),
+    ),
+    (
+        "Lecture attendance of an activity",
+        "SELECT * FROM Student_Lecture_Attendance WHERE Activity_ID = 1",
+        ("idx_lecture_attendance_activity",),
+    ),
+    (
+        "Student name substring search",
+        "SELECT * FROM Student WHERE Last_Name ILIKE '%abc%'",
+        ("idx_student_last_name_trgm",),
+    ),
+    (
+        "Enrollment student name search",
+        "SELECT * FROM Student s WHERE LOWER(s.First_Name || ' ' || s.Last_Name) LIKE LOWER('%abc%')",
+        ("idx_student_full_name_trgm",),
+    ),
+    (
+        "Course name substring search",
+        "SELECT * FROM Course c WHERE LOWER(c.name) LIKE LOWER('%abc%')",
+        ("idx_course_lower_name_trgm",),
+    ),
+]
+
+
+def _connect():
+    connection = open_dedicated_connection()
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    connection.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+    return connection
+
+
+def _drop_if_invalid(cursor, index_name):
+    """A failed concurrent build leaves an INVALID index that IF NOT EXISTS would keep."""
+    cursor.execute(
+        """
+        SELECT 1 FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = %s AND NOT i.indisvalid;
+        """,
+        (index_name.lower(),),
+    )
+    if cursor.fetchone():
+        print(f"⚠️ Rebuilding invalid index {index_name}")
+        cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name};")
+
+
+def apply_migrations():
+    """
+    Applies every migration not yet recorded in schema_migrations.
+    Returns the list of versions applied, or None when another session is
+    already migrating. Raises on error; versions applied before the failing
+    one stay recorded.
+    """
+    connection = None
+    cursor = None
+    locked = False
+    applied = []
+    try:
+        connection = _connect()
+        cursor = connection.cursor()
+        cursor.execute("SELECT pg_try_advisory_lock(%s);", (_ADVISORY_LOCK_KEY,))
+        locked = cursor.fetchone()[0]
+        if not locked:
+            print("⚠️ Another session is applying migrations; skipped")
+            return None
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+            """
+        )
+        cursor.execute("SELECT version FROM schema_migrations;")
+        done = {row[0] for row in cursor.fetchall()}
+
+        for version, description, steps in MIGRATIONS:
+            if version in done:
+                continue
+            print(f"⏳ Applying migration {version}: {description}")
+            for index_name, statement in steps:
+                if index_name:
+                    _drop_if_invalid(cursor, index_name)
+                cursor.execute(statement)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s);",
+                (version, description),
+            )
+            applied.append(version)
+            print(f"✅ Migration {version} applied")
+        return applied
+    except Exception as e:
+        print(f"❌ Error applying migrations: {e}")
+        raise
+    finally:
+        if cursor is not None:
+            if locked:
+                try:
+                    cursor.execute("SELECT pg_advisory_unlock(%s);", (_ADVISORY_LOCK_KEY,))
+                except Exception:
+                    pass  # closing the connection releases the lock anyway
+            cursor.close()
+        if connection is not None:
+            connection.close()
+
+
+def _plan_indexes(plan):
+    """Names of all indexes used anywhere in an EXPLAIN (FORMAT JSON) plan node."""
+    found = set()
+    if "Index Name" in plan:
+        found.add(plan["Index Name"])
+    for child in plan.get("Plans", ()):
+        found |= _plan_indexes(child)
+    return found
+
+
+def verify_indexes():
+    """
+    EXPLAINs each PLAN_CHECKS query with sequential scans disabled (small
+    development tables would otherwise always be scanned) and checks that
+    one of its expected indexes is used.
+    Returns a list of (description, ok, indexes used).
+    """
+    connection = None
+    cursor = None
+    results = []
+    try:
+        connection = open_dedicated_connection()
+        cursor = connection.cursor()
+        cursor.execute("SET LOCAL enable_seqscan = off;")
+        for description, query, expected in PLAN_CHECKS:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {query}")
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            used = _plan_indexes(plan[0]["Plan"])
+            results.append((description, bool(used & set(expected)), sorted(used)))
+        connection.rollback()
+        return results
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if connection is not None:
+            connection.close()
+
+
+if __name__ == "__main__":
+    if apply_migrations() is None:
+        sys.exit(1)
+    if "--verify" in sys.argv[1:]:
+        checks = verify_indexes()
+        for description, ok, used in checks:
+            print(f"{'✅' if ok else '❌'} {description}: {', '.join(used) or 'no index'}")
+        sys.exit(0 if all(ok for _, ok, _ in checks) else 1)
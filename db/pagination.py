@@ -0,0 +1,81 @@
+# db/pagination.py
+# Purpose: Keyset (seek) pagination for the large listing queries.
+# A page is the next page_size rows after the last row already shown, found
+# with a WHERE on (sort column, primary key) instead of OFFSET, so page 500
+# costs the same as page 1 and rows inserted meanwhile do not shift pages.
+#
+# Usage in a query method:
+#     keyset = Keyset("s.last_name", "s.student_id", sort_order, after, page_size)
+#     condition, keyset_params = keyset.condition()
+#     sql = f"SELECT ..., {keyset.columns()} FROM ... WHERE ... AND {condition}"
+#     sql += keyset.order_by() + keyset.limit()
+#     return keyset.page(cursor.fetchall())
+#
+# page() returns (rows, next_after): pass next_after back as `after` to get
+# the following page; it is None on the last page.
+
+DEFAULT_PAGE_SIZE = 200
+
+
+class Keyset:
+    def __init__(self, sort_expr, key_expr, sort_order="ASC", after=None,
+                 page_size=DEFAULT_PAGE_SIZE):
+        """
+        Args:
+            sort_expr: SQL expression of the (whitelisted) sort column
+            key_expr: SQL expression of the unique key used as tiebreaker
+            sort_order: "ASC" or "DESC"; the tiebreaker follows it
+            after: next_after of the previous page, None for the first page
+            page_size: Rows per page
+        """
+        self.sort_expr = sort_expr
+        self.key_expr = key_expr
+        self.sort_order = sort_order if sort_order in ("ASC", "DESC") else "ASC"
+        self.after = after
+        self.page_size = max(1, int(page_size or DEFAULT_PAGE_SIZE))
+        # Sorting by the key itself needs no tiebreaker
+        self.single = sort_expr == key_expr
+
+    def columns(self):
+        """Trailing select columns carrying the sort value and key of each row."""
+        return f"{self.sort_expr} AS page_sort, {self.key_expr} AS page_key"
+
+    def condition(self, sort_expr=None, key_expr=None):
+        """WHERE fragment selecting the rows after `after`, and its params."""
+        if self.after is None:
+            return "TRUE", []
+        sort_expr = sort_expr or self.sort_expr
+        key_expr = key_expr or self.key_expr
+        after_sort, after_key = self.after
+        op = ">" if self.sort_order == "ASC" else "<"
+
+        if self.single:
+            return f"{key_expr} {op} %s", [after_key]
+        if after_sort is None:
+            # NULLs sort last: only the rest of the NULL block is left
+            return f"({sort_expr} IS NULL AND {key_expr} {op} %s)", [after_key]
+        return (
+            f"(({sort_expr}, {key_expr}) {op} (%s, %s) OR {sort_expr} IS NULL)",
+            [after_sort, after_key],
+        )
+
+    def order_by(self, sort_expr=None, key_expr=None):
+        sort_expr = sort_expr or self.sort_expr
+        key_expr = key_expr or self.key_expr
+        if self.single:
+            return f" ORDER BY {key_expr} {self.sort_order}"
+        return f" ORDER BY {sort_expr} {self.sort_order} NULLS LAST, {key_expr} {self.sort_order}"
+
+    def limit(self):
+        # One extra row tells whether another page exists
+        return f" LIMIT {self.page_size + 1}"
+
+    def page(self, rows):
+        """
+        Splits fetched rows (ending with the columns() pair) into the page
+        rows without those two columns and the after-key of the next page.
+        """
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        next_after = (rows[-1][-2], rows[-1][-1]) if has_more and rows else None
+        return [tuple(row[:-2]) for row in rows], next_after
@@ -0,0 +1,230 @@
+# db/report_export.py
+# Purpose: Export a report function's full result straight from the server
+# to a file, without going through a table model.
+# CSV uses COPY (SELECT * FROM fn(...)) TO STDOUT, so PostgreSQL formats the
+# rows and they are written to disk as they arrive. Parquet (needs pyarrow)
+# reads the rows through a server-side cursor and writes one row group per
+# batch. Either way memory use does not depend on the size of the result.
+# Files are written next to the target as *.part and renamed when complete,
+# so a failed or cancelled export never leaves a truncated file behind.
+
+import itertools
+import os
+
+from psycopg2 import extensions, sql
+
+from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.results_queries import STREAM_ITERSIZE
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+PARQUET_AVAILABLE = pa is not None
+
+# Report progress every this many rows
+PROGRESS_EVERY = 5000
+
+_cursor_names = itertools.count(1)
+
+
+def report_query(function_name, params=(), search=None):
+    """
+    SELECT * FROM function_name(params), optionally keeping only rows where
+    one of the given columns contains a search term.
+
+    Args:
+        search: Optional (column_names, term), case-insensitive match
+    """
+    query = sql.SQL("SELECT * FROM {}({}) AS r").format(
+        sql.SQL(function_name),  # function names come from the views' fixed maps
+        sql.SQL(", ").join(sql.Placeholder() * len(params)),
+    )
+    params = list(params)
+    if search and search[0] and search[1]:
+        columns, term = search
+        query += sql.SQL(" WHERE ") + sql.SQL(" OR ").join(
+            sql.SQL("r.{}::text ILIKE %s").format(sql.Identifier(column)) for column in columns
+        )
+        params += [f"%{term}%"] * len(columns)
+    return query, params
+
+
+class _CountingWriter:
+    """Binary file wrapper for copy_expert that reports written lines to a progress callback."""
+
+    def __init__(self, file, progress):
+        self.file = file
+        self.progress = progress
+        self.lines = 0
+        self._next_report = PROGRESS_EVERY
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.file.write(data)
+        self.lines += data.count(b"\n")
+        if self.progress and self.lines >= self._next_report:
+            self.progress(self.lines)
+            self._next_report = self.lines + PROGRESS_EVERY
+
+
+def _finish(part_path, path, ok):
+    if ok:
+        os.replace(part_path, path)
+    elif os.path.exists(part_path):
+        os.remove(part_path)
+
+
+def export_csv(path, function_name, params=(), search=None, progress=None):
+    """
+    Writes the report to a CSV file with a header row via COPY.
+    Returns the number of lines written after the header (embedded newlines
+    in quoted values count too). Raises on error.
+    """
+    connection = None
+    cursor = None
+    part_path = path + ".part"
+    ok = False
+    try:
+        connection = get_connection()
+        cursor = get_cursor(connection)
+        query, query_params = report_query(function_name, params, search)
+        # COPY takes no bind parameters: inline them with proper quoting first
+        encoding = extensions.encodings.get(connection.encoding, "utf-8")
+        select = cursor.mogrify(query, query_params).decode(encoding)
+        copy = f"COPY ({select}) TO STDOUT WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')"
+
+        with open(part_path, "wb") as file:
+            writer = _CountingWriter(file, progress)
+            cursor.copy_expert(copy, writer)
+        ok = True
+        rows = max(0, writer.lines - 1)
+        if progress:
+            progress(rows)
+        print(f"✅ Exported {function_name} to {path} ({rows} rows)")
+        return rows
+    except Exception as e:
+        print(f"❌ Error exporting {function_name}: {e}")
+        raise
+    finally:
+        close_cursor(cursor)
+        close_connection(connection)
+        _finish(part_path, path, ok)
+
+
+# PostgreSQL type OID -> Arrow type; anything else is written as text
+_ARROW_TYPES = {
+    16: "bool_",
+    20: "int64",
+    21: "int16",
+    23: "int32",
+    700: "float32",
+    701: "float64",
+    1700: "float64",  # numeric: report values are averages/percentages
+    1082: "date32",
+    1114: "timestamp",
+    1184: "timestamptz",
+    1083: "time64",
+}
+
+
+def _arrow_type(type_code):
+    name = _ARROW_TYPES.get(type_code)
+    if name == "timestamp":
+        return pa.timestamp("us")
+    if name == "timestamptz":
+        return pa.timestamp("us", tz="UTC")
+    if name == "time64":
+        return pa.time64("us")
+    if name:
+        return getattr(pa, name)()
+    return pa.string()
+
+
+def export_parquet(path, function_name, params=(), search=None, progress=None,
+                   itersize=STREAM_ITERSIZE):
+    """
+    Writes the report to a Parquet file, one row group per fetched batch.
+    Returns the number of rows written. Raises on error (RuntimeError if
+    pyarrow is not installed).
+    """
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("Parquet export needs the pyarrow package")
+
+    connection = None
+    cursor = None
+    writer = None
+    part_path = path + ".part"
+    ok = False
+    try:
+        connection = get_connection()
+        cursor = connection.cursor(name=f"export_{function_name}_{next(_cursor_names)}")
+        cursor.itersize = itersize
+        query, query_params = report_query(function_name, params, search)
+        cursor.execute(query, query_params)
+
+        total = 0
+        reported = 0
+        while True:
+            rows = cursor.fetchmany(itersize)
+            if writer is None:
+                # Types come from the result description, not from the values,
+                # so a batch of NULLs cannot change the schema midway
+                schema = pa.schema(
+                    [(desc[0], _arrow_type(desc[1])) for desc in cursor.description]  # type:ignore
+                )
+                converters = [_converter(desc[1]) for desc in cursor.description]  # type:ignore
+                writer = pq.ParquetWriter(part_path, schema)
+            if not rows:
+                break
+            columns = [
+                [convert(row[i]) if convert else row[i] for row in rows]
+                for i, convert in enumerate(converters)
+            ]
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            total += len(rows)
+            if progress and total - reported >= PROGRESS_EVERY:
+                progress(total)
+                reported = total
+
+        writer.close()
+        writer = None
+        ok = True
+        if progress:
+            progress(total)
+        print(f"✅ Exported {function_name} to {path} ({total} rows)")
+        return total
+    except Exception as e:
+        print(f"❌ Error exporting {function_name}: {e}")
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+        try:
+            close_cursor(cursor)
+        except Exception:
+            pass  # CLOSE can fail in an aborted transaction; release() rolls back anyway
+        close_connection(connection)
+        _finish(part_path, path, ok)
+
+
+def _converter(type_code):
+    """Python-side conversion for values pyarrow does not take as they come."""
+    if type_code == 1700:
+        return lambda value: None if value is None else float(value)  # Decimal
+    if type_code not in _ARROW_TYPES:
+        return lambda value: None if value is None else str(value)
+    return None
+
+
+def export_report(path, function_name, params=(), search=None, progress=None):
+    """Exports to Parquet for *.parquet paths, CSV otherwise."""
+    if path.lower().endswith(".parquet"):
+        return export_parquet(path, function_name, params, search, progress)
+    return export_csv(path, function_name, params, search, progress)
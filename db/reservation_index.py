@@ -0,0 +1,245 @@
+# db/reservation_index.py
+# Purpose: Answer interactive "is this slot free?" questions from memory.
+# Reservations of a date window are loaded once (one query) into per-room and
+# per-instructor interval lists keyed by date. The index is marked stale when
+# the reservation table changes, locally or on another workstation, and is
+# reloaded on the next lookup. The database stays authoritative: overlapping
+# writes are still rejected by the EX_Reservation_*_Overlap constraints.
+
+import bisect
+import threading
+from datetime import date, datetime, time, timedelta
+
+from db.change_listener import change_listener
+from db.lookup_cache import lookup_cache
+from db.reservation_queries import ReservationQueries
+
+WINDOW_DAYS_BEFORE = 7
+WINDOW_DAYS_AFTER = 28
+DAY_START = time(8, 0)
+DAY_END = time(18, 0)
+SLOT_STEP_MINUTES = 15
+
+
+def to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def to_minutes(value):
+    """Minutes since midnight for a time or an 'HH:MM[:SS]' string."""
+    if isinstance(value, (time, datetime)):
+        return value.hour * 60 + value.minute + value.second / 60
+    parts = [int(p) for p in str(value).split(":")]
+    return parts[0] * 60 + (parts[1] if len(parts) > 1 else 0) + (parts[2] / 60 if len(parts) > 2 else 0)
+
+
+def from_minutes(minutes):
+    minutes = int(minutes)
+    return time(minutes // 60, minutes % 60)
+
+
+class IntervalList:
+    """
+    Static interval index for one (resource, date): intervals sorted by start
+    plus a running maximum of end times. An overlap query bisects to the
+    first interval starting at or after the query end and walks back only
+    while the running maximum can still reach the query start.
+    """
+
+    def __init__(self, intervals):
+        # intervals: iterable of (start_min, end_min, row)
+        self._items = sorted(intervals, key=lambda item: (item[0], item[1]))
+        self._starts = [item[0] for item in self._items]
+        self._max_end = []
+        running = float("-inf")
+        for item in self._items:
+            running = max(running, item[1])
+            self._max_end.append(running)
+
+    def overlapping(self, start, end):
+        """Rows of the intervals overlapping the half-open [start, end), in start order."""
+        found = []
+        i = bisect.bisect_left(self._starts, end) - 1
+        while i >= 0 and self._max_end[i] > start:
+            item = self._items[i]
+            if item[1] > start:
+                found.append(item[2])
+            i -= 1
+        found.reverse()
+        return found
+
+    def items(self):
+        return list(self._items)
+
+
+EMPTY = IntervalList(())
+
+
+class ReservationIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._window = None  # (first_date, last_date) loaded
+        self._stale = True
+        self._rooms = {}  # (building, roomno, date) -> IntervalList
+        self._instructors = {}  # (instructor_id, date) -> IntervalList
+        lookup_cache.add_invalidation_listener(self._on_tables_changed)
+        change_listener.add_listener(self._on_notification)
+
+    # ---------- freshness ----------
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+
+    def _on_tables_changed(self, tables):
+        if "reservation" in tables or "course" in tables:
+            self.invalidate()
+
+    def _on_notification(self, table, operation):
+        # "*" is sent after a reconnect, when notifications may have been missed
+        if table in ("reservation", "course", "*"):
+            self.invalidate()
+
+    def ensure_loaded(self, day):
+        """Loads the window around day unless it is already loaded and fresh."""
+        day = to_date(day)
+        with self._lock:
+            window, stale = self._window, self._stale
+        if not stale and window and window[0] <= day <= window[1]:
+            return True
+        return self.load_window(
+            day - timedelta(days=WINDOW_DAYS_BEFORE), day + timedelta(days=WINDOW_DAYS_AFTER)
+        )
+
+    def load_window(self, first_date, last_date):
+        with self._lock:
+            self._stale = False  # a change arriving while we load marks it stale again
+        rows = ReservationQueries.get_reservations_in_range(first_date, last_date)
+        if rows is None:
+            self.invalidate()
+            return False
+
+        rooms = {}
+        instructors = {}
+        # row: id, date, start, end, building, roomno, instructor_id, course_name
+        for row in rows:
+            reservation_id, day, start, end, building, roomno, instructor_id, course_name = row
+            start_min, end_min = to_minutes(start), to_minutes(end)
+            rooms.setdefault((building, roomno, day), []).append(
+                (start_min, end_min, (reservation_id, start, end, course_name))
+            )
+            instructors.setdefault((instructor_id, day), []).append(
+                (start_min, end_min, (reservation_id, start, end, course_name, building, roomno))
+            )
+
+        with self._lock:
+            self._rooms = {key: IntervalList(items) for key, items in rooms.items()}
+            self._instructors = {key: IntervalList(items) for key, items in instructors.items()}
+            self._window = (first_date, last_date)
+        return True
+
+    # ---------- lookups ----------
+    # Results have the same shape as ReservationQueries.check_*_conflict,
+    # which they fall back to when the window cannot be loaded.
+
+    def room_conflicts(self, building, room_no, reserv_date, start_time, end_time, exclude_id=None):
+        day = to_date(reserv_date)
+        if not self.ensure_loaded(day):
+            return ReservationQueries.check_room_conflict(
+                building, room_no, reserv_date, start_time, end_time, exclude_id
+            )
+        with self._lock:
+            intervals = self._rooms.get((building, room_no, day), EMPTY)
+        rows = intervals.overlapping(to_minutes(start_time), to_minutes(end_time))
+        return [row for row in rows if row[0] != exclude_id]
+
+    def instructor_conflicts(self, instructor_id, reserv_date, start_time, end_time, exclude_id=None):
+        day = to_date(reserv_date)
+        if not self.ensure_loaded(day):
+            return ReservationQueries.check_instructor_conflict(
+                instructor_id, reserv_date, start_time, end_time, exclude_id
+            )
+        with self._lock:
+            intervals = self._instructors.get((instructor_id, day), EMPTY)
+        rows = intervals.overlapping(to_minutes(start_time), to_minutes(end_time))
+        return [row for row in rows if row[0] != exclude_id]
+
+    def free_slots(self, reserv_date, building=None, room_no=None, instructor_id=None,
+                   day_start=DAY_START, day_end=DAY_END, exclude_id=None):
+        """
+        Free (start, end) time pairs of a day where the room and/or instructor
+        are both free. None if the reservations of that day cannot be read.
+        """
+        day = to_date(reserv_date)
+        if self.ensure_loaded(day):
+            lists = []
+            with self._lock:
+                if building is not None:
+                    lists.append(self._rooms.get((building, room_no, day), EMPTY))
+                if instructor_id is not None:
+                    lists.append(self._instructors.get((instructor_id, day), EMPTY))
+            busy = [
+                (start, end)
+                for intervals in lists
+                for start, end, row in intervals.items()
+                if row[0] != exclude_id
+            ]
+        else:
+            # Window not loadable; read just this day instead of trusting old data
+            rows = ReservationQueries.get_reservations_in_range(day, day)
+            if rows is None:
+                return None
+            busy = [
+                (to_minutes(start), to_minutes(end))
+                for reservation_id, _, start, end, r_building, r_roomno, r_instructor, _ in rows
+                if reservation_id != exclude_id
+                and (
+                    (building is not None and (r_building, r_roomno) == (building, room_no))
+                    or (instructor_id is not None and r_instructor == instructor_id)
+                )
+            ]
+        busy.sort()
+
+        free = []
+        cursor = to_minutes(day_start)
+        limit = to_minutes(day_end)
+        for start, end in busy:
+            if start > cursor:
+                free.append((cursor, min(start, limit)))
+            cursor = max(cursor, end)
+            if cursor >= limit:
+                break
+        if cursor < limit:
+            free.append((cursor, limit))
+        return [(from_minutes(s), from_minutes(e)) for s, e in free if e > s]
+
+    def next_available(self, reserv_date, duration_minutes, building=None, room_no=None,
+                       instructor_id=None, earliest=None, day_start=DAY_START,
+                       day_end=DAY_END, days_ahead=WINDOW_DAYS_AFTER, exclude_id=None):
+        """
+        First (date, start, end) on or after reserv_date/earliest where the slot
+        fits, aligned to SLOT_STEP_MINUTES. None if nothing fits in days_ahead.
+        Raises RuntimeError if the reservations cannot be read.
+        """
+        day = to_date(reserv_date)
+        for offset in range(days_ahead + 1):
+            current = day + timedelta(days=offset)
+            not_before = to_minutes(earliest) if (offset == 0 and earliest) else 0
+            slots = self.free_slots(
+                current, building, room_no, instructor_id, day_start, day_end, exclude_id
+            )
+            if slots is None:
+                raise RuntimeError(f"Could not read the reservations of {current}")
+            for free_start, free_end in slots:
+                start = max(to_minutes(free_start), not_before)
+                start = -(-start // SLOT_STEP_MINUTES) * SLOT_STEP_MINUTES
+                if start + duration_minutes <= to_minutes(free_end):
+                    return current, from_minutes(start), from_minutes(start + duration_minutes)
+        return None
+
+
+reservation_index = ReservationIndex()
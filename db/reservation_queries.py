@@ -1,9 +1,101 @@
+from datetime import timedelta
+
+from psycopg2 import errors
+from psycopg2.extras import execute_values
+
 from db.connection import get_connection, get_cursor, close_connection, close_cursor
+from db.lookup_cache import cached_lookup, invalidates
+from db.pagination import DEFAULT_PAGE_SIZE, Keyset
+
+# Booked slot as a half-open range, comparable with reservation.time_span.
+# Overlap tests against it (time_span && ...) are answered by the GiST
+# indexes of the EX_Reservation_*_Overlap constraints.
+SLOT_RANGE = "tsrange(%s::date + %s::time, %s::date + %s::time, '[)')"
+
+# Sortable columns of the reservation listing -> SQL expression
+RESERVATION_SORTS = {
+    "reserv_date": "r.reserv_date",
+    "start_time": "r.start_time",
+    "course_name": "c.name",
+    "instructor_name": "i.last_name || ' ' || i.first_name",
+    "building": "r.building",
+}
+
+OVERLAP_MESSAGES = {
+    "ex_reservation_room_overlap": "The room is already booked for an overlapping time.",
+    "ex_reservation_instructor_overlap": "The instructor already has a reservation at an overlapping time.",
+}
+
+
+class ReservationConflictError(Exception):
+    """Raised when a write is rejected by one of the overlap constraints."""
+
+
+def conflict_error(e):
+    constraint = (getattr(e.diag, "constraint_name", None) or "").lower()
+    return ReservationConflictError(
+        OVERLAP_MESSAGES.get(constraint, "The reservation overlaps an existing booking.")
+    )
+
+
+def series_dates(first_date, last_date, interval_weeks=1, exceptions=()):
+    """Dates of a weekly (interval_weeks=1) or bi-weekly (2) series, minus exception dates."""
+    skip = set(exceptions)
+    dates = []
+    current = first_date
+    while current <= last_date:
+        if current not in skip:
+            dates.append(current)
+        current += timedelta(weeks=interval_weeks)
+    return dates
+
+
+# One row per (occurrence, clashing reservation). Both branches are GiST
+# lookups on the overlap constraint indexes.
+SERIES_CONFLICTS_SQL = """
+    WITH slots AS (
+        SELECT d AS occurrence,
+               tsrange(d + %(start)s::time, d + %(end)s::time, '[)') AS span
+        FROM unnest(%(dates)s::date[]) AS d
+    )
+    SELECT s.occurrence, 'Room' AS conflict_type, r.reservation_id,
+           r.start_time, r.end_time, c.name AS course_name, r.building, r.roomno
+    FROM slots s
+    JOIN reservation r
+      ON r.building = %(building)s AND r.roomno = %(roomno)s
+     AND r.time_span && s.span
+    JOIN course c ON r.course_id = c.course_id
+    UNION ALL
+    SELECT s.occurrence, 'Instructor', r.reservation_id,
+           r.start_time, r.end_time, c.name, r.building, r.roomno
+    FROM slots s
+    JOIN reservation r
+      ON r.instructor_id = %(instructor_id)s
+     AND r.time_span && s.span
+    JOIN course c ON r.course_id = c.course_id
+    ORDER BY 1, 2;
+"""
+
+
+RESERVATION_INSERT_SQL = """
+    INSERT INTO reservation (building, roomno, course_id, department_id,
+                            activity_type, instructor_id, reserv_date,
+                            start_time, end_time, hours_number)
+    VALUES %s
+    RETURNING reservation_id;
+"""
+
+
+def insert_reservations(cursor, rows):
+    """Multi-row INSERT of (building, roomno, course_id, department_id, activity_type,
+    instructor_id, reserv_date, start_time, end_time, hours_number) tuples; returns new ids."""
+    return [row[0] for row in execute_values(cursor, RESERVATION_INSERT_SQL, rows, fetch=True)]
 
 
 class ReservationQueries:
     
     @staticmethod
+    @invalidates("Reservation")
     def create_reservation(building, room_no, course_id, department_id, 
                           activity_type, instructor_id, reserv_date, 
                           start_time, end_time, hours_number):
@@ -32,6 +124,11 @@ class ReservationQueries:
             print(f"✅ Reservation created with ID: {new_id}")
             return new_id
             
+        except errors.ExclusionViolation as e:
+            if connection:
+                connection.rollback()
+            print(f"❌ Error creating reservation: {e}")
+            raise conflict_error(e) from e
         except Exception as e:
             if connection:
                 connection.rollback()
@@ -41,6 +138,168 @@ class ReservationQueries:
             close_cursor(cursor)
             close_connection(connection)
 
+    @staticmethod
+    @invalidates("Reservation")
+    def create_reservation_series(building, room_no, course_id, department_id,
+                                  activity_type, instructor_id, dates,
+                                  start_time, end_time, hours_number):
+        """
+        Create one reservation per date in a single transaction.
+        All occurrences are conflict checked first; if any clashes, nothing is
+        inserted and ReservationConflictError lists the clashing dates.
+        Returns the new reservation ids.
+        """
+        connection = None
+        cursor = None
+
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            cursor.execute(SERIES_CONFLICTS_SQL, {
+                "dates": list(dates), "start": start_time, "end": end_time,
+                "building": building, "roomno": room_no, "instructor_id": instructor_id,
+            })
+            conflicts = cursor.fetchall()
+            if conflicts:
+                clashing = sorted({str(row[0]) for row in conflicts})
+                raise ReservationConflictError(
+                    f"{len(clashing)} occurrence(s) clash with existing bookings: "
+                    + ", ".join(clashing)
+                )
+
+            rows = [
+                (building, room_no, course_id, department_id, activity_type,
+                 instructor_id, day, start_time, end_time, hours_number)
+                for day in dates
+            ]
+            new_ids = insert_reservations(cursor, rows)
+            connection.commit()
+            print(f"✅ Reservation series created: {len(new_ids)} reservations")
+            return new_ids
+
+        except errors.ExclusionViolation as e:
+            if connection:
+                connection.rollback()
+            print(f"❌ Error creating reservation series: {e}")
+            raise conflict_error(e) from e
+        except Exception as e:
+            if connection:
+                connection.rollback()
+            print(f"❌ Error creating reservation series: {e}")
+            raise e
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    @staticmethod
+    @invalidates("Reservation")
+    def create_reservations_bulk(rows):
+        """
+        Insert many reservations in one transaction (all or nothing).
+        Overlaps with existing bookings are rejected by the exclusion
+        constraints and raised as ReservationConflictError. Returns the new ids.
+        """
+        connection = None
+        cursor = None
+
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            new_ids = insert_reservations(cursor, rows)
+            connection.commit()
+            print(f"✅ {len(new_ids)} reservations created")
+            return new_ids
+
+        except errors.ExclusionViolation as e:
+            if connection:
+                connection.rollback()
+            print(f"❌ Error creating reservations: {e}")
+            raise conflict_error(e) from e
+        except Exception as e:
+            if connection:
+                connection.rollback()
+            print(f"❌ Error creating reservations: {e}")
+            raise e
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    @staticmethod
+    def check_series_conflicts(building, room_no, instructor_id, dates, start_time, end_time):
+        """
+        Check every occurrence of a series in one query.
+        Returns (date, 'Room'|'Instructor', reservation_id, start, end,
+        course_name, building, roomno) rows, or None on error so callers can
+        tell it from a free series.
+        """
+        connection = None
+        cursor = None
+
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            cursor.execute(SERIES_CONFLICTS_SQL, {
+                "dates": list(dates), "start": start_time, "end": end_time,
+                "building": building, "roomno": room_no, "instructor_id": instructor_id,
+            })
+            return cursor.fetchall()
+
+        except Exception as e:
+            print(f"❌ Error checking series conflicts: {e}")
+            return None
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    @staticmethod
+    def _reservations_query(search_field=None, search_value=None, extra_columns=""):
+        """SELECT shared by get_all_reservations and get_reservations_page, ending in a WHERE"""
+        sql = f"""
+            SELECT 
+                r.reservation_id,
+                r.reserv_date,
+                r.start_time,
+                r.end_time,
+                r.hours_number,
+                c.name AS course_name,
+                d.name AS department_name,
+                r.activity_type,
+                i.last_name || ' ' || i.first_name AS instructor_name,
+                r.building,
+                r.roomno,
+                r.course_id,
+                r.department_id,
+                r.instructor_id{extra_columns}
+            FROM reservation r
+            JOIN course c ON r.course_id = c.course_id
+            JOIN department d ON r.department_id = d.department_id
+            JOIN instructor i ON r.instructor_id = i.instructor_id
+            WHERE TRUE
+        """
+        
+        params = []
+        
+        if search_field and search_value:
+            if search_field == 'course_name':
+                sql += " AND LOWER(c.name) LIKE LOWER(%s)"
+                params.append(f"%{search_value}%")
+            elif search_field == 'instructor_name':
+                sql += " AND LOWER(i.last_name || ' ' || i.first_name) LIKE LOWER(%s)"
+                params.append(f"%{search_value}%")
+            elif search_field == 'activity_type':
+                sql += " AND r.activity_type = %s"
+                params.append(search_value)
+            elif search_field == 'building':
+                sql += " AND r.building = %s"
+                params.append(search_value)
+            elif search_field == 'reserv_date':
+                sql += " AND r.reserv_date = %s"
+                params.append(search_value)
+        return sql, params
+
     @staticmethod
     def get_all_reservations(search_field=None, search_value=None, 
                             sort_by='reserv_date', sort_order='ASC'):
@@ -52,49 +311,9 @@ class ReservationQueries:
             connection = get_connection()
             cursor = get_cursor(connection)
             
-            sql = """
-                SELECT 
-                    r.reservation_id,
-                    r.reserv_date,
-                    r.start_time,
-                    r.end_time,
-                    r.hours_number,
-                    c.name AS course_name,
-                    d.name AS department_name,
-                    r.activity_type,
-                    i.last_name || ' ' || i.first_name AS instructor_name,
-                    r.building,
-                    r.roomno,
-                    r.course_id,
-                    r.department_id,
-                    r.instructor_id
-                FROM reservation r
-                JOIN course c ON r.course_id = c.course_id
-                JOIN department d ON r.department_id = d.department_id
-                JOIN instructor i ON r.instructor_id = i.instructor_id
-            """
+            sql, params = ReservationQueries._reservations_query(search_field, search_value)
             
-            params = []
-            
-            if search_field and search_value:
-                if search_field == 'course_name':
-                    sql += " WHERE LOWER(c.name) LIKE LOWER(%s)"
-                    params.append(f"%{search_value}%")
-                elif search_field == 'instructor_name':
-                    sql += " WHERE LOWER(i.last_name || ' ' || i.first_name) LIKE LOWER(%s)"
-                    params.append(f"%{search_value}%")
-                elif search_field == 'activity_type':
-                    sql += " WHERE r.activity_type = %s"
-                    params.append(search_value)
-                elif search_field == 'building':
-                    sql += " WHERE r.building = %s"
-                    params.append(search_value)
-                elif search_field == 'reserv_date':
-                    sql += " WHERE r.reserv_date = %s"
-                    params.append(search_value)
-            
-            valid_sort = ['reserv_date', 'start_time', 'course_name', 'instructor_name', 'building']
-            if sort_by not in valid_sort:
+            if sort_by not in RESERVATION_SORTS:
                 sort_by = 'reserv_date'
             if sort_order not in ['ASC', 'DESC']:
                 sort_order = 'ASC'
@@ -114,6 +333,40 @@ class ReservationQueries:
             close_cursor(cursor)
             close_connection(connection)
 
+    @staticmethod
+    def get_reservations_page(search_field=None, search_value=None,
+                              sort_by='reserv_date', sort_order='ASC',
+                              page_size=DEFAULT_PAGE_SIZE, after=None):
+        """
+        One page of get_all_reservations, with reservation_id as tiebreaker.
+        Returns (rows, next_after), or None on error; pass next_after back
+        for the next page.
+        """
+        connection = None
+        cursor = None
+        
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+            
+            sort_col = RESERVATION_SORTS.get(sort_by, RESERVATION_SORTS['reserv_date'])
+            keyset = Keyset(sort_col, "r.reservation_id", sort_order, after, page_size)
+            sql, params = ReservationQueries._reservations_query(
+                search_field, search_value, ", " + keyset.columns()
+            )
+            condition, keyset_params = keyset.condition()
+            sql += f" AND {condition}" + keyset.order_by() + keyset.limit()
+            
+            cursor.execute(sql, params + keyset_params)
+            return keyset.page(cursor.fetchall())
+            
+        except Exception as e:
+            print(f"❌ Error fetching reservations: {e}")
+            return None
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
     @staticmethod
     def get_reservation_by_id(reservation_id):
         """Get a single reservation by ID"""
@@ -148,6 +401,7 @@ class ReservationQueries:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Reservation")
     def update_reservation(reservation_id, building, room_no, course_id, 
                           department_id, activity_type, instructor_id, 
                           reserv_date, start_time, end_time, hours_number):
@@ -182,6 +436,11 @@ class ReservationQueries:
                 print(f"⚠️ No reservation found with ID {reservation_id}")
                 return False
                 
+        except errors.ExclusionViolation as e:
+            if connection:
+                connection.rollback()
+            print(f"❌ Error updating reservation: {e}")
+            raise conflict_error(e) from e
         except Exception as e:
             if connection:
                 connection.rollback()
@@ -192,6 +451,7 @@ class ReservationQueries:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Reservation")
     def delete_reservation(reservation_id):
         """Delete a reservation by ID"""
         connection = None
@@ -232,19 +492,17 @@ class ReservationQueries:
             connection = get_connection()
             cursor = get_cursor(connection)
             
-            sql = """
+            sql = f"""
                 SELECT reservation_id, start_time, end_time,
                        c.name AS course_name
                 FROM reservation r
                 JOIN course c ON r.course_id = c.course_id
-                WHERE r.building = %s 
+                WHERE r.building = %s
                 AND r.roomno = %s
-                AND r.reserv_date = %s
-                AND r.start_time < %s
-                AND r.end_time > %s
+                AND r.time_span && {SLOT_RANGE}
             """
-            
-            params = [building, room_no, reserv_date, end_time, start_time]
+
+            params = [building, room_no, reserv_date, start_time, reserv_date, end_time]
             
             if exclude_id:
                 sql += " AND r.reservation_id != %s"
@@ -272,18 +530,16 @@ class ReservationQueries:
             connection = get_connection()
             cursor = get_cursor(connection)
             
-            sql = """
+            sql = f"""
                 SELECT reservation_id, start_time, end_time,
                        c.name AS course_name, r.building, r.roomno
                 FROM reservation r
                 JOIN course c ON r.course_id = c.course_id
                 WHERE r.instructor_id = %s
-                AND r.reserv_date = %s
-                AND r.start_time < %s
-                AND r.end_time > %s
+                AND r.time_span && {SLOT_RANGE}
             """
-            
-            params = [instructor_id, reserv_date, end_time, start_time]
+
+            params = [instructor_id, reserv_date, start_time, reserv_date, end_time]
             
             if exclude_id:
                 sql += " AND r.reservation_id != %s"
@@ -301,9 +557,70 @@ class ReservationQueries:
             close_cursor(cursor)
             close_connection(connection)
 
+    @staticmethod
+    def get_reservations_in_range(start_date, end_date):
+        """
+        Reservations between two dates (inclusive) for the client-side conflict
+        index. Returns None on error so callers can tell it from a free window.
+        """
+        connection = None
+        cursor = None
+
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            sql = """
+                SELECT r.reservation_id, r.reserv_date, r.start_time, r.end_time,
+                       r.building, r.roomno, r.instructor_id,
+                       c.name AS course_name
+                FROM reservation r
+                JOIN course c ON r.course_id = c.course_id
+                WHERE r.reserv_date BETWEEN %s AND %s
+                ORDER BY r.reserv_date, r.start_time;
+            """
+
+            cursor.execute(sql, (start_date, end_date))
+            return cursor.fetchall()
+
+        except Exception as e:
+            print(f"❌ Error fetching reservations in range: {e}")
+            return None
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    @staticmethod
+    def get_room_bookings_on_dates(dates):
+        """
+        building, roomno, reserv_date, start_time, end_time of every reservation
+        on the given dates. Returns None on error.
+        """
+        connection = None
+        cursor = None
+
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            sql = """
+                SELECT building, roomno, reserv_date, start_time, end_time
+                FROM reservation
+                WHERE reserv_date = ANY(%s::date[]);
+            """
+            cursor.execute(sql, (list(dates),))
+            return cursor.fetchall()
+
+        except Exception as e:
+            print(f"❌ Error fetching room bookings: {e}")
+            return None
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
     @staticmethod
     def get_available_rooms(reserv_date, start_time, end_time, min_capacity=None):
-        """Find available rooms at specified time"""
+        """Find available rooms at specified time. Returns None on error."""
         connection = None
         cursor = None
         
@@ -311,20 +628,18 @@ class ReservationQueries:
             connection = get_connection()
             cursor = get_cursor(connection)
             
-            sql = """
+            sql = f"""
                 SELECT r.building, r.roomno, r.capacity
                 FROM room r
                 WHERE NOT EXISTS (
                     SELECT 1 FROM reservation res
                     WHERE res.building = r.building
                     AND res.roomno = r.roomno
-                    AND res.reserv_date = %s
-                    AND res.start_time < %s
-                    AND res.end_time > %s
+                    AND res.time_span && {SLOT_RANGE}
                 )
             """
-            
-            params = [reserv_date, end_time, start_time]
+
+            params = [reserv_date, start_time, reserv_date, end_time]
             
             if min_capacity:
                 sql += " AND r.capacity >= %s"
@@ -340,7 +655,7 @@ class ReservationQueries:
             
         except Exception as e:
             print(f"❌ Error finding available rooms: {e}")
-            return []
+            return None
         finally:
             close_cursor(cursor)
             close_connection(connection)
@@ -412,6 +727,56 @@ class ReservationQueries:
             close_cursor(cursor)
             close_connection(connection)
 
+    @staticmethod
+    def get_schedule_grid(start_date, end_date, rooms=None, instructor_ids=None):
+        """
+        All reservations of several rooms or instructors over a date range, in one query.
+        rooms: list of (building, roomno); instructor_ids: list of ids; None means all.
+        Row format: reservation_id, reserv_date, start_time, end_time, building,
+        roomno, instructor_id, instructor_name, course_name, activity_type
+        """
+        connection = None
+        cursor = None
+
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            sql = """
+                SELECT r.reservation_id, r.reserv_date, r.start_time, r.end_time,
+                       r.building, r.roomno, r.instructor_id,
+                       i.last_name || ' ' || i.first_name AS instructor_name,
+                       c.name AS course_name, r.activity_type
+                FROM reservation r
+                JOIN course c ON r.course_id = c.course_id
+                JOIN instructor i ON r.instructor_id = i.instructor_id
+                WHERE r.reserv_date BETWEEN %s AND %s
+            """
+            params = [start_date, end_date]
+
+            if rooms:
+                sql += """
+                AND (r.building, r.roomno) IN (
+                    SELECT * FROM unnest(%s::varchar[], %s::varchar[])
+                )
+                """
+                params += [[b for b, _ in rooms], [n for _, n in rooms]]
+            if instructor_ids:
+                sql += " AND r.instructor_id = ANY(%s)"
+                params.append(list(instructor_ids))
+
+            sql += " ORDER BY r.reserv_date, r.start_time;"
+
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+        except Exception as e:
+            print(f"❌ Error fetching schedule grid: {e}")
+            return []
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
     @staticmethod
     def get_instructor_workload(instructor_id):
         """Calculate total hours for an instructor"""
@@ -442,6 +807,7 @@ class ReservationQueries:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Course")
     def get_all_courses():
         """Get all courses for dropdown"""
         connection = None
@@ -463,6 +829,7 @@ class ReservationQueries:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Instructor")
     def get_all_instructors():
         """Get all instructors for dropdown"""
         connection = None
@@ -488,6 +855,7 @@ class ReservationQueries:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Room")
     def get_all_rooms():
         """Get all rooms for dropdown"""
         connection = None
@@ -513,6 +881,33 @@ class ReservationQueries:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Semester")
+    def get_all_semesters():
+        """Get semesters with their date ranges for recurring reservations"""
+        connection = None
+        cursor = None
+
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            sql = """
+                SELECT semester_id, name, start_date, end_date
+                FROM semester
+                ORDER BY start_date DESC;
+            """
+            cursor.execute(sql)
+            return cursor.fetchall()
+
+        except Exception as e:
+            print(f"❌ Error fetching semesters: {e}")
+            return []
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    @staticmethod
+    @cached_lookup("Activity")
     def get_activities_for_course(course_id, department_id):
         """Get available activity types for a course"""
         connection = None
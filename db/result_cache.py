@@ -0,0 +1,263 @@
+# db/result_cache.py
+# Purpose: Memoize report function results (ResultsQueries.execute_function
+# and stream_function) so flipping between report pages with the same
+# parameters does not re-run the SQL.
+# Entries are keyed by (function name, params), kept in LRU order and
+# bounded both by count and by an estimate of their size in memory. Each
+# function has a TTL and the set of tables it reads; entries are dropped as
+# soon as one of those tables is written, locally (@invalidates on the CRUD
+# methods) or by another workstation (table_change notifications).
+
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from db.change_listener import change_listener
+from db.lookup_cache import lookup_cache
+
+MAX_ENTRIES = 256
+MAX_BYTES = 64 * 1024 * 1024
+# Larger results are not cached at all (and streaming stops collecting them)
+MAX_ENTRY_BYTES = 16 * 1024 * 1024
+
+DEFAULT_TTL = 120  # seconds
+
+# Rows per batch when a cached result is replayed to a stream consumer
+REPLAY_BATCH = 2000
+
+_GRADE_REPORT_TABLES = {"grade", "enrollment", "student", "course", "semester", "group"}
+
+# Tables each report function reads. Functions not listed here are dropped
+# on any table write.
+FUNCTION_TABLES = {
+    "get_student_by_group": {"student", "group"},
+    "get_students_by_section": {"student", "group", "section"},
+    "get_instructor_timetable": {"reservation", "instructor", "course", "activity", "room"},
+    "get_student_timetable_by_section_group": {
+        "reservation", "student", "group", "section", "course", "activity", "room",
+    },
+    "get_student_passed_semester": _GRADE_REPORT_TABLES,
+    "get_disqualifying_marks_by_module": _GRADE_REPORT_TABLES,
+    "get_average_marks_by_course_group": _GRADE_REPORT_TABLES,
+    "get_students_failing_module": _GRADE_REPORT_TABLES,
+    "get_students_resit_eligible": _GRADE_REPORT_TABLES,
+    "get_students_excluded_from_module": {"enrollment", "student"},
+    "get_semester_overview": _GRADE_REPORT_TABLES,
+    "get_course_comparison": _GRADE_REPORT_TABLES,
+    "get_grade_distribution": _GRADE_REPORT_TABLES,
+    # Snapshots only change when their materialized view is refreshed
+    "get_semester_overview_snapshot": {"mv_semester_overview"},
+    "get_course_comparison_snapshot": {"mv_course_comparison"},
+}
+
+# Per-function TTL in seconds; DEFAULT_TTL otherwise
+FUNCTION_TTLS = {
+    "get_student_by_group": 600,
+    "get_students_by_section": 600,
+    "get_instructor_timetable": 600,
+    "get_student_timetable_by_section_group": 600,
+    "get_semester_overview_snapshot": 600,
+    "get_course_comparison_snapshot": 600,
+}
+
+
+def _row_size(row):
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+
+def estimate_size(results, columns):
+    """Approximate memory held by a result: the containers plus every value."""
+    return (
+        sys.getsizeof(results)
+        + sum(_row_size(row) for row in results)
+        + sum(sys.getsizeof(column) for column in columns)
+    )
+
+
+class ResultCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, size, results, columns)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Invalidation counter, and the count at which each table / everything
+        # was last invalidated; used to drop results computed across a write
+        self._generation = 0
+        self._table_generations = {}
+        self._cleared_generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(function_name, params):
+        return function_name, tuple(params)
+
+    def get(self, key):
+        """(results, columns) copies for a live entry, else None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Callers (table models) may extend the lists they get
+            return list(entry[2]), list(entry[3])
+
+    def generation(self):
+        """Snapshot to pass to put() for a result about to be computed."""
+        with self._lock:
+            return self._generation
+
+    def _invalidated_since(self, function_name, generation):
+        if self._cleared_generation > generation:
+            return True
+        tables = FUNCTION_TABLES.get(function_name)
+        if tables is None:
+            return self._generation > generation
+        return any(self._table_generations.get(t, 0) > generation for t in tables)
+
+    def put(self, key, results, columns, size=None, generation=None):
+        """
+        Stores a result. With a generation() snapshot taken before computing
+        it, the result is dropped if one of its tables was invalidated since.
+        """
+        if size is None:
+            size = estimate_size(results, columns)
+        if size > MAX_ENTRY_BYTES:
+            return
+        ttl = FUNCTION_TTLS.get(key[0], DEFAULT_TTL)
+        with self._lock:
+            if generation is not None and self._invalidated_since(key[0], generation):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, size, list(results), list(columns))
+            self._bytes += size
+            # Evict least recently used entries until within both bounds
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tables(self, tables):
+        """Drops entries of functions reading any of the given (lowercase) tables."""
+        tables = set(tables)
+        with self._lock:
+            self._generation += 1
+            for table in tables:
+                self._table_generations[table] = self._generation
+            stale = [
+                key for key in self._entries
+                if FUNCTION_TABLES.get(key[0], tables) & tables
+            ]
+            for key in stale:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._cleared_generation = self._generation
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[1]
+
+
+result_cache = ResultCache()
+
+
+def _on_table_change(table, operation):
+    if table == "*":
+        result_cache.clear()  # after a listener reconnect anything may have changed
+
+
+# Local writes (@invalidates) and remote writes (change_listener) both end in
+# lookup_cache.invalidate()
+lookup_cache.add_invalidation_listener(result_cache.invalidate_tables)
+change_listener.add_listener(_on_table_change)
+
+
+def cached_result(fn):
+    """
+    Memoizes fn(function_name, params) -> (results, columns).
+    Errors propagate and are not cached, nor are results whose tables were
+    written while fn ran.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(function_name, params=()):
+        key = ResultCache.make_key(function_name, params)
+        cached = result_cache.get(key)
+        if cached is not None:
+            return cached
+        generation = result_cache.generation()
+        results, columns = fn(function_name, params)
+        if columns:
+            result_cache.put(key, results, columns, generation=generation)
+        return results, columns
+
+    wrapper.uncached = fn
+    return wrapper
+
+
+def cached_stream(fn):
+    """
+    Memoizing wrapper for a generator fn(function_name, params, itersize)
+    yielding (rows, columns) batches. A cached result is replayed in batches
+    of itersize; a streamed one is kept if it was read to the end and stayed
+    under MAX_ENTRY_BYTES.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(function_name, params=(), **kwargs):
+        key = ResultCache.make_key(function_name, params)
+        cached = result_cache.get(key)
+        if cached is not None:
+            results, columns = cached
+            if not results:
+                yield [], columns
+            step = kwargs.get("itersize") or REPLAY_BATCH
+            for start in range(0, len(results), step):
+                yield results[start:start + step], columns
+            return
+
+        generation = result_cache.generation()
+        generator = fn(function_name, params, **kwargs)
+        collected = []
+        columns = None
+        size = 0
+        try:
+            for rows, columns in generator:
+                if collected is not None:
+                    size += sum(_row_size(row) for row in rows)
+                    if size > MAX_ENTRY_BYTES:
+                        collected = None  # too large to cache; keep streaming
+                    else:
+                        collected.extend(rows)
+                yield rows, columns
+        finally:
+            generator.close()
+        # Only reached when the stream was read to the end
+        if collected is not None and columns:
+            result_cache.put(key, collected, columns, generation=generation)
+
+    wrapper.uncached = fn
+    return wrapper
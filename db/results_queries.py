@@ -1,9 +1,24 @@
+import itertools
+
 from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.dashboard_refresh import dashboard_refresher
+from db.lookup_cache import cached_lookup, invalidates
+from db.result_cache import cached_result, cached_stream
+
+# Rows per round trip of a server-side cursor, and per yielded batch
+STREAM_ITERSIZE = 2000
+
+_cursor_names = itertools.count(1)
 
 
 class ResultsQueries:
     @staticmethod
+    @cached_result
     def execute_function(function_name, params=()):
+        """
+        Runs a report function and returns (results, columns). Errors are
+        raised, so the query runner reports them instead of an empty result.
+        """
         connection = None
         cursor = None
         try:
@@ -18,12 +33,60 @@ class ResultsQueries:
             return results, columns
         except Exception as e:
             print(f"❌ Error executing {function_name}: {e}")
-            return [], []
+            raise
         finally:
             close_cursor(cursor)
             close_connection(connection)
+
+    @staticmethod
+    @cached_stream
+    def stream_function(function_name, params=(), itersize=STREAM_ITERSIZE):
+        """
+        Generator form of execute_function for large results. Rows are read
+        through a named (server-side) cursor, itersize at a time, and yielded
+        as (rows, columns) batches, so client memory only ever holds one batch.
+
+        The connection stays checked out until the generator is exhausted or
+        closed. Like execute_function, errors are raised to the consumer:
+        a silently truncated stream would look like a complete result.
+        """
+        connection = None
+        cursor = None
+        try:
+            connection = get_connection()
+            # Named cursors live inside the connection's transaction (DECLARE ... CURSOR)
+            cursor = connection.cursor(name=f"stream_{function_name}_{next(_cursor_names)}")
+            cursor.itersize = itersize
+            placeholders = ", ".join("%s" for _ in params)
+            cursor.execute(f"SELECT * FROM {function_name}({placeholders});", params)
+
+            total = 0
+            columns = None
+            while True:
+                rows = cursor.fetchmany(itersize)
+                if columns is None:
+                    # description is only known after the first FETCH
+                    columns = [desc[0] for desc in cursor.description]  # type:ignore
+                if not rows:
+                    break
+                total += len(rows)
+                yield rows, columns
+            if total == 0:
+                yield [], columns
+            print(f" streamed {function_name} , {total} rows ")
+        except Exception as e:
+            print(f"❌ Error streaming {function_name}: {e}")
+            raise
+        finally:
+            try:
+                close_cursor(cursor)
+            except Exception:
+                pass  # CLOSE can fail in an aborted transaction; release() rolls back anyway
+            close_connection(connection)
+
 # this helper function used in submenu for combo
     @staticmethod
+    @cached_lookup("Semester")
     def get_semesters():
 
         connection = None
@@ -42,6 +105,7 @@ class ResultsQueries:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Course")
     def get_courses():
 
         connection = None
@@ -64,6 +128,7 @@ class ResultsQueries:
             close_connection(connection)
 
     @staticmethod
+    @cached_lookup("Department")
     def get_departments():
 
         connection = None
@@ -82,6 +147,7 @@ class ResultsQueries:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Enrollment")
     def update_enrollment_status(course_id, department_id, semester_id):
 
         connection = None
@@ -93,24 +159,14 @@ class ResultsQueries:
 
             sql = """
                 WITH student_grades AS (
+                    -- Totals are kept up to date by the Grade triggers
                     SELECT
-                        g.student_id,
-                        SUM(
-                            CASE g.grade_type
-                                WHEN 'Quiz' THEN (g.grade_value / g.max_points) * 20 * 0.10
-                                WHEN 'Assignment' THEN (g.grade_value / g.max_points) * 20 * 0.10
-                                WHEN 'Midterm' THEN (g.grade_value / g.max_points) * 20 * 0.30
-                                WHEN 'Project' THEN (g.grade_value / g.max_points) * 20 * 0.10
-                                WHEN 'Final' THEN (g.grade_value / g.max_points) * 20 * 0.40
-                                WHEN 'Resit' THEN (g.grade_value / g.max_points) * 20 * 0.40
-                                ELSE 0
-                            END
-                        ) as total_grade
-                    FROM Grade g
-                    WHERE g.course_id = %s
-                        AND g.department_id = %s
-                        AND g.semester_id = %s
-                    GROUP BY g.student_id
+                        scs.student_id,
+                        scs.weighted_total + scs.resit_total as total_grade
+                    FROM student_course_score scs
+                    WHERE scs.course_id = %s
+                        AND scs.department_id = %s
+                        AND scs.semester_id = %s
                 )
                 UPDATE Enrollment e
                 SET status = CASE
@@ -140,6 +196,8 @@ class ResultsQueries:
 
             results = cursor.fetchall()
             connection.commit()
+            # Statuses feed the semester dashboards: don't wait for the next scheduled refresh
+            dashboard_refresher.request_refresh()
 
             print(f" Updated enrollment status for {len(results)} students")
             return results
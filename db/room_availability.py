@@ -0,0 +1,189 @@
+# db/room_availability.py
+# Purpose: Room availability from precomputed occupancy bitmaps.
+# Each room's bookings over a date window are one int: bit
+# (day_offset * SLOTS_PER_DAY + slot) is set when the room is in use during
+# that SLOT_MINUTES slot. A question such as "free every Tuesday 10:00-12:00
+# this semester" becomes one mask and a single AND per room.
+# The map is built in one pass over the window's reservations. It is then
+# kept current per day from the 'reservation_days' notifications
+# (notify_reservation_days() in sql_scripts/dbtables.sql): only the
+# reported dates are re-read, on the next query. Writes made from this
+# workstation (@invalidates) mark the whole map stale right away.
+
+import threading
+from datetime import timedelta
+
+from db.change_listener import change_listener
+from db.lookup_cache import lookup_cache
+from db.reservation_index import to_date, to_minutes
+from db.reservation_queries import ReservationQueries
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+WINDOW_DAYS_BEFORE = 7
+WINDOW_DAYS_AFTER = 150  # about a semester ahead
+
+
+def slot_mask(start_time, end_time):
+    """Bits of the slots touched by [start_time, end_time) within one day."""
+    first = int(to_minutes(start_time) // SLOT_MINUTES)
+    last = int(-(-to_minutes(end_time) // SLOT_MINUTES))  # ceil
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+class RoomAvailability:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._first_date = None
+        self._days = 0
+        self._rooms = []  # [(building, roomno, capacity)]
+        self._busy = {}  # (building, roomno) -> int bitmap over the window
+        self._stale = True
+        self._dirty_days = set()
+        # Local writes: the days are unknown here, and the NOTIFY comes later
+        lookup_cache.add_invalidation_listener(self._on_tables_changed)
+        change_listener.add_listener(self._on_notification)
+        change_listener.add_channel_listener("reservation_days", self._on_days_changed)
+
+    # ---------- freshness ----------
+
+    def invalidate(self):
+        with self._lock:
+            self._stale = True
+
+    def _on_tables_changed(self, tables):
+        if "reservation" in tables or "room" in tables:
+            self.invalidate()
+
+    def _on_notification(self, table, operation):
+        # Room list / capacity changes, TRUNCATE, or a reconnect: rebuild
+        if table in ("room", "*") or (table == "reservation" and operation == "TRUNCATE"):
+            self.invalidate()
+
+    def _on_days_changed(self, payload):
+        if payload == "*":
+            self.invalidate()
+            return
+        days = {to_date(text) for text in payload.split(",") if text}
+        with self._lock:
+            self._dirty_days |= days
+
+    # ---------- loading ----------
+
+    def covers(self, first_date, last_date):
+        with self._lock:
+            if self._stale or self._first_date is None:
+                return False
+            window_last = self._first_date + timedelta(days=self._days - 1)
+            return self._first_date <= first_date and last_date <= window_last
+
+    def ensure_window(self, first_date, last_date):
+        """Makes sure [first_date, last_date] is loaded and current. False on DB error."""
+        first_date, last_date = to_date(first_date), to_date(last_date)
+        if not self.covers(first_date, last_date):
+            return self.load(
+                first_date - timedelta(days=WINDOW_DAYS_BEFORE),
+                max(last_date, first_date + timedelta(days=WINDOW_DAYS_AFTER)),
+            )
+        return self.apply_dirty_days()
+
+    def load(self, first_date, last_date):
+        """One pass over the window's reservations."""
+        with self._lock:
+            self._stale = False
+            self._dirty_days.clear()
+        rooms = ReservationQueries.get_all_rooms()
+        rows = ReservationQueries.get_reservations_in_range(first_date, last_date)
+        if rows is None or not rooms:
+            self.invalidate()
+            return False
+
+        busy = {(building, roomno): 0 for building, roomno, _ in rooms}
+        for _, day, start, end, building, roomno, _, _ in rows:
+            shift = (day - first_date).days * SLOTS_PER_DAY
+            busy[(building, roomno)] = busy.get((building, roomno), 0) | (slot_mask(start, end) << shift)
+
+        with self._lock:
+            self._first_date = first_date
+            self._days = (last_date - first_date).days + 1
+            self._rooms = [tuple(room) for room in rooms]
+            self._busy = busy
+        return True
+
+    def apply_dirty_days(self):
+        """Re-reads only the days reported as changed since the last query."""
+        with self._lock:
+            if not self._dirty_days or self._first_date is None:
+                return True
+            first_date, days = self._first_date, self._days
+            dirty = {d for d in self._dirty_days if 0 <= (d - first_date).days < days}
+            self._dirty_days.clear()
+        if not dirty:
+            return True
+
+        rows = ReservationQueries.get_room_bookings_on_dates(sorted(dirty))
+        if rows is None:
+            self.invalidate()
+            return False
+
+        clear = 0
+        for day in dirty:
+            clear |= DAY_MASK << ((day - first_date).days * SLOTS_PER_DAY)
+        fresh = {}
+        for building, roomno, day, start, end in rows:
+            shift = (day - first_date).days * SLOTS_PER_DAY
+            fresh[(building, roomno)] = fresh.get((building, roomno), 0) | (slot_mask(start, end) << shift)
+
+        with self._lock:
+            if self._first_date != first_date:
+                return True  # reloaded meanwhile
+            for key in set(self._busy) | set(fresh):
+                self._busy[key] = (self._busy.get(key, 0) & ~clear) | fresh.get(key, 0)
+        return True
+
+    # ---------- queries ----------
+
+    def query_mask(self, dates, start_time, end_time):
+        """One mask covering the slot range on every given date."""
+        day_bits = slot_mask(start_time, end_time)
+        mask = 0
+        for day in dates:
+            mask |= day_bits << ((to_date(day) - self._first_date).days * SLOTS_PER_DAY)
+        return mask
+
+    def free_rooms(self, dates, start_time, end_time, min_capacity=None):
+        """
+        Rooms free from start_time to end_time on every one of the dates, as
+        (building, roomno, capacity) rows. Returns None if the data could not
+        be loaded.
+        """
+        dates = sorted({to_date(day) for day in dates})
+        if not dates:
+            return []
+        if not self.ensure_window(dates[0], dates[-1]):
+            return None
+
+        with self._lock:
+            mask = self.query_mask(dates, start_time, end_time)
+            return [
+                (building, roomno, capacity)
+                for building, roomno, capacity in self._rooms
+                if (min_capacity is None or (capacity or 0) >= min_capacity)
+                and not self._busy.get((building, roomno), 0) & mask
+            ]
+
+    def free_rooms_weekly(self, first_date, last_date, start_time, end_time, min_capacity=None):
+        """Rooms free at this time on the weekday of first_date, every week until last_date."""
+        first_date, last_date = to_date(first_date), to_date(last_date)
+        dates = []
+        day = first_date
+        while day <= last_date:
+            dates.append(day)
+            day += timedelta(weeks=1)
+        return self.free_rooms(dates, start_time, end_time, min_capacity)
+
+
+room_availability = RoomAvailability()
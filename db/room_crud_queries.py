@@ -1,8 +1,10 @@
 from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.lookup_cache import invalidates
 
 
 class RoomCRUD:
     @staticmethod
+    @invalidates("Room")
     def create_room(building, roomno, capacity):
         """INSERT a new room into the database"""
         connection = None
@@ -70,6 +72,7 @@ class RoomCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Room")
     def update_room(building, roomno, capacity):
         connection = None
         cursor = None
@@ -98,6 +101,7 @@ class RoomCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Room")
     def delete_room(building, roomno):
         connection = None
         cursor = None
@@ -1,7 +1,9 @@
 from db.connection import get_connection , get_cursor , close_connection , close_cursor
+from db.lookup_cache import invalidates
 
 class SectionCRUD:
     @staticmethod
+    @invalidates("Section")
     def create_section(name):
         connection = None
         cursor = None
@@ -67,6 +69,7 @@ class SectionCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Section")
     def update_section(section_id, name):
         connection = None
         cursor = None
@@ -99,6 +102,7 @@ class SectionCRUD:
 
 
     @staticmethod
+    @invalidates("Section")
     def delete_section(section_id):
         """DELETE a section"""
         connection = None
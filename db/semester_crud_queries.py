@@ -1,9 +1,11 @@
 # New file: db/semester_crud_queries.py
 from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.lookup_cache import invalidates
 
 
 class SemesterCRUD:
     @staticmethod
+    @invalidates("Semester")
     def create_semester(name, start_date, end_date):
         connection = None
         cursor = None
@@ -80,6 +82,7 @@ class SemesterCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Semester")
     def update_semester(semester_id, name, start_date, end_date):
         connection = None
         cursor = None
@@ -112,6 +115,7 @@ class SemesterCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Semester")
     def delete_semester(semester_id):
         connection = None
         cursor = None
@@ -1,8 +1,11 @@
 from db.connection import close_connection, close_cursor, get_connection, get_cursor
+from db.lookup_cache import cached_lookup, invalidates
+from db.pagination import DEFAULT_PAGE_SIZE, Keyset
 
 
 class StudentCRUD:
     @staticmethod
+    @cached_lookup("Group", "Section")
     def get_all_groups():
         """Helper to fetch groups for the dropdown (including Section name)"""
         connection = None
@@ -27,6 +30,7 @@ class StudentCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Student")
     def create_student(
         first_name, last_name, dob, group_id, email, phone, address, city, zip_code
     ):
@@ -71,6 +75,33 @@ class StudentCRUD:
             close_cursor(cursor)
             close_connection(connection)
 
+    @staticmethod
+    def _students_query(search_field=None, search_value=None, extra_columns=""):
+        """SELECT shared by get_all_students and get_students_page, ending in a WHERE"""
+        # Join with Group and Section to show readable names in the table
+        sql = f"""
+            SELECT s.Student_ID, s.First_Name, s.Last_Name, s.DOB,
+                   g.Group_Name, sec.Name as Section_Name,
+                   s.Email, s.Phone, s.Group_ID{extra_columns}
+            FROM Student s
+            LEFT JOIN "Group" g ON s.Group_ID = g.Group_ID
+            LEFT JOIN Section sec ON g.Section_ID = sec.Section_ID
+            WHERE TRUE
+        """
+        params = []
+
+        if search_field and search_value:
+            if search_field == "Student ID":
+                sql += " AND CAST(s.Student_ID AS TEXT) LIKE %s"
+                params.append(f"%{search_value}%")
+            elif search_field == "Last Name":
+                sql += " AND LOWER(s.Last_Name) LIKE LOWER(%s)"
+                params.append(f"%{search_value}%")
+            elif search_field == "Group":
+                sql += " AND LOWER(g.Group_Name) LIKE LOWER(%s)"
+                params.append(f"%{search_value}%")
+        return sql, params
+
     @staticmethod
     def get_all_students(search_field=None, search_value=None):
         connection = None
@@ -79,28 +110,7 @@ class StudentCRUD:
             connection = get_connection()
             cursor = get_cursor(connection)
 
-            # Join with Group and Section to show readable names in the table
-            sql = """
-                SELECT s.Student_ID, s.First_Name, s.Last_Name, s.DOB,
-                       g.Group_Name, sec.Name as Section_Name,
-                       s.Email, s.Phone, s.Group_ID
-                FROM Student s
-                LEFT JOIN "Group" g ON s.Group_ID = g.Group_ID
-                LEFT JOIN Section sec ON g.Section_ID = sec.Section_ID
-            """
-            params = []
-
-            if search_field and search_value:
-                if search_field == "Student ID":
-                    sql += " WHERE CAST(s.Student_ID AS TEXT) LIKE %s"
-                    params.append(f"%{search_value}%")
-                elif search_field == "Last Name":
-                    sql += " WHERE LOWER(s.Last_Name) LIKE LOWER(%s)"
-                    params.append(f"%{search_value}%")
-                elif search_field == "Group":
-                    sql += " WHERE LOWER(g.Group_Name) LIKE LOWER(%s)"
-                    params.append(f"%{search_value}%")
-
+            sql, params = StudentCRUD._students_query(search_field, search_value)
             sql += " ORDER BY s.Student_ID ASC"
             cursor.execute(sql, params)
             return cursor.fetchall()
@@ -111,6 +121,35 @@ class StudentCRUD:
             close_cursor(cursor)
             close_connection(connection)
 
+    @staticmethod
+    def get_students_page(search_field=None, search_value=None,
+                          page_size=DEFAULT_PAGE_SIZE, after=None):
+        """
+        One page of get_all_students, by Student_ID.
+        Returns (rows, next_after), or None on error; pass next_after back
+        for the next page.
+        """
+        connection = None
+        cursor = None
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            keyset = Keyset("s.Student_ID", "s.Student_ID", "ASC", after, page_size)
+            sql, params = StudentCRUD._students_query(
+                search_field, search_value, ", " + keyset.columns()
+            )
+            condition, keyset_params = keyset.condition()
+            sql += f" AND {condition}" + keyset.order_by() + keyset.limit()
+            cursor.execute(sql, params + keyset_params)
+            return keyset.page(cursor.fetchall())
+        except Exception as e:
+            print(f"Error fetching students: {e}")
+            return None
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
     @staticmethod
     def get_student_details(student_id):
         """Fetches full details for a single student to populate update forms"""
@@ -133,6 +172,7 @@ class StudentCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Student")
     def update_student(
         student_id,
         first_name,
@@ -185,6 +225,7 @@ class StudentCRUD:
             close_connection(connection)
 
     @staticmethod
+    @invalidates("Student")
     def delete_student(student_id):
         """Deletes a student record by ID"""
         connection = None
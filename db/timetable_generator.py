@@ -0,0 +1,391 @@
+# db/timetable_generator.py
+# Purpose: Build a conflict-free weekly timetable for a semester and write it
+# as reservations.
+#
+# The week is a grid of WEEK_DAYS x SLOT_TIMES slots. Occupancy of every room,
+# instructor and student group is one int used as a bitset over those slots,
+# so "where can this session go?" is a handful of AND/OR operations.
+#   1. Greedy: sessions are placed hardest first (fewest fitting rooms, most
+#      groups, most students) at the cheapest free (slot, room).
+#   2. Repair: sessions that did not fit evict at most MAX_EJECTIONS placed
+#      sessions, which are then re-placed elsewhere (or the move is undone).
+#   3. Improve: hill climbing moves single sessions to cheaper positions
+#      until no move helps or the time limit is reached.
+# Hard constraints: room capacity, no room / instructor / group double
+# booking, existing reservations of the semester. Soft costs: late slots,
+# several sessions of a course on one day, empty seats.
+
+import random
+import time as clock
+from collections import defaultdict
+from datetime import time, timedelta
+
+from db.reservation_queries import ReservationQueries, series_dates
+from db.timetable_queries import TimetableQueries
+
+# Python weekday() numbers of the teaching days (Sunday to Thursday)
+WEEK_DAYS = (6, 0, 1, 2, 3)
+DAY_NAMES = {0: "Monday", 1: "Tuesday", 2: "Wednesday", 3: "Thursday",
+             4: "Friday", 5: "Saturday", 6: "Sunday"}
+SLOT_TIMES = (time(8, 0), time(9, 40), time(11, 20), time(13, 0), time(14, 40), time(16, 20))
+SLOT_MINUTES = 90
+
+# Weekly sessions per activity type (the schema has no per-activity hours)
+SESSIONS_PER_WEEK = {"Lecture": 1, "Tutorial": 1, "Practical": 1}
+
+LATE_SLOT_COST = 2.0
+SAME_DAY_COST = 3.0
+EMPTY_SEATS_COST = 1.0
+MAX_EJECTIONS = 2
+SEARCH_SECONDS = 5.0
+
+
+def slot_end(start):
+    minutes = start.hour * 60 + start.minute + SLOT_MINUTES
+    return time(minutes // 60, minutes % 60)
+
+
+def iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class Session:
+    """One weekly meeting of an activity for a set of student groups."""
+
+    def __init__(self, index, course_id, department_id, activity_type,
+                 course_name, instructor_id, groups, size):
+        self.index = index
+        self.course_id = course_id
+        self.department_id = department_id
+        self.activity_type = activity_type
+        self.course_name = course_name
+        self.instructor_id = instructor_id
+        self.groups = tuple(dict.fromkeys(groups))
+        self.size = size
+        self.rooms = []  # indexes of rooms large enough, smallest first
+
+    @property
+    def course_key(self):
+        return (self.course_id, self.department_id)
+
+
+class TimetableModel:
+    def __init__(self, rooms, sessions, days=WEEK_DAYS, slot_times=SLOT_TIMES):
+        self.rooms = rooms  # [(building, roomno, capacity)]
+        self.sessions = sessions
+        self.days = days
+        self.slot_times = slot_times
+        self.per_day = len(slot_times)
+        self.n_slots = len(days) * self.per_day
+        self.full = (1 << self.n_slots) - 1
+
+        self.room_busy = [0] * len(rooms)
+        self.instructor_busy = defaultdict(int)
+        self.group_busy = defaultdict(int)
+        # (kind, key, slot) -> session index; fixed bookings have no owner entry
+        self.owner = {}
+        self.course_days = defaultdict(int)  # (course_key, day) -> sessions
+        self.assignment = {}  # session index -> (slot, room index)
+
+        by_capacity = sorted(range(len(rooms)), key=lambda r: rooms[r][2] or 0)
+        for session in sessions:
+            session.rooms = [r for r in by_capacity if (rooms[r][2] or 0) >= session.size]
+
+    # ---------- occupancy ----------
+
+    def block(self, room=None, instructor_id=None, slots=()):
+        """Marks slots as taken by bookings outside the model (existing reservations)."""
+        mask = sum(1 << slot for slot in slots)
+        if room is not None:
+            self.room_busy[room] |= mask
+        if instructor_id is not None:
+            self.instructor_busy[instructor_id] |= mask
+
+    def blocked(self, session):
+        mask = self.instructor_busy[session.instructor_id]
+        for group in session.groups:
+            mask |= self.group_busy[group]
+        return mask
+
+    def place(self, session, slot, room):
+        bit = 1 << slot
+        self.room_busy[room] |= bit
+        self.instructor_busy[session.instructor_id] |= bit
+        self.owner[("room", room, slot)] = session.index
+        self.owner[("instructor", session.instructor_id, slot)] = session.index
+        for group in session.groups:
+            self.group_busy[group] |= bit
+            self.owner[("group", group, slot)] = session.index
+        self.course_days[(session.course_key, slot // self.per_day)] += 1
+        self.assignment[session.index] = (slot, room)
+
+    def remove(self, session):
+        slot, room = self.assignment.pop(session.index)
+        clear = ~(1 << slot)
+        self.room_busy[room] &= clear
+        self.instructor_busy[session.instructor_id] &= clear
+        del self.owner[("room", room, slot)]
+        del self.owner[("instructor", session.instructor_id, slot)]
+        for group in session.groups:
+            self.group_busy[group] &= clear
+            del self.owner[("group", group, slot)]
+        self.course_days[(session.course_key, slot // self.per_day)] -= 1
+        return slot, room
+
+    # ---------- costs ----------
+
+    def cost(self, session, slot, room):
+        cost = 0.0
+        if slot % self.per_day == self.per_day - 1:
+            cost += LATE_SLOT_COST
+        cost += SAME_DAY_COST * self.course_days[(session.course_key, slot // self.per_day)]
+        capacity = self.rooms[room][2] or 1
+        cost += EMPTY_SEATS_COST * (capacity - session.size) / capacity
+        return cost
+
+    def total_cost(self):
+        total = 0.0
+        for index, (slot, room) in list(self.assignment.items()):
+            session = self.sessions[index]
+            # Evaluate without the session itself counted on its day
+            self.course_days[(session.course_key, slot // self.per_day)] -= 1
+            total += self.cost(session, slot, room)
+            self.course_days[(session.course_key, slot // self.per_day)] += 1
+        return total
+
+    def best_position(self, session, exclude=None):
+        """Cheapest free (cost, slot, room) for a session that is not placed, or None."""
+        free = self.full & ~self.blocked(session)
+        best = None
+        for room in session.rooms:
+            available = free & ~self.room_busy[room]
+            for slot in iter_bits(available):
+                if (slot, room) == exclude:
+                    continue
+                cost = self.cost(session, slot, room)
+                if best is None or cost < best[0]:
+                    best = (cost, slot, room)
+            if best is not None and best[0] == 0:
+                break
+        return best
+
+    # ---------- solver phases ----------
+
+    def greedy(self):
+        order = sorted(
+            self.sessions,
+            key=lambda s: (len(s.rooms), -len(s.groups), -s.size),
+        )
+        unplaced = []
+        for session in order:
+            best = self.best_position(session)
+            if best is None:
+                unplaced.append(session)
+            else:
+                self.place(session, best[1], best[2])
+        return unplaced
+
+    def conflicting(self, session, slot, room):
+        """Placed sessions that block (slot, room), or None if a fixed booking does."""
+        bit = 1 << slot
+        owners = set()
+        checks = [("room", room, self.room_busy[room]),
+                  ("instructor", session.instructor_id, self.instructor_busy[session.instructor_id])]
+        checks += [("group", group, self.group_busy[group]) for group in session.groups]
+        for kind, key, busy in checks:
+            if busy & bit:
+                owner = self.owner.get((kind, key, slot))
+                if owner is None:
+                    return None
+                owners.add(owner)
+        return owners
+
+    def repair(self, unplaced, deadline):
+        still_unplaced = []
+        for session in unplaced:
+            if clock.monotonic() > deadline or not self.eject_and_place(session):
+                still_unplaced.append(session)
+        return still_unplaced
+
+    def eject_and_place(self, session):
+        candidates = []
+        for room in session.rooms:
+            for slot in range(self.n_slots):
+                owners = self.conflicting(session, slot, room)
+                if owners is not None and len(owners) <= MAX_EJECTIONS:
+                    candidates.append((len(owners), self.cost(session, slot, room), slot, room, owners))
+        candidates.sort(key=lambda c: (c[0], c[1]))
+
+        for _, _, slot, room, owners in candidates:
+            evicted = [self.sessions[i] for i in owners]
+            previous = {s.index: self.remove(s) for s in evicted}
+            self.place(session, slot, room)
+            moved = []
+            for other in evicted:
+                best = self.best_position(other)
+                if best is None:
+                    break
+                self.place(other, best[1], best[2])
+                moved.append(other)
+            else:
+                return True
+            # Undo
+            for other in moved:
+                self.remove(other)
+            self.remove(session)
+            for other in evicted:
+                self.place(other, *previous[other.index])
+        return False
+
+    def improve(self, deadline, seed=0):
+        rng = random.Random(seed)
+        placed = list(self.assignment)
+        improved = True
+        while improved and clock.monotonic() < deadline:
+            improved = False
+            rng.shuffle(placed)
+            for index in placed:
+                if clock.monotonic() > deadline:
+                    break
+                session = self.sessions[index]
+                slot, room = self.remove(session)
+                current = self.cost(session, slot, room)
+                best = self.best_position(session, exclude=(slot, room))
+                if best is not None and best[0] < current - 1e-9:
+                    self.place(session, best[1], best[2])
+                    improved = True
+                else:
+                    self.place(session, slot, room)
+
+    def solve(self, time_limit=SEARCH_SECONDS, seed=0):
+        deadline = clock.monotonic() + time_limit
+        unplaced = self.greedy()
+        if unplaced:
+            unplaced = self.repair(unplaced, deadline)
+        self.improve(deadline, seed)
+        return unplaced
+
+    def placements(self):
+        """[(session, weekday, start_time, end_time, building, roomno)] in day/time order"""
+        result = []
+        for index, (slot, room) in sorted(self.assignment.items(), key=lambda item: item[1]):
+            day, period = divmod(slot, self.per_day)
+            start = self.slot_times[period]
+            building, roomno, _ = self.rooms[room]
+            result.append((self.sessions[index], self.days[day], start, slot_end(start), building, roomno))
+        return result
+
+
+class TimetableGenerator:
+    """
+    Loads a semester's demand, solves it and writes the weekly timetable as
+    reservations for every week of the semester.
+
+        generator = TimetableGenerator(semester_id, start_date, end_date)
+        result = generator.generate()
+        generator.save()
+    """
+
+    def __init__(self, semester_id, start_date, end_date, time_limit=SEARCH_SECONDS):
+        self.semester_id = semester_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.time_limit = time_limit
+        self.model = None
+        self.unplaced = []
+
+    def build_sessions(self):
+        demand = TimetableQueries.get_session_demand(self.semester_id)
+        previous = {
+            (course_id, dept_id, activity_type): instructor_id
+            for course_id, dept_id, activity_type, instructor_id
+            in TimetableQueries.get_previous_instructors()
+        }
+        by_department = defaultdict(list)
+        for instructor_id, dept_id in TimetableQueries.get_instructors_by_department():
+            by_department[dept_id].append(instructor_id)
+        load = defaultdict(int)
+
+        # Lectures gather every group of the course; tutorials and practicals run per group
+        activities = defaultdict(list)
+        for course_id, dept_id, activity_type, course_name, group_id, students in demand:
+            activities[(course_id, dept_id, activity_type, course_name)].append((group_id, students))
+
+        sessions = []
+        for (course_id, dept_id, activity_type, course_name), groups in activities.items():
+            instructor_id = previous.get((course_id, dept_id, activity_type))
+            if instructor_id is None:
+                candidates = by_department.get(dept_id)
+                if not candidates:
+                    print(f"⚠️ No instructor for {course_name} {activity_type}, skipped")
+                    continue
+                instructor_id = min(candidates, key=lambda i: load[i])
+
+            if activity_type == "Lecture":
+                parts = [groups]
+            else:
+                parts = [[group] for group in groups]
+            for part in parts:
+                for _ in range(SESSIONS_PER_WEEK.get(activity_type, 1)):
+                    sessions.append(Session(
+                        len(sessions), course_id, dept_id, activity_type, course_name,
+                        instructor_id,
+                        [("group", g) if g is not None else ("course", course_id, dept_id) for g, _ in part],
+                        sum(n for _, n in part),
+                    ))
+                    load[instructor_id] += 1
+        return sessions
+
+    def block_existing(self, model, room_index):
+        """Existing reservations of the semester block their weekly slot for every week."""
+        rows = ReservationQueries.get_reservations_in_range(self.start_date, self.end_date)
+        if rows is None:
+            # Planning over unknown bookings would only fail later, on save
+            raise RuntimeError("Could not read the existing reservations of the semester")
+        for _, day, start, end, building, roomno, instructor_id, _ in rows:
+            if day.weekday() not in model.days:
+                continue
+            day_index = model.days.index(day.weekday())
+            slots = [
+                day_index * model.per_day + period
+                for period, slot_start in enumerate(model.slot_times)
+                if slot_start < end and slot_end(slot_start) > start
+            ]
+            model.block(room_index.get((building, roomno)), instructor_id, slots)
+
+    def generate(self):
+        """Solves the timetable; returns (placements, unplaced sessions)."""
+        rooms = [tuple(room) for room in ReservationQueries.get_all_rooms()]
+        room_index = {(building, roomno): i for i, (building, roomno, _) in enumerate(rooms)}
+        sessions = self.build_sessions()
+
+        self.model = TimetableModel(rooms, sessions)
+        self.block_existing(self.model, room_index)
+        started = clock.monotonic()
+        self.unplaced = self.model.solve(self.time_limit)
+        print(
+            f"✅ Timetable: {len(self.model.assignment)}/{len(sessions)} sessions placed "
+            f"in {clock.monotonic() - started:.2f}s (cost {self.model.total_cost():.1f})"
+        )
+        return self.model.placements(), self.unplaced
+
+    def reservation_rows(self):
+        """One reservation row per placement and week of the semester."""
+        rows = []
+        hours = SLOT_MINUTES / 60
+        for session, weekday, start, end, building, roomno in self.model.placements():
+            first = self.start_date + timedelta(days=(weekday - self.start_date.weekday()) % 7)
+            for day in series_dates(first, self.end_date):
+                rows.append((building, roomno, session.course_id, session.department_id,
+                             session.activity_type, session.instructor_id, day,
+                             start, end, hours))
+        return rows
+
+    def save(self):
+        """Writes the generated timetable in one transaction; returns the new reservation ids."""
+        if self.model is None:
+            raise ValueError("Generate a timetable before saving it")
+        return ReservationQueries.create_reservations_bulk(self.reservation_rows())
@@ -0,0 +1,103 @@
+from db.connection import get_connection, get_cursor, close_connection, close_cursor
+
+
+class TimetableQueries:
+    """Input data for the timetable generator (db/timetable_generator.py)"""
+
+    @staticmethod
+    def get_session_demand(semester_id):
+        """
+        One row per (activity, student group) of the courses taught in a semester:
+        course_id, department_id, activity_type, course_name, group_id, students.
+        group_id is NULL for enrolled students without a group.
+        """
+        connection = None
+        cursor = None
+
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            sql = """
+                WITH enrolled AS (
+                    SELECT e.course_id, e.department_id, s.group_id,
+                           COUNT(*) AS students
+                    FROM enrollment e
+                    JOIN student s ON s.student_id = e.student_id
+                    WHERE e.semester_id = %s
+                    AND e.status IN ('Enrolled', 'Resit Eligible')
+                    GROUP BY e.course_id, e.department_id, s.group_id
+                )
+                SELECT a.course_id, a.department_id, a.activity_type,
+                       c.name AS course_name, en.group_id, en.students
+                FROM activity a
+                JOIN course c
+                  ON c.course_id = a.course_id AND c.department_id = a.department_id
+                JOIN enrolled en
+                  ON en.course_id = a.course_id AND en.department_id = a.department_id
+                ORDER BY a.course_id, a.department_id, a.activity_type, en.group_id;
+            """
+            cursor.execute(sql, (semester_id,))
+            return cursor.fetchall()
+
+        except Exception as e:
+            print(f"❌ Error fetching timetable demand: {e}")
+            return []
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    @staticmethod
+    def get_previous_instructors():
+        """
+        Instructor who most recently taught each activity:
+        course_id, department_id, activity_type, instructor_id.
+        """
+        connection = None
+        cursor = None
+
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            sql = """
+                SELECT DISTINCT ON (course_id, department_id, activity_type)
+                       course_id, department_id, activity_type, instructor_id
+                FROM reservation
+                ORDER BY course_id, department_id, activity_type,
+                         reserv_date DESC, start_time DESC;
+            """
+            cursor.execute(sql)
+            return cursor.fetchall()
+
+        except Exception as e:
+            print(f"❌ Error fetching previous instructors: {e}")
+            return []
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    @staticmethod
+    def get_instructors_by_department():
+        """instructor_id, department_id for every instructor"""
+        connection = None
+        cursor = None
+
+        try:
+            connection = get_connection()
+            cursor = get_cursor(connection)
+
+            sql = """
+                SELECT instructor_id, department_id
+                FROM instructor
+                ORDER BY department_id, instructor_id;
+            """
+            cursor.execute(sql)
+            return cursor.fetchall()
+
+        except Exception as e:
+            print(f"❌ Error fetching instructors: {e}")
+            return []
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
@@ -0,0 +1,15 @@
+-- Adds the semester dashboard materialized views to an existing database
+-- (new databases get them straight from dbtables.sql). Needs
+-- student_course_score (student_course_score.sql) first; run functions.sql
+-- afterwards for the *_snapshot functions that read them. The views are
+-- defined in dashboard_views_schema.sql, so run this with psql.
+
+-- Views created before the refresh time moved to dashboard_refresh_state
+-- carried a refreshed_at column; rebuild them without it.
+drop materialized view if exists mv_course_comparison;
+drop materialized view if exists mv_semester_overview;
+
+\ir dashboard_views_schema.sql
+
+-- The views were rebuilt just now
+update dashboard_refresh_state set refreshed_at = now();
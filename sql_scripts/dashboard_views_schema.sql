@@ -0,0 +1,75 @@
+-- Definitions of the semester dashboard materialized views. dbtables.sql
+-- (new databases) and dashboard_views.sql (upgrades) both include this file
+-- with \ir; it is the only copy. Needs student_course_score first.
+
+-- Semester dashboards: precomputed statistics read by the Grade Statistics
+-- pages. Refreshed CONCURRENTLY (readers are never blocked) by the client's
+-- background refresher (db/dashboard_refresh.py). The unique indexes are
+-- required by REFRESH ... CONCURRENTLY.
+-- The refresh time is kept in dashboard_refresh_state, written in the same
+-- transaction as the refresh, and shown as "data as of" on the pages. It is
+-- not a column of the views: a per-refresh value in every row would make the
+-- concurrent refresh's row diff rewrite the whole view each time.
+
+create table if not exists dashboard_refresh_state (
+	id boolean primary key default true check (id),
+	refreshed_at timestamptz not null
+);
+
+create materialized view if not exists mv_semester_overview as
+select
+	e.semester_id,
+	count(distinct e.student_id)::bigint as total_students,
+	count(distinct case when e.status = 'Passed' then e.student_id end)::bigint as passed_count,
+	count(distinct case when e.status = 'Failed' then e.student_id end)::bigint as failed_count,
+	count(distinct case when e.status = 'Resit Eligible' then e.student_id end)::bigint as resit_count,
+	round(avg(
+		case
+			when g.grade_value is not null and g.max_points > 0
+			then (g.grade_value / g.max_points) * 20
+			else 0
+		end
+	), 2) as average_grade
+from enrollment e
+left join grade g on e.student_id = g.student_id
+	and e.course_id = g.course_id
+	and e.department_id = g.department_id
+	and e.semester_id = g.semester_id
+group by e.semester_id
+with data;
+
+create unique index if not exists ux_mv_semester_overview
+	on mv_semester_overview (semester_id);
+
+create materialized view if not exists mv_course_comparison as
+select
+	e.semester_id,
+	c.course_id,
+	c.department_id,
+	c.name::varchar as course_name,
+	count(distinct e.student_id)::bigint as student_count,
+	round(
+		sum(coalesce(scs.weighted_total, 0)) /
+		nullif(sum(greatest(coalesce(scs.grade_count, 0), 1)), 0),
+		2
+	) as average_grade,
+	round(
+		100.0 * count(case when e.status = 'Passed' then 1 end)::numeric /
+		nullif(count(distinct e.student_id), 0),
+		1
+	) as pass_rate
+from course c
+join enrollment e on c.course_id = e.course_id and c.department_id = e.department_id
+left join student_course_score scs on e.student_id = scs.student_id
+	and e.course_id = scs.course_id
+	and e.department_id = scs.department_id
+	and e.semester_id = scs.semester_id
+group by e.semester_id, c.course_id, c.department_id, c.name
+with data;
+
+create unique index if not exists ux_mv_course_comparison
+	on mv_course_comparison (semester_id, course_id, department_id);
+
+-- Views created above are computed with data; existing ones keep their time
+insert into dashboard_refresh_state (refreshed_at) values (now())
+on conflict (id) do nothing;
@@ -1,5 +1,6 @@
 -- Final University DB Schema including the extended design 
 -- Notes: EERD Mapping - Option 2 (Super table + subtype tables with FK).
+-- Run with psql: some definitions are included from other files with \ir.
 
 
 CREATE TABLE Department (
@@ -298,6 +299,9 @@ CREATE TABLE Grade (
 );
 
 
+-- btree_gist lets the Reservation EXCLUDE constraints mix equality on
+-- plain columns with range overlap in one GiST index
+CREATE EXTENSION IF NOT EXISTS btree_gist;
 
 CREATE TABLE Reservation (
     Reservation_ID SERIAL PRIMARY KEY,
@@ -310,6 +314,8 @@ CREATE TABLE Reservation (
     Reserv_Date DATE NOT NULL DEFAULT CURRENT_DATE,
     Start_Time TIME NOT NULL DEFAULT CURRENT_TIME,
     End_Time TIME NOT NULL DEFAULT '23:00:00',
+    Time_Span TSRANGE GENERATED ALWAYS AS
+        (tsrange(Reserv_Date + Start_Time, Reserv_Date + End_Time, '[)')) STORED,
 
     Hours_Number NUMERIC(4,2) NOT NULL,
     CONSTRAINT CK_Reservation_Hours CHECK (Hours_Number >= 0.5),
@@ -325,43 +331,58 @@ CREATE TABLE Reservation (
     CONSTRAINT FK_Reservation_Instructor FOREIGN KEY (Instructor_ID)
         REFERENCES Instructor (Instructor_ID)
         ON UPDATE CASCADE ON DELETE RESTRICT,
-    CONSTRAINT UN_Room_Schedule UNIQUE (Building, RoomNo, Reserv_Date, Start_Time)
+    CONSTRAINT UN_Room_Schedule UNIQUE (Building, RoomNo, Reserv_Date, Start_Time),
+    -- No two bookings of the same room / instructor may overlap in time.
+    -- The GiST indexes behind these also serve the conflict check queries.
+    CONSTRAINT EX_Reservation_Room_Overlap
+        EXCLUDE USING gist (Building WITH =, RoomNo WITH =, Time_Span WITH &&),
+    CONSTRAINT EX_Reservation_Instructor_Overlap
+        EXCLUDE USING gist (Instructor_ID WITH =, Time_Span WITH &&)
 );
 
 CREATE OR REPLACE FUNCTION check_student_enrollment()
 RETURNS TRIGGER AS $$
+DECLARE
+    missing RECORD;
 BEGIN
-    -- Check if student is enrolled in the course for the grade's semester
-    IF NOT EXISTS (
+    -- One anti-join over every row the statement inserted, instead of a
+    -- lookup per row: a whole grade sheet is checked in a single pass
+    SELECT n.Student_ID, n.Course_ID, n.Department_ID, n.Semester_ID
+    INTO missing
+    FROM new_grades n
+    WHERE NOT EXISTS (
         SELECT 1
         FROM Enrollment e
-        WHERE e.Student_ID = NEW.Student_ID
-          AND e.Course_ID = NEW.Course_ID
-          AND e.Department_ID = NEW.Department_ID
-          AND e.Semester_ID = NEW.Semester_ID
+        WHERE e.Student_ID = n.Student_ID
+          AND e.Course_ID = n.Course_ID
+          AND e.Department_ID = n.Department_ID
+          AND e.Semester_ID = n.Semester_ID
           AND e.Status IN ('Enrolled', 'Passed', 'Failed', 'Resit Eligible')
-    ) THEN
+    )
+    LIMIT 1;
+
+    IF FOUND THEN
         RAISE EXCEPTION
             'Cannot insert grade: Student % is not enrolled in Course % (Department %) for Semester %',
-            NEW.Student_ID, NEW.Course_ID, NEW.Department_ID, NEW.Semester_ID
+            missing.Student_ID, missing.Course_ID, missing.Department_ID, missing.Semester_ID
         USING HINT = 'Student must be enrolled in the course before receiving grades';
     END IF;
 
-    -- If enrollment exists, allow the insert
-    RETURN NEW;
+    RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE TRIGGER trigger_check_enrollment_before_grade
-BEFORE INSERT ON Grade
-FOR EACH ROW
+CREATE TRIGGER trigger_check_enrollment_after_grade
+AFTER INSERT ON Grade
+REFERENCING NEW TABLE AS new_grades
+FOR EACH STATEMENT
 EXECUTE FUNCTION check_student_enrollment();
 
 COMMENT ON FUNCTION check_student_enrollment() IS
-'Validates that a student is enrolled in a course before allowing grade insertion';
+'Validates that every inserted grade belongs to a student enrolled in the course for its semester';
 
-COMMENT ON TRIGGER trigger_check_enrollment_before_grade ON Grade IS
-'Prevents grade insertion if student is not enrolled in the course for the specified semester';
+COMMENT ON TRIGGER trigger_check_enrollment_after_grade ON Grade IS
+'Rejects the whole insert statement if any of its grades is for a student not enrolled in the course for that semester';
 
 
 
@@ -518,3 +539,108 @@ after delete on student_practical_attendance
 referencing   old table as old_table
 for each statement
 execute function audit_statement_change();
+
+
+-- Change notifications for client-side caches.
+-- Every write statement sends NOTIFY on channel 'table_change' with payload
+-- '<table>:<operation>'. Identical payloads in one transaction are folded
+-- into a single notification by PostgreSQL.
+
+create or replace function notify_statement_change()
+returns trigger
+AS $$
+begin
+	perform pg_notify('table_change', TG_TABLE_NAME || ':' || TG_OP);
+	return NULL;
+end;
+$$ LANGUAGE plpgsql;
+
+-- setting notify triggers on cached and frequently listed tables
+
+do $$
+declare
+	t text;
+begin
+	foreach t in array array[
+		'department', 'section', 'Group', 'student', 'instructor', 'room',
+		'semester', 'course', 'activity', 'exam', 'enrollment', 'grade',
+		'reservation'
+	]
+	loop
+		execute format('drop trigger if exists trg_notify_%s on %I', lower(t), t);
+		execute format(
+			'create trigger trg_notify_%s
+			after insert or update or delete or truncate on %I
+			for each statement
+			execute function notify_statement_change()',
+			lower(t), t
+		);
+	end loop;
+end;
+$$;
+
+
+-- Reservation dates touched by each write statement, so clients can refresh
+-- just those days of their room occupancy maps. Payload: comma separated
+-- dates, or '*' when too many dates changed to fit in one notification.
+
+create or replace function notify_reservation_days()
+returns trigger
+AS $$
+declare
+	days text;
+	n integer;
+begin
+	if TG_OP = 'INSERT' THEN
+		select string_agg(distinct reserv_date::text, ','), count(distinct reserv_date)
+		into days, n from new_table;
+	elsif TG_OP = 'DELETE' THEN
+		select string_agg(distinct reserv_date::text, ','), count(distinct reserv_date)
+		into days, n from old_table;
+	elsif TG_OP = 'UPDATE' THEN
+		select string_agg(distinct d::text, ','), count(distinct d)
+		into days, n
+		from (select reserv_date as d from new_table
+		      union select reserv_date from old_table) changed;
+	end if;
+
+	if n > 500 then
+		days := '*';
+	end if;
+	if days is not null then
+		perform pg_notify('reservation_days', days);
+	end if;
+	return NULL;
+end;
+$$ LANGUAGE plpgsql;
+
+drop trigger if exists trg_notify_reservation_days_ins on reservation;
+create trigger trg_notify_reservation_days_ins
+after insert on reservation
+referencing new table as new_table
+for each statement
+execute function notify_reservation_days();
+
+drop trigger if exists trg_notify_reservation_days_upd on reservation;
+create trigger trg_notify_reservation_days_upd
+after update on reservation
+referencing new table as new_table  old table as old_table
+for each statement
+execute function notify_reservation_days();
+
+drop trigger if exists trg_notify_reservation_days_del on reservation;
+create trigger trg_notify_reservation_days_del
+after delete on reservation
+referencing old table as old_table
+for each statement
+execute function notify_reservation_days();
+
+
+-- Per-student course scores, maintained incrementally from Grade
+-- (table, weighting functions and triggers: see student_course_score_schema.sql)
+\ir student_course_score_schema.sql
+
+
+-- Semester dashboards: materialized views read by the Grade Statistics pages
+-- (see dashboard_views_schema.sql)
+\ir dashboard_views_schema.sql
@@ -147,35 +147,17 @@ BEGIN
         S.Last_Name,
         S.First_Name,
         SEM.Name AS Semester_Name,
-        (SUM(
-            CASE G.Grade_Type
-                WHEN 'Quiz'       THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Assignment' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Midterm'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.30
-                WHEN 'Project'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Final'      THEN (G.Grade_Value / G.Max_Points) * 20 * 0.40
-                ELSE 0
-            END
-        ) / COUNT(DISTINCT G.Course_ID))::NUMERIC AS avg_grade
+        (SUM(SCS.Weighted_Total) / COUNT(DISTINCT SCS.Course_ID))::NUMERIC AS avg_grade
     FROM Student S
     JOIN Enrollment E ON S.Student_ID = E.Student_ID
-    JOIN Grade G ON E.Student_ID = G.Student_ID
-                 AND E.Course_ID = G.Course_ID
-                 AND E.Department_ID = G.Department_ID
-                 AND E.Semester_ID = G.Semester_ID
+    JOIN student_course_score SCS ON E.Student_ID = SCS.Student_ID
+                 AND E.Course_ID = SCS.Course_ID
+                 AND E.Department_ID = SCS.Department_ID
+                 AND E.Semester_ID = SCS.Semester_ID
     JOIN Semester SEM ON E.Semester_ID = SEM.Semester_ID
     WHERE E.Semester_ID = p_semester_id
     GROUP BY S.Student_ID, S.Last_Name, S.First_Name, SEM.Name
-    HAVING (SUM(
-            CASE G.Grade_Type
-                WHEN 'Quiz'       THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Assignment' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Midterm'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.30
-                WHEN 'Project'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Final'      THEN (G.Grade_Value / G.Max_Points) * 20 * 0.40
-                ELSE 0
-            END
-        ) / COUNT(DISTINCT G.Course_ID)) >= 10
+    HAVING (SUM(SCS.Weighted_Total) / COUNT(DISTINCT SCS.Course_ID)) >= 10
     ORDER BY S.Last_Name;
 END;
 $$ LANGUAGE plpgsql;
@@ -200,20 +182,11 @@ BEGIN
             S.Student_ID,
             S.Last_Name,
             S.First_Name,
-            SUM(
-                CASE G.Grade_Type
-                    WHEN 'Quiz' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                    WHEN 'Assignment' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                    WHEN 'Midterm' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.30
-                    WHEN 'Project' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                    WHEN 'Final' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.40
-                    ELSE 0
-                END
-            ) AS avg_value
+            SUM(SCS.Weighted_Total) AS avg_value
         FROM Student S
-        JOIN Grade G ON S.Student_ID = G.Student_ID
-        WHERE G.Course_ID = p_course_id
-          AND G.Department_ID = p_department_id
+        JOIN student_course_score SCS ON S.Student_ID = SCS.Student_ID
+        WHERE SCS.Course_ID = p_course_id
+          AND SCS.Department_ID = p_department_id
         GROUP BY S.Student_ID, S.Last_Name, S.First_Name
     ),
     promo_average AS (
@@ -249,24 +222,15 @@ RETURNS TABLE (
 BEGIN
     RETURN QUERY
     WITH student_totals AS (
-        -- First, calculate each student's weighted total
+        -- First, each student's weighted total (precomputed per semester)
         SELECT
             S.Student_ID,
             S.Group_ID,
-            SUM(
-                CASE G.Grade_Type
-                    WHEN 'Quiz' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                    WHEN 'Midterm' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.30
-                    WHEN 'Final' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.40
-                    WHEN 'Assignment' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                    WHEN 'Project' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                    ELSE 0
-                END
-            ) AS student_total
+            SUM(SCS.Weighted_Total) AS student_total
         FROM Student S
-        JOIN Grade G ON S.Student_ID = G.Student_ID
-        WHERE G.Course_ID = p_course_id
-          AND G.Department_ID = p_department_id
+        JOIN student_course_score SCS ON S.Student_ID = SCS.Student_ID
+        WHERE SCS.Course_ID = p_course_id
+          AND SCS.Department_ID = p_department_id
         GROUP BY S.Student_ID, S.Group_ID
     )
     -- Then, average those totals by group
@@ -301,31 +265,13 @@ BEGIN
         S.Student_ID,
         S.Last_Name,
         S.First_Name,
-        SUM(
-            CASE G.Grade_Type
-                WHEN 'Quiz'       THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Assignment' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Midterm'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.30
-                WHEN 'Project'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Final'      THEN (G.Grade_Value / G.Max_Points) * 20 * 0.40
-                ELSE 0
-            END
-        )::NUMERIC AS failing_grade
+        SUM(SCS.Weighted_Total)::NUMERIC AS failing_grade
     FROM Student S
-    JOIN Grade G ON S.Student_ID = G.Student_ID
-    WHERE G.Course_ID = p_course_id
-      AND G.Department_ID = p_department_id
+    JOIN student_course_score SCS ON S.Student_ID = SCS.Student_ID
+    WHERE SCS.Course_ID = p_course_id
+      AND SCS.Department_ID = p_department_id
     GROUP BY S.Student_ID, S.Last_Name, S.First_Name
-    HAVING SUM(
-            CASE G.Grade_Type
-                WHEN 'Quiz'       THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Assignment' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Midterm'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.30
-                WHEN 'Project'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Final'      THEN (G.Grade_Value / G.Max_Points) * 20 * 0.40
-                ELSE 0
-            END
-        ) < 10
+    HAVING SUM(SCS.Weighted_Total) < 10
     ORDER BY S.Last_Name;
 END;
 $$ LANGUAGE plpgsql;
@@ -347,45 +293,18 @@ BEGIN
         S.Student_ID,
         S.Last_Name,
         S.First_Name,
-        SUM(
-            CASE G.Grade_Type
-                WHEN 'Quiz'       THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Assignment' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Midterm'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.30
-                WHEN 'Project'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Final'      THEN (G.Grade_Value / G.Max_Points) * 20 * 0.40
-                ELSE 0
-            END
-        )::NUMERIC AS course_avg
+        SUM(SCS.Weighted_Total)::NUMERIC AS course_avg
     FROM Student S
-    JOIN Grade G ON S.Student_ID = G.Student_ID
+    JOIN student_course_score SCS ON S.Student_ID = SCS.Student_ID
     JOIN Enrollment E ON S.Student_ID = E.Student_ID
-                      AND G.Course_ID = E.Course_ID
-                      AND G.Department_ID = E.Department_ID
-    WHERE G.Course_ID = p_course_id
-      AND G.Department_ID = p_department_id
+                      AND SCS.Course_ID = E.Course_ID
+                      AND SCS.Department_ID = E.Department_ID
+    WHERE SCS.Course_ID = p_course_id
+      AND SCS.Department_ID = p_department_id
       AND E.Status = 'Resit Eligible'
     GROUP BY S.Student_ID, S.Last_Name, S.First_Name
-    HAVING SUM(
-            CASE G.Grade_Type
-                WHEN 'Quiz'       THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Assignment' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Midterm'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.30
-                WHEN 'Project'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Final'      THEN (G.Grade_Value / G.Max_Points) * 20 * 0.40
-                ELSE 0
-            END
-        ) >= 8
-       AND SUM(
-            CASE G.Grade_Type
-                WHEN 'Quiz'       THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Assignment' THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Midterm'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.30
-                WHEN 'Project'    THEN (G.Grade_Value / G.Max_Points) * 20 * 0.10
-                WHEN 'Final'      THEN (G.Grade_Value / G.Max_Points) * 20 * 0.40
-                ELSE 0
-            END
-        ) < 10
+    HAVING SUM(SCS.Weighted_Total) >= 8
+       AND SUM(SCS.Weighted_Total) < 10
     ORDER BY S.Last_Name;
 END;
 $$ LANGUAGE plpgsql;
@@ -461,16 +380,13 @@ BEGIN
     SELECT
         c.name::VARCHAR as course_name,
         COUNT(DISTINCT e.student_id)::BIGINT as student_count,
-        ROUND(AVG(
-            CASE g.grade_type
-                WHEN 'Quiz' THEN (g.grade_value / g.max_points) * 20 * 0.10
-                WHEN 'Assignment' THEN (g.grade_value / g.max_points) * 20 * 0.10
-                WHEN 'Midterm' THEN (g.grade_value / g.max_points) * 20 * 0.30
-                WHEN 'Project' THEN (g.grade_value / g.max_points) * 20 * 0.10
-                WHEN 'Final' THEN (g.grade_value / g.max_points) * 20 * 0.40
-                ELSE 0
-            END
-        ), 2) as average_grade,
+        -- Average weighted contribution per grade; an enrollment without
+        -- grades counts as a single 0
+        ROUND(
+            SUM(COALESCE(scs.weighted_total, 0)) /
+            NULLIF(SUM(GREATEST(COALESCE(scs.grade_count, 0), 1)), 0),
+            2
+        ) as average_grade,
         ROUND(
             100.0 * COUNT(CASE WHEN e.status = 'Passed' THEN 1 END)::NUMERIC /
             NULLIF(COUNT(DISTINCT e.student_id), 0),
@@ -478,10 +394,10 @@ BEGIN
         ) as pass_rate
     FROM Course c
     JOIN Enrollment e ON c.course_id = e.course_id AND c.department_id = e.department_id
-    LEFT JOIN Grade g ON e.student_id = g.student_id
-        AND e.course_id = g.course_id
-        AND e.department_id = g.department_id
-        AND e.semester_id = g.semester_id
+    LEFT JOIN student_course_score scs ON e.student_id = scs.student_id
+        AND e.course_id = scs.course_id
+        AND e.department_id = scs.department_id
+        AND e.semester_id = scs.semester_id
     WHERE e.semester_id = p_semester_id
     GROUP BY c.course_id, c.name
     ORDER BY average_grade DESC;
@@ -501,20 +417,11 @@ BEGIN
     RETURN QUERY
     WITH student_averages AS (
         SELECT
-            g.student_id,
-            SUM(
-                CASE g.grade_type
-                    WHEN 'Quiz' THEN (g.grade_value / g.max_points) * 20 * 0.10
-                    WHEN 'Assignment' THEN (g.grade_value / g.max_points) * 20 * 0.10
-                    WHEN 'Midterm' THEN (g.grade_value / g.max_points) * 20 * 0.30
-                    WHEN 'Project' THEN (g.grade_value / g.max_points) * 20 * 0.10
-                    WHEN 'Final' THEN (g.grade_value / g.max_points) * 20 * 0.40
-                    ELSE 0
-                END
-            ) as weighted_avg
-        FROM Grade g
-        WHERE g.course_id = p_course_id AND g.department_id = p_department_id
-        GROUP BY g.student_id
+            scs.student_id,
+            SUM(scs.weighted_total) as weighted_avg
+        FROM student_course_score scs
+        WHERE scs.course_id = p_course_id AND scs.department_id = p_department_id
+        GROUP BY scs.student_id
     )
     SELECT
         CASE
@@ -536,3 +443,54 @@ BEGIN
     ORDER BY grade_range;
 END;
 $$ LANGUAGE plpgsql;
+
+
+-- Dashboard snapshots: get_semester_overview / get_course_comparison read
+-- from the materialized views instead of aggregating live data.
+-- data_as_of is when the views were last refreshed (dashboard_refresh_state).
+CREATE OR REPLACE FUNCTION get_semester_overview_snapshot(p_semester_id INTEGER)
+RETURNS TABLE (
+    total_students BIGINT,
+    passed_count BIGINT,
+    failed_count BIGINT,
+    resit_count BIGINT,
+    average_grade NUMERIC,
+    data_as_of TIMESTAMPTZ
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        COALESCE(o.total_students, 0)::BIGINT,
+        COALESCE(o.passed_count, 0)::BIGINT,
+        COALESCE(o.failed_count, 0)::BIGINT,
+        COALESCE(o.resit_count, 0)::BIGINT,
+        o.average_grade,
+        (SELECT r.refreshed_at FROM dashboard_refresh_state r)
+    FROM (SELECT p_semester_id AS semester_id) p
+    LEFT JOIN mv_semester_overview o ON o.semester_id = p.semester_id;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION get_course_comparison_snapshot(p_semester_id INTEGER)
+RETURNS TABLE (
+    course_name VARCHAR,
+    student_count BIGINT,
+    average_grade NUMERIC,
+    pass_rate NUMERIC,
+    data_as_of TIMESTAMPTZ
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        cc.course_name,
+        cc.student_count,
+        cc.average_grade,
+        cc.pass_rate,
+        r.refreshed_at
+    FROM mv_course_comparison cc
+    LEFT JOIN dashboard_refresh_state r ON TRUE
+    WHERE cc.semester_id = p_semester_id
+    ORDER BY cc.average_grade DESC;
+END;
+$$ LANGUAGE plpgsql STABLE;
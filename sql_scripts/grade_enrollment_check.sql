@@ -0,0 +1,47 @@
+-- Upgrades an existing database to the statement-level enrollment check on Grade
+-- (new databases get this straight from dbtables.sql).
+-- The per-row BEFORE INSERT trigger ran one Enrollment lookup per grade; the
+-- statement-level trigger checks all rows of an INSERT with one anti-join.
+
+DROP TRIGGER IF EXISTS trigger_check_enrollment_before_grade ON Grade;
+DROP TRIGGER IF EXISTS trigger_check_enrollment_after_grade ON Grade;
+
+-- The old trigger function returned NEW; replace it before re-attaching
+CREATE OR REPLACE FUNCTION check_student_enrollment()
+RETURNS TRIGGER AS $$
+DECLARE
+    missing RECORD;
+BEGIN
+    SELECT n.Student_ID, n.Course_ID, n.Department_ID, n.Semester_ID
+    INTO missing
+    FROM new_grades n
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM Enrollment e
+        WHERE e.Student_ID = n.Student_ID
+          AND e.Course_ID = n.Course_ID
+          AND e.Department_ID = n.Department_ID
+          AND e.Semester_ID = n.Semester_ID
+          AND e.Status IN ('Enrolled', 'Passed', 'Failed', 'Resit Eligible')
+    )
+    LIMIT 1;
+
+    IF FOUND THEN
+        RAISE EXCEPTION
+            'Cannot insert grade: Student % is not enrolled in Course % (Department %) for Semester %',
+            missing.Student_ID, missing.Course_ID, missing.Department_ID, missing.Semester_ID
+        USING HINT = 'Student must be enrolled in the course before receiving grades';
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trigger_check_enrollment_after_grade
+AFTER INSERT ON Grade
+REFERENCING NEW TABLE AS new_grades
+FOR EACH STATEMENT
+EXECUTE FUNCTION check_student_enrollment();
+
+COMMENT ON TRIGGER trigger_check_enrollment_after_grade ON Grade IS
+'Rejects the whole insert statement if any of its grades is for a student not enrolled in the course for that semester';
@@ -0,0 +1,29 @@
+-- Upgrades an existing Reservation table to range-based overlap protection
+-- (new databases get this straight from dbtables.sql).
+-- Fails on the EXCLUDE constraints if overlapping bookings already exist;
+-- list them with the query at the bottom and fix them first.
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE Reservation
+    ADD COLUMN IF NOT EXISTS Time_Span TSRANGE GENERATED ALWAYS AS
+        (tsrange(Reserv_Date + Start_Time, Reserv_Date + End_Time, '[)')) STORED;
+
+ALTER TABLE Reservation DROP CONSTRAINT IF EXISTS EX_Reservation_Room_Overlap;
+ALTER TABLE Reservation ADD CONSTRAINT EX_Reservation_Room_Overlap
+    EXCLUDE USING gist (Building WITH =, RoomNo WITH =, Time_Span WITH &&);
+
+ALTER TABLE Reservation DROP CONSTRAINT IF EXISTS EX_Reservation_Instructor_Overlap;
+ALTER TABLE Reservation ADD CONSTRAINT EX_Reservation_Instructor_Overlap
+    EXCLUDE USING gist (Instructor_ID WITH =, Time_Span WITH &&);
+
+
+-- Overlapping bookings that block the constraints above
+-- SELECT a.Reservation_ID, b.Reservation_ID, a.Building, a.RoomNo,
+--        a.Instructor_ID, b.Instructor_ID, a.Time_Span, b.Time_Span
+-- FROM Reservation a
+-- JOIN Reservation b
+--   ON a.Reservation_ID < b.Reservation_ID
+--  AND a.Time_Span && b.Time_Span
+--  AND ((a.Building = b.Building AND a.RoomNo = b.RoomNo)
+--       OR a.Instructor_ID = b.Instructor_ID);
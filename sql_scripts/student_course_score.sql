@@ -0,0 +1,24 @@
+-- Adds student_course_score to an existing database and fills it from Grade
+-- (new databases get the table and triggers straight from dbtables.sql).
+-- The definitions themselves are included from student_course_score_schema.sql,
+-- so run this with psql. Run functions.sql afterwards so the reports read
+-- from the new table.
+
+begin;
+
+-- No grade may change between the backfill and the triggers going live
+lock table grade in share row exclusive mode;
+
+\ir student_course_score_schema.sql
+
+delete from student_course_score;
+insert into student_course_score
+	(student_id, course_id, department_id, semester_id, weighted_total, resit_total, grade_count)
+select student_id, course_id, department_id, semester_id,
+       sum(grade_weighted_score(grade_type, grade_value, max_points)),
+       sum(grade_resit_score(grade_type, grade_value, max_points)),
+       count(*)
+from grade
+group by student_id, course_id, department_id, semester_id;
+
+commit;
@@ -0,0 +1,123 @@
+-- Definitions of student_course_score, its grade weighting functions and
+-- the Grade triggers that maintain it. This file is the single source of the
+-- SQL weights: dbtables.sql (new databases) and student_course_score.sql
+-- (upgrades) both include it with \ir, so run them with psql.
+-- These weights drive the result reports, pass/fail and enrollment status.
+-- GRADE_WEIGHTS in db/grade_queries.py is a different weighting on purpose:
+-- it is the grade list's display average carried over from the original
+-- grade view (it also weights Homework, Practical Test, Oral Exam, folds
+-- Resit into the same sum and divides by the weights present). Do not
+-- align one with the other; changing either changes what its users show.
+-- Everything here is idempotent, so including it again is harmless.
+
+-- Per-student course scores, maintained incrementally from Grade.
+-- One row per (student, course, department, semester) that has grades.
+-- weighted_total is the weighted sum used by the result reports
+-- (Quiz/Assignment/Project 0.10, Midterm 0.30, Final 0.40 on a 0-20 scale);
+-- resit_total holds the Resit contribution (0.40), which only the
+-- enrollment status update adds on top. Reports read these totals
+-- instead of re-aggregating Grade.
+
+create table if not exists student_course_score (
+	student_id integer not null,
+	course_id integer not null,
+	department_id integer not null,
+	semester_id integer not null,
+	weighted_total numeric not null default 0,
+	resit_total numeric not null default 0,
+	grade_count integer not null default 0,
+	constraint pk_student_course_score
+		primary key (student_id, course_id, department_id, semester_id)
+);
+
+create index if not exists idx_student_course_score_course
+	on student_course_score (course_id, department_id, semester_id);
+
+-- Weighted contribution of one grade to weighted_total
+create or replace function grade_weighted_score(p_grade_type varchar, p_grade_value numeric, p_max_points numeric)
+returns numeric
+AS $$
+	select case p_grade_type
+		when 'Quiz'       then (p_grade_value / p_max_points) * 20 * 0.10
+		when 'Assignment' then (p_grade_value / p_max_points) * 20 * 0.10
+		when 'Midterm'    then (p_grade_value / p_max_points) * 20 * 0.30
+		when 'Project'    then (p_grade_value / p_max_points) * 20 * 0.10
+		when 'Final'      then (p_grade_value / p_max_points) * 20 * 0.40
+		else 0
+	end;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Contribution of one grade to resit_total
+create or replace function grade_resit_score(p_grade_type varchar, p_grade_value numeric, p_max_points numeric)
+returns numeric
+AS $$
+	select case p_grade_type
+		when 'Resit' then (p_grade_value / p_max_points) * 20 * 0.40
+		else 0
+	end;
+$$ LANGUAGE sql IMMUTABLE;
+
+create or replace function maintain_student_course_score()
+returns trigger
+AS $$
+begin
+	-- Take the old grade out of its score row
+	if TG_OP in ('UPDATE', 'DELETE') then
+		update student_course_score
+		set weighted_total = weighted_total - grade_weighted_score(OLD.grade_type, OLD.grade_value, OLD.max_points),
+		    resit_total = resit_total - grade_resit_score(OLD.grade_type, OLD.grade_value, OLD.max_points),
+		    grade_count = grade_count - 1
+		where student_id = OLD.student_id
+		  and course_id = OLD.course_id
+		  and department_id = OLD.department_id
+		  and semester_id = OLD.semester_id;
+
+		delete from student_course_score
+		where student_id = OLD.student_id
+		  and course_id = OLD.course_id
+		  and department_id = OLD.department_id
+		  and semester_id = OLD.semester_id
+		  and grade_count <= 0;
+	end if;
+
+	-- Add the new grade to its score row
+	if TG_OP in ('INSERT', 'UPDATE') then
+		insert into student_course_score as s
+			(student_id, course_id, department_id, semester_id, weighted_total, resit_total, grade_count)
+		values (
+			NEW.student_id, NEW.course_id, NEW.department_id, NEW.semester_id,
+			grade_weighted_score(NEW.grade_type, NEW.grade_value, NEW.max_points),
+			grade_resit_score(NEW.grade_type, NEW.grade_value, NEW.max_points),
+			1
+		)
+		on conflict on constraint pk_student_course_score do update
+		set weighted_total = s.weighted_total + excluded.weighted_total,
+		    resit_total = s.resit_total + excluded.resit_total,
+		    grade_count = s.grade_count + 1;
+	end if;
+
+	return NULL;
+end;
+$$ LANGUAGE plpgsql;
+
+create or replace function clear_student_course_score()
+returns trigger
+AS $$
+begin
+	truncate student_course_score;
+	return NULL;
+end;
+$$ LANGUAGE plpgsql;
+
+drop trigger if exists trg_student_course_score on grade;
+create trigger trg_student_course_score
+after insert or update of student_id, course_id, department_id, semester_id, grade_type, grade_value, max_points
+	or delete on grade
+for each row
+execute function maintain_student_course_score();
+
+drop trigger if exists trg_student_course_score_truncate on grade;
+create trigger trg_student_course_score_truncate
+after truncate on grade
+for each statement
+execute function clear_student_course_score();
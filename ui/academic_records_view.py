@@ -9,6 +9,7 @@ from PyQt5.QtWidgets import (
 )
 
 from ui.attendance_crud_view import AttendanceCrudView
+from ui.bulk_import_view import BulkImportView
 from ui.grade_crud_view import GradeCrudView
 
 
@@ -91,6 +92,29 @@ class AcademicRecordsView(QWidget):
         btn_attendance.clicked.connect(self.show_attendance_crud)
         grid.addWidget(btn_attendance, 0, 1)
 
+        btn_import = QPushButton("Bulk Import (CSV)")
+        btn_import.setFixedSize(200, 80)
+        btn_import.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #8e44ad;
+                color: white;
+                font-size: 14px;
+                font-weight: bold;
+                border-radius: 8px;
+                border: none;
+            }
+            QPushButton:hover {
+                background-color: #7d3c98;
+            }
+            QPushButton:pressed {
+                background-color: #6c3483;
+            }
+        """
+        )
+        btn_import.clicked.connect(self.show_bulk_import)
+        grid.addWidget(btn_import, 1, 0)
+
         layout.addLayout(grid)
         layout.addStretch()
 
@@ -129,6 +153,13 @@ class AcademicRecordsView(QWidget):
         self.stack.addWidget(attendance_crud)
         self.stack.setCurrentWidget(attendance_crud)
 
+    def show_bulk_import(self):
+
+        bulk_import = BulkImportView(parent=self)
+
+        self.stack.addWidget(bulk_import)
+        self.stack.setCurrentWidget(bulk_import)
+
     def go_back_to_main(self):
         """
         Returns to the main application menu.
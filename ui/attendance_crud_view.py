@@ -2,6 +2,7 @@
 
 from db.attendance_queries import AttendanceQueries
 from db.grade_queries import GradeQueries
+from ui.paged_loader import PagedLoader, reserve_table_rows
 from PyQt5.QtCore import QDate, Qt, QTime
 from PyQt5.QtWidgets import (
     QCheckBox,
@@ -53,6 +54,11 @@ class AttendanceCrudView(QWidget):
         self.delete_page = self.setup_delete_page()
         self.stack.addWidget(self.delete_page)
 
+        # Attendance tables are filled page by page as they scroll
+        self.read_loader = PagedLoader(self.attendance_table, self.show_attendance_page)
+        self.update_loader = PagedLoader(self.update_table, self.show_update_page)
+        self.delete_loader = PagedLoader(self.delete_table, self.show_delete_page)
+
         # Start with menu
         self.stack.setCurrentIndex(0)
 
@@ -330,11 +336,7 @@ class AttendanceCrudView(QWidget):
         if activity_type == "All":
             activity_type = None
 
-        # Fetch attendance from database
-        attendances = AttendanceQueries.get_all_attendance(activity_type, search_term)
-
         # Setup table with 9 columns (including hidden IDs)
-        self.attendance_table.setRowCount(len(attendances))
         self.attendance_table.setColumnCount(9)
         self.attendance_table.setHorizontalHeaderLabels([
             "Student", "Activity Type", "Date", "Attended",
@@ -346,9 +348,19 @@ class AttendanceCrudView(QWidget):
         self.attendance_table.setColumnHidden(7, True)  # student_id
         self.attendance_table.setColumnHidden(8, True)  # activity_id
 
+        # Fetch attendance page by page
+        self.read_loader.start(
+            AttendanceQueries.get_attendance_page,
+            activity_type=activity_type, search_term=search_term,
+        )
+
+    def show_attendance_page(self, attendances, first_page):
+        """Shows one page of attendance rows (the first page replaces the table)."""
+        start = reserve_table_rows(self.attendance_table, attendances, first_page)
+
         # Populate table
-        for row_idx, att in enumerate(attendances):
-            # att tuple: (student_name, activity_type, date, attended, time, accommodations, student_id, activity_id)
+        for row_idx, att in enumerate(attendances, start):
+            # att tuple: (student_name, activity_type, date, attended, time, accommodations, student_id, activity_id, percent)
             # Display columns (0-5)
             for col_idx in range(6):
                 value = att[col_idx]
@@ -371,10 +383,10 @@ class AttendanceCrudView(QWidget):
 
                 self.attendance_table.setItem(row_idx, col_idx, item)
 
-            # Calculate and add attendance percentage
+            # Attendance percentage comes precomputed with the row
             student_id = att[6]
             activity_id = att[7]
-            percent = self.calculate_attendance_percent(student_id, activity_id)
+            percent = att[8]
             percent_item = QTableWidgetItem(f"{percent:.1f}%")
             percent_item.setTextAlignment(Qt.AlignCenter)
 
@@ -397,20 +409,13 @@ class AttendanceCrudView(QWidget):
             self.attendance_table.resizeColumnToContents(i)
 
         # Show message if no results
-        if not attendances:
+        if first_page and not attendances:
             QMessageBox.information(
                 self,
                 "No Results",
                 "No attendance records found matching your criteria."
             )
 
-    def calculate_attendance_percent(self, student_id, activity_id):
-
-        total, attended_count = AttendanceQueries.get_attendance_for_percent(
-            student_id, activity_id
-        )
-        return (attended_count / total * 100) if total > 0 else 0.0
-
     def setup_update_page(self):
 
         page = QWidget()
@@ -533,11 +538,7 @@ class AttendanceCrudView(QWidget):
         if activity_type == "All":
             activity_type = None
 
-        # Fetch attendance
-        attendances = AttendanceQueries.get_all_attendance(activity_type, search_term)
-
         # Setup table
-        self.update_table.setRowCount(len(attendances))
         self.update_table.setColumnCount(9)
         self.update_table.setHorizontalHeaderLabels([
             "Student", "Type", "Date", "Attended",
@@ -549,8 +550,18 @@ class AttendanceCrudView(QWidget):
         self.update_table.setColumnHidden(7, True)
         self.update_table.setColumnHidden(8, True)
 
+        # Fetch attendance page by page
+        self.update_loader.start(
+            AttendanceQueries.get_attendance_page,
+            activity_type=activity_type, search_term=search_term,
+        )
+
+    def show_update_page(self, attendances, first_page):
+        """Shows one page of attendance rows in the update table."""
+        start = reserve_table_rows(self.update_table, attendances, first_page)
+
         # Populate table
-        for row_idx, att in enumerate(attendances):
+        for row_idx, att in enumerate(attendances, start):
             for col_idx in range(6):
                 value = att[col_idx]
                 if col_idx == 3:
@@ -562,7 +573,7 @@ class AttendanceCrudView(QWidget):
                 self.update_table.setItem(row_idx, col_idx, item)
 
             # Percentage
-            percent = self.calculate_attendance_percent(att[6], att[7])
+            percent = att[8]
             self.update_table.setItem(row_idx, 6, QTableWidgetItem(f"{percent:.1f}%"))
 
             # Hidden IDs
@@ -571,7 +582,7 @@ class AttendanceCrudView(QWidget):
 
         self.update_table.resizeColumnsToContents()
 
-        if not attendances:
+        if first_page and not attendances:
             QMessageBox.information(
                 self,
                 "No Results",
@@ -713,11 +724,7 @@ class AttendanceCrudView(QWidget):
 
     def load_attendance_for_delete(self):
         """Loads all attendance records for deletion."""
-        # Fetch all attendance (no filters)
-        attendances = AttendanceQueries.get_all_attendance(None, "")
-
         # Setup table
-        self.delete_table.setRowCount(len(attendances))
         self.delete_table.setColumnCount(9)
         self.delete_table.setHorizontalHeaderLabels([
             "Student", "Type", "Date", "Attended",
@@ -729,8 +736,17 @@ class AttendanceCrudView(QWidget):
         self.delete_table.setColumnHidden(7, True)
         self.delete_table.setColumnHidden(8, True)
 
+        # Fetch all attendance (no filters), page by page
+        self.delete_loader.start(
+            AttendanceQueries.get_attendance_page, activity_type=None, search_term=""
+        )
+
+    def show_delete_page(self, attendances, first_page):
+        """Shows one page of attendance rows in the delete table."""
+        start = reserve_table_rows(self.delete_table, attendances, first_page)
+
         # Populate table
-        for row_idx, att in enumerate(attendances):
+        for row_idx, att in enumerate(attendances, start):
             for col_idx in range(6):
                 value = att[col_idx]
                 if col_idx == 3:
@@ -742,7 +758,7 @@ class AttendanceCrudView(QWidget):
                 self.delete_table.setItem(row_idx, col_idx, item)
 
             # Percentage
-            percent = self.calculate_attendance_percent(att[6], att[7])
+            percent = att[8]
             self.delete_table.setItem(row_idx, 6, QTableWidgetItem(f"{percent:.1f}%"))
 
             # Hidden IDs
@@ -751,7 +767,7 @@ class AttendanceCrudView(QWidget):
 
         self.delete_table.resizeColumnsToContents()
 
-        if not attendances:
+        if first_page and not attendances:
             QMessageBox.information(self, "No Data", "No attendance records in database.")
 
     def confirm_delete(self):
@@ -10,13 +10,14 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QPushButton,
     QStackedWidget,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from db import audit_log_queries
+from ui.paged_loader import PagedLoader
+from ui.result_table_model import ResultTableModel
 
 class AuditLogView(QWidget):
     def __init__(self, parent=None):
@@ -54,36 +55,39 @@ class AuditLogView(QWidget):
         filter_layout.addWidget(self.sort_order_combo)
 
         main_layout.addLayout(filter_layout)
-        self.audit_log_table = QTableWidget()
-        self.audit_log_table.setColumnCount(5)
-        self.audit_log_table.setHorizontalHeaderLabels(
-            ["ID", "Table Name", "Operation", "Timestamp", "User"]
+        self.audit_log_table = QTableView()
+        self.audit_log_model = ResultTableModel(
+            columns=["ID", "Table Name", "Operation", "Timestamp", "User"]
         )
+        self.audit_log_table.setModel(self.audit_log_model)
         self.audit_log_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         main_layout.addWidget(self.audit_log_table)
+        self.loader = PagedLoader(self.audit_log_table, self.show_page)
+
     def load_audit_logs(self):
         search_field = self.search_field_combo.currentText()
         search_value = self.search_input.text().strip()
         sort_by = self.sort_by_combo.currentText()
         sort_order = self.sort_order_combo.currentText()
 
-        logs = audit_log_queries.AuditLogQueries.get_audit_logs(
+        self.loader.start(
+            audit_log_queries.AuditLogQueries.get_audit_logs_page,
             search_field=search_field,
             search_value=search_value,
             sort_by=sort_by,
             sort_order=sort_order,
         )
 
-        self.audit_log_table.setRowCount(0)
-
-        for row_data in logs:
-            row_number = self.audit_log_table.rowCount()
-            self.audit_log_table.insertRow(row_number)
-            for column_number, data in enumerate(row_data):
-                item = QTableWidgetItem(str(data))
-                item.setFlags(item.flags() ^ Qt.ItemIsEditable)
-                self.audit_log_table.setItem(row_number, column_number, item)
+    def show_page(self, logs, first_page):
+        if first_page:
+            self.audit_log_model.set_rows(logs)
+        else:
+            self.audit_log_model.append_rows(logs)
 
     def on_search_clicked(self):
         self.load_audit_logs() 
 
+    def refresh(self):
+        # Called by MainWindow's view cache (F5) to reload in place
+        self.load_audit_logs()
+
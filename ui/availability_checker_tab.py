@@ -1,10 +1,24 @@
 from PyQt5.QtCore import Qt, QDate, QTime
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
     QPushButton, QLabel, QDateEdit, QTimeEdit, QSpinBox, QHeaderView,
-    QFormLayout, QGroupBox, QMessageBox
+    QFormLayout, QGroupBox, QMessageBox, QCheckBox
 )
 from db import reservation_queries
+from db.room_availability import room_availability
+from ui.query_worker import BusyIndicator, QueryRunner
+from ui.result_table_model import ResultTableModel
+
+
+def find_available_rooms(date, until, start, end, min_capacity):
+    """
+    Runs on a worker thread: occupancy bitmaps first, SQL anti-join as fallback.
+    Returns None if availability could not be read.
+    """
+    rooms = room_availability.free_rooms_weekly(date, until or date, start, end, min_capacity)
+    if rooms is None and until is None:
+        rooms = reservation_queries.ReservationQueries.get_available_rooms(date, start, end, min_capacity)
+    return rooms
 
 
 class AvailabilityCheckerTab(QWidget):
@@ -12,6 +26,7 @@ class AvailabilityCheckerTab(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.runner = QueryRunner(self)
         self.initUI()
     
     def initUI(self):
@@ -50,6 +65,18 @@ class AvailabilityCheckerTab(QWidget):
         self.capacity_spin.setValue(0)
         self.capacity_spin.setSpecialValueText("Any")
         criteria_layout.addRow("Min Capacity:", self.capacity_spin)
+
+        # Weekly repeat: same weekday and time every week until a date
+        repeat_layout = QHBoxLayout()
+        self.weekly_check = QCheckBox("Every week until")
+        self.until_edit = QDateEdit()
+        self.until_edit.setCalendarPopup(True)
+        self.until_edit.setDate(QDate.currentDate().addDays(7 * 15))
+        self.until_edit.setEnabled(False)
+        self.weekly_check.toggled.connect(self.until_edit.setEnabled)
+        repeat_layout.addWidget(self.weekly_check)
+        repeat_layout.addWidget(self.until_edit)
+        criteria_layout.addRow("Repeat:", repeat_layout)
         
         criteria_group.setLayout(criteria_layout)
         layout.addWidget(criteria_group)
@@ -58,6 +85,7 @@ class AvailabilityCheckerTab(QWidget):
         search_btn = QPushButton("Find Available Rooms")
         search_btn.clicked.connect(self.search_available_rooms)
         layout.addWidget(search_btn)
+        layout.addWidget(BusyIndicator(self.runner, "Searching..."))
         
         # Results table
         # Results table
@@ -65,14 +93,14 @@ class AvailabilityCheckerTab(QWidget):
         results_label.setStyleSheet("font-weight: bold; font-size: 14px;")
         layout.addWidget(results_label)
         
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(3)  # ← CHANGED: was 4
-        self.results_table.setHorizontalHeaderLabels([
+        self.results_table = QTableView()
+        self.results_model = ResultTableModel(columns=[
             "Building", "Room No", "Capacity"  # ← CHANGED: removed "Type"
         ])
+        self.results_table.setModel(self.results_model)
         self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.results_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QTableView.SelectRows)
+        self.results_table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.results_table)
 
         
@@ -93,27 +121,45 @@ class AvailabilityCheckerTab(QWidget):
         start = self.start_time_edit.time().toString("HH:mm:ss")
         end = self.end_time_edit.time().toString("HH:mm:ss")
         min_capacity = self.capacity_spin.value() if self.capacity_spin.value() > 0 else None
-        
-        # Search
-        available_rooms = reservation_queries.ReservationQueries.get_available_rooms(
-            date, start, end, min_capacity
+        until = None
+        if self.weekly_check.isChecked():
+            if self.until_edit.date() < self.date_edit.date():
+                QMessageBox.warning(self, "Invalid Date", "The repeat end date is before the start date!")
+                return
+            until = self.until_edit.date().toString("yyyy-MM-dd")
+
+        # Search in the background
+        self.runner.cancel_all()
+        self.runner.submit(
+            find_available_rooms,
+            date, until, start, end, min_capacity,
+            on_result=self.show_available_rooms,
+            on_error=self.show_search_error,
         )
-        
-        # Display results
-        self.results_table.setRowCount(0)
-        
-        for row_data in available_rooms:
-            row_num = self.results_table.rowCount()
-            self.results_table.insertRow(row_num)
-            
-            for col_num, data in enumerate(row_data):
-                item = QTableWidgetItem(str(data) if data is not None else "")
-                item.setFlags(item.flags() ^ Qt.ItemIsEditable)
-                self.results_table.setItem(row_num, col_num, item)
+
+    def show_search_error(self, message=None):
+        """Shows a failed search as an error, never as 'no rooms'"""
+        self.results_model.set_rows([])
+        self.summary_label.setText("⚠️ Could not check room availability. Please try again.")
+        self.summary_label.setStyleSheet("color: orange; font-weight: bold;")
+        if message:
+            print(f"❌ Error checking room availability: {message}")
+
+    def show_available_rooms(self, available_rooms):
+        """Display search results"""
+        if available_rooms is None:
+            self.show_search_error()
+            return
+        self.results_model.set_rows(available_rooms)
         
         # Update summary
         count = len(available_rooms)
         date_str = self.date_edit.date().toString("dd/MM/yyyy")
+        if self.weekly_check.isChecked():
+            date_str = (
+                f"every {self.date_edit.date().toString('dddd')} from {date_str} "
+                f"to {self.until_edit.date().toString('dd/MM/yyyy')}"
+            )
         time_str = f"{self.start_time_edit.time().toString('HH:mm')} - {self.end_time_edit.time().toString('HH:mm')}"
         
         if count > 0:
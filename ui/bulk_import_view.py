@@ -0,0 +1,187 @@
+# ui/bulk_import_view.py
+# Purpose: Bulk CSV import of students, enrollments and grades (db/bulk_import.py).
+# The import runs in the background; rejected rows are listed with their CSV
+# line number and can be saved as a CSV error report.
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from db.bulk_import import BulkImport
+from ui.query_worker import BusyIndicator, QueryRunner
+
+# Combo label -> (import method, expected columns)
+IMPORT_KINDS = {
+    "Students": (
+        BulkImport.import_students,
+        "first_name, last_name, dob, [group, email, phone, address, city, zip_code]",
+    ),
+    "Enrollments": (
+        BulkImport.import_enrollments,
+        "student_id, course, department, semester, [status]",
+    ),
+    "Grades": (
+        BulkImport.import_grades,
+        "student_id, course, department, semester, grade_type, grade_value, max_points, "
+        "[grade_date, exam_id, comments]",
+    ),
+}
+
+
+class BulkImportView(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # The stack re-parents this widget; keep the records view for "Back"
+        self.records_view = parent
+        self.report = None
+
+        self.runner = QueryRunner(self)
+        layout = QVBoxLayout(self)
+
+        title = QLabel("Bulk Import from CSV")
+        title.setStyleSheet("font-size: 16px; font-weight: bold; color: #2c3e50;")
+        title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title)
+
+        # Kind and file
+        form = QHBoxLayout()
+        self.kind_combo = QComboBox()
+        self.kind_combo.addItems(IMPORT_KINDS)
+        self.kind_combo.currentTextChanged.connect(self.update_columns_hint)
+        form.addWidget(QLabel("Import:"))
+        form.addWidget(self.kind_combo)
+
+        self.file_input = QLineEdit()
+        self.file_input.setPlaceholderText("CSV file with a header row")
+        form.addWidget(self.file_input, 1)
+        btn_browse = QPushButton("Browse...")
+        btn_browse.clicked.connect(self.choose_file)
+        form.addWidget(btn_browse)
+        layout.addLayout(form)
+
+        self.columns_hint = QLabel()
+        self.columns_hint.setStyleSheet("color: #7f8c8d;")
+        self.columns_hint.setWordWrap(True)
+        layout.addWidget(self.columns_hint)
+        self.update_columns_hint(self.kind_combo.currentText())
+
+        # Actions
+        actions = QHBoxLayout()
+        self.dry_run_check = QCheckBox("Dry run (validate only, nothing is saved)")
+        actions.addWidget(self.dry_run_check)
+        actions.addStretch()
+        self.btn_import = QPushButton("Import")
+        self.btn_import.setStyleSheet(
+            "background-color: #27ae60; color: white; padding: 8px 20px; border-radius: 5px;"
+        )
+        self.btn_import.clicked.connect(self.start_import)
+        actions.addWidget(self.btn_import)
+        layout.addLayout(actions)
+
+        layout.addWidget(BusyIndicator(self.runner, "Importing..."))
+
+        # Result
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(self.summary_label)
+
+        self.errors_table = QTableWidget(0, 2)
+        self.errors_table.setHorizontalHeaderLabels(["Line", "Error"])
+        self.errors_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.errors_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.errors_table)
+
+        bottom = QHBoxLayout()
+        self.btn_save_errors = QPushButton("Save Error Report")
+        self.btn_save_errors.setEnabled(False)
+        self.btn_save_errors.clicked.connect(self.save_errors)
+        bottom.addWidget(self.btn_save_errors)
+        bottom.addStretch()
+        btn_back = QPushButton("← Back to Academic Menu")
+        btn_back.setStyleSheet(
+            """
+            background-color: #34495e;
+            color: white;
+            padding: 10px;
+            border-radius: 5px;
+        """
+        )
+        btn_back.clicked.connect(self.go_back_to_academic_menu)
+        bottom.addWidget(btn_back)
+        layout.addLayout(bottom)
+
+    def update_columns_hint(self, kind):
+        self.columns_hint.setText(f"Columns: {IMPORT_KINDS[kind][1]}  ([...] = optional)")
+
+    def choose_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select CSV File", "", "CSV Files (*.csv)")
+        if file_path:
+            self.file_input.setText(file_path)
+
+    def start_import(self):
+        file_path = self.file_input.text().strip()
+        if not file_path:
+            QMessageBox.warning(self, "No File", "Please select a CSV file to import.")
+            return
+
+        import_fn = IMPORT_KINDS[self.kind_combo.currentText()][0]
+        self.btn_import.setEnabled(False)
+        self.summary_label.setText("Reading file...")
+        self.errors_table.setRowCount(0)
+        self.btn_save_errors.setEnabled(False)
+        self.runner.submit(
+            import_fn,
+            file_path,
+            dry_run=self.dry_run_check.isChecked(),
+            on_progress=lambda rows: self.summary_label.setText(f"{rows} rows validated..."),
+            on_result=self.show_report,
+            on_error=self.import_failed,
+            on_cancelled=lambda: self.btn_import.setEnabled(True),
+        )
+
+    def show_report(self, report):
+        self.btn_import.setEnabled(True)
+        self.report = report
+        self.summary_label.setText(report.summary())
+
+        errors = sorted(report.errors)
+        self.errors_table.setRowCount(len(errors))
+        for row, (line_no, message) in enumerate(errors):
+            self.errors_table.setItem(row, 0, QTableWidgetItem(str(line_no)))
+            self.errors_table.setItem(row, 1, QTableWidgetItem(message))
+        self.btn_save_errors.setEnabled(bool(errors))
+
+    def import_failed(self, message):
+        self.btn_import.setEnabled(True)
+        self.summary_label.setText("Import failed, nothing was saved.")
+        QMessageBox.critical(self, "Import Failed", f"Failed to import file:\n{message}")
+
+    def save_errors(self):
+        if not self.report:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Error Report", f"{self.report.kind}_import_errors.csv", "CSV Files (*.csv)"
+        )
+        if not file_path:
+            return
+        try:
+            self.report.write_errors_csv(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Save Failed", f"Failed to save error report:\n{e}")
+
+    def go_back_to_academic_menu(self):
+        if self.records_view:
+            self.records_view.show_menu()
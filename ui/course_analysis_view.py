@@ -12,12 +12,15 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QPushButton,
     QStackedWidget,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
+from ui.query_worker import BusyIndicator, QueryRunner
+from ui.report_exporter import ReportExporter
+from ui.result_table_model import ResultTableModel
+
 
 class CourseAnalysisView(QWidget):
     def __init__(self, parent=None, results_parent=None):
@@ -32,6 +35,14 @@ class CourseAnalysisView(QWidget):
         self.stack = QStackedWidget()
         self.layout.addWidget(self.stack)
 
+        # Report functions run in the background
+        self.runner = QueryRunner(self)
+        self.layout.addWidget(BusyIndicator(self.runner, "Loading report..."))
+
+        # Exports re-run the report function shown in each table
+        self.exporter = ReportExporter(self)
+        self.report_sources = {}  # report_type -> (function_name, params)
+
         # Menu page (index 0)
         self.menu_page = self.create_menu_page()
         self.stack.addWidget(self.menu_page)
@@ -124,13 +135,14 @@ class CourseAnalysisView(QWidget):
         layout.addLayout(filter_layout)
 
         # Table
-        self.disqualify_table = QTableWidget()
-        self.disqualify_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.disqualify_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.disqualify_table = QTableView()
+        self.disqualify_table.setModel(ResultTableModel(alignment=Qt.AlignCenter))
+        self.disqualify_table.setSelectionBehavior(QTableView.SelectRows)
+        self.disqualify_table.setSelectionMode(QTableView.SingleSelection)
         self.disqualify_table.horizontalHeader().setSectionResizeMode(
             QHeaderView.Stretch
         )
-        self.disqualify_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.disqualify_table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.disqualify_table)
 
         # Export button
@@ -182,11 +194,12 @@ class CourseAnalysisView(QWidget):
         layout.addLayout(filter_layout)
 
         # Table
-        self.avg_table = QTableWidget()
-        self.avg_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.avg_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.avg_table = QTableView()
+        self.avg_table.setModel(ResultTableModel(alignment=Qt.AlignCenter))
+        self.avg_table.setSelectionBehavior(QTableView.SelectRows)
+        self.avg_table.setSelectionMode(QTableView.SingleSelection)
         self.avg_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.avg_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.avg_table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.avg_table)
 
         # Export button
@@ -245,14 +258,18 @@ class CourseAnalysisView(QWidget):
 
             course_id, dept_id = course_data
 
-            # Execute function
-            results, columns = ResultsQueries.execute_function(
-                "get_disqualifying_marks_by_module", (course_id, dept_id)
+            # Execute function in the background, display in table when done
+            self.report_sources["disqualify"] = ("get_disqualifying_marks_by_module", (course_id, dept_id))
+            self.runner.submit(
+                ResultsQueries.execute_function,
+                "get_disqualifying_marks_by_module",
+                (course_id, dept_id),
+                on_result=lambda payload: self.populate_table(
+                    self.disqualify_table, *payload
+                ),
+                on_error=self.show_load_error,
             )
 
-            # Display in table
-            self.populate_table(self.disqualify_table, results, columns)
-
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load report: {str(e)}")
             print(f" Error loading disqualify report: {e}")
@@ -270,32 +287,28 @@ class CourseAnalysisView(QWidget):
 
             course_id, dept_id = course_data
 
-            # Execute function
-            results, columns = ResultsQueries.execute_function(
-                "get_average_marks_by_course_group", (course_id, dept_id)
+            # Execute function in the background, display in table when done
+            self.report_sources["avg_group"] = ("get_average_marks_by_course_group", (course_id, dept_id))
+            self.runner.submit(
+                ResultsQueries.execute_function,
+                "get_average_marks_by_course_group",
+                (course_id, dept_id),
+                on_result=lambda payload: self.populate_table(self.avg_table, *payload),
+                on_error=self.show_load_error,
             )
 
-            # Display in table
-            self.populate_table(self.avg_table, results, columns)
-
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load report: {str(e)}")
             print(f" Error loading average by group report: {e}")
 
-    def populate_table(self, table, results, columns):
+    def show_load_error(self, message):
 
-        # Setup table
-        table.setRowCount(len(results))
-        table.setColumnCount(len(columns))
-        table.setHorizontalHeaderLabels(columns)
+        QMessageBox.critical(self, "Error", f"Failed to load report: {message}")
 
-        # Populate data
-        for row_idx, row in enumerate(results):
-            for col_idx, value in enumerate(row):
-                item = QTableWidgetItem(str(value) if value is not None else "")
-                item.setTextAlignment(Qt.AlignCenter)
-                table.setItem(row_idx, col_idx, item)
+    def populate_table(self, table, results, columns):
 
+        # Hand the raw rows to the model; cells are formatted on paint
+        table.model().set_rows(results, columns)
         table.resizeColumnsToContents()
 
         # Show message if no results
@@ -306,56 +319,21 @@ class CourseAnalysisView(QWidget):
 
     def export_report(self, report_type):
 
-        import csv
-
-        from PyQt5.QtWidgets import QFileDialog
-
         # Get the appropriate table
         table = self.disqualify_table if report_type == "disqualify" else self.avg_table
 
-        if table.rowCount() == 0:
+        if table.model().rowCount() == 0 or report_type not in self.report_sources:
             QMessageBox.warning(
                 self, "No Data", "No data to export. Please load a report first."
             )
             return
 
-        # Get file path
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Export Report", f"{report_type}_report.csv", "CSV Files (*.csv)"
-        )
-
-        if not file_path:
-            return
-
-        try:
-            with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.writer(csvfile)
-
-                # Write headers
-                headers = [
-                    table.horizontalHeaderItem(i).text()
-                    for i in range(table.columnCount())
-                ]
-                writer.writerow(headers)
-
-                # Write data
-                for row in range(table.rowCount()):
-                    row_data = [
-                        table.item(row, col).text() if table.item(row, col) else ""
-                        for col in range(table.columnCount())
-                    ]
-                    writer.writerow(row_data)
-
-            QMessageBox.information(
-                self, "Export Successful", f"Report exported to:\n{file_path}"
-            )
-
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Export Failed", f"Failed to export report:\n{str(e)}"
-            )
+        # Streams the full result to the file in the background
+        function_name, params = self.report_sources[report_type]
+        self.exporter.export(function_name, params, f"{report_type}_report")
 
     def go_back_to_results_menu(self):
-       
+
+        self.runner.cancel_all()
         if self.results_parent:
             self.results_parent.show_menu()
@@ -1,3 +1,4 @@
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import (
     QGridLayout,
     QPushButton,
@@ -19,8 +20,31 @@ from ui.enrollment_crud_view import EnrollmentView
 
 
 class CrudView(QWidget):
-    def __init__(self, parent=None):
+    # Table name -> (attribute name, view class).
+    # Views are only built the first time they are opened.
+    VIEW_REGISTRY = {
+        "Department": ("dept_view", DepartmentView),
+        "Student": ("student_view", StudentView),
+        "Instructor": ("instructor_view", InstructorView),
+        "Room": ("room_view", RoomView),
+        "Section": ("section_view", SectionView),
+        "Group": ("group_view", GroupView),
+        "Course": ("course_view", CourseView),
+        "Semester": ("semester_view", SemesterView),
+        "Activity": ("activity_view", ActivityView),
+        "Enrollment": ("enrollment_view", EnrollmentView),
+    }
+
+    PREFETCH_DELAY_MS = 300  # idle delay before building the likely next view
+
+    def __init__(self, parent=None, prefetch=True):
         super().__init__(parent)
+        self.prefetch = prefetch
+        # Owned by the view, so a pending prefetch dies with it (e.g. on eviction)
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.timeout.connect(self.run_prefetch)
+        self.prefetch_name = None
         self.layout = QVBoxLayout(self)
 
         self.stack = QStackedWidget()
@@ -30,36 +54,6 @@ class CrudView(QWidget):
         self.setup_menu_page()
         self.stack.addWidget(self.menu_page)
 
-        self.dept_view = DepartmentView()
-        self.stack.addWidget(self.dept_view)
-
-        self.student_view = StudentView()
-        self.stack.addWidget(self.student_view)
-
-        self.room_view = RoomView()
-        self.stack.addWidget(self.room_view)
-
-        self.instructor_view = InstructorView()
-        self.stack.addWidget(self.instructor_view)
-
-        self.section_view = SectionView()
-        self.stack.addWidget(self.section_view)
-
-        self.group_view = GroupView()
-        self.stack.addWidget(self.group_view)
-
-        self.course_view = CourseView()
-        self.stack.addWidget(self.course_view)
-
-        self.semester_view = SemesterView()
-        self.stack.addWidget(self.semester_view)
-
-        self.activity_view = ActivityView()
-        self.stack.addWidget(self.activity_view)
-
-        self.enrollment_view = EnrollmentView()  # Added
-        self.stack.addWidget(self.enrollment_view)
-
         self.stack.setCurrentIndex(0)
 
     def setup_menu_page(self):
@@ -84,26 +78,44 @@ class CrudView(QWidget):
             btn.clicked.connect(lambda checked, n=name: self.open_crud(n))
             grid.addWidget(btn, row, col)
 
+    def get_view(self, table_name):
+        """Returns the view for a table, building and registering it on first use."""
+        entry = self.VIEW_REGISTRY.get(table_name)
+        if entry is None:
+            return None
+
+        attr_name, view_class = entry
+        view = getattr(self, attr_name, None)
+        if view is None:
+            view = view_class()
+            self.stack.addWidget(view)
+            setattr(self, attr_name, view)
+        return view
+
     def open_crud(self, table_name):
         print(f"Opening CRUD for {table_name}")
-        match table_name:
-            case "Department":
-                self.stack.setCurrentWidget(self.dept_view)
-            case "Student":
-                self.stack.setCurrentWidget(self.student_view)
-            case "Room":
-                self.stack.setCurrentWidget(self.room_view)
-            case "Instructor":
-                self.stack.setCurrentWidget(self.instructor_view)
-            case "Section":
-                self.stack.setCurrentWidget(self.section_view)
-            case "Group":
-                self.stack.setCurrentWidget(self.group_view)
-            case "Course":
-                self.stack.setCurrentWidget(self.course_view)
-            case "Semester":
-                self.stack.setCurrentWidget(self.semester_view)
-            case "Activity":
-                self.stack.setCurrentWidget(self.activity_view)
-            case "Enrollment":
-                self.stack.setCurrentWidget(self.enrollment_view)
+        view = self.get_view(table_name)
+        if view is None:
+            return
+        self.stack.setCurrentWidget(view)
+
+        if self.prefetch:
+            self.schedule_prefetch(table_name)
+
+    def schedule_prefetch(self, table_name):
+        """
+        Builds the next view in menu order once the event loop is idle, so it
+        is usually ready by the time it is clicked. Widgets must be created on
+        the GUI thread, hence a timer rather than a worker thread.
+        """
+        names = list(self.VIEW_REGISTRY)
+        next_name = names[(names.index(table_name) + 1) % len(names)]
+        attr_name = self.VIEW_REGISTRY[next_name][0]
+        if getattr(self, attr_name, None) is None:
+            self.prefetch_name = next_name
+            self.prefetch_timer.start(self.PREFETCH_DELAY_MS)
+
+    def run_prefetch(self):
+        if self.prefetch_name:
+            self.get_view(self.prefetch_name)
+            self.prefetch_name = None
@@ -19,12 +19,19 @@ from PyQt5.QtWidgets import (
 )
 
 from db import enrollment_crud_queries
+from ui.paged_loader import PagedLoader, reserve_table_rows
 
 
 class EnrollmentView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.initUI()
+        self.read_loader = PagedLoader(
+            self.read_table, lambda rows, first: self.populate_table(self.read_table, rows, first)
+        )
+        self.delete_loader = PagedLoader(
+            self.delete_table, lambda rows, first: self.populate_table(self.delete_table, rows, first)
+        )
 
     def initUI(self):
         main_layout = QVBoxLayout(self)
@@ -295,10 +302,10 @@ class EnrollmentView(QWidget):
 
     # ==================== HELPER FUNCTIONS ====================
 
-    def populate_table(self, table, results):
-        """Fill table with enrollment data"""
-        table.setRowCount(len(results))
-        for row_idx, enrollment in enumerate(results):
+    def populate_table(self, table, results, first_page=True):
+        """Fill table with enrollment data (first_page=False appends)"""
+        start = reserve_table_rows(table, results, first_page)
+        for row_idx, enrollment in enumerate(results, start):
             for col_idx in range(10):
                 value = (
                     str(enrollment[col_idx]) if enrollment[col_idx] is not None else ""
@@ -361,8 +368,7 @@ class EnrollmentView(QWidget):
 
     def show_delete_screen(self):
         """Refresh table and show DELETE screen"""
-        results = enrollment_crud_queries.EnrollmentCRUD.get_all_enrollments()
-        self.populate_table(self.delete_table, results)
+        self.delete_loader.start(enrollment_crud_queries.EnrollmentCRUD.get_enrollments_page)
         self.stack.setCurrentIndex(3)
 
     # ==================== CRUD OPERATIONS ====================
@@ -422,17 +428,15 @@ class EnrollmentView(QWidget):
             self.sort_combo.currentIndex(), ("enrollment_id", "ASC")
         )
 
-        # Get results
-        results = enrollment_crud_queries.EnrollmentCRUD.get_all_enrollments(
+        # Get results page by page as the table scrolls
+        self.read_loader.start(
+            enrollment_crud_queries.EnrollmentCRUD.get_enrollments_page,
             search_field=search_field if search_value else None,
             search_value=search_value if search_value else None,
             sort_by=sort_by,
             sort_order=sort_order,
         )
 
-        # Display
-        self.populate_table(self.read_table, results)
-
     def delete_enrollment(self):
         """Delete selected enrollment"""
         selected = self.delete_table.selectedIndexes()
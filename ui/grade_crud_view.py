@@ -2,6 +2,7 @@
 # Purpose: Complete CRUD operations for Grade management
 
 from db.grade_queries import GradeQueries
+from ui.paged_loader import PagedLoader, reserve_table_rows
 from PyQt5.QtCore import QDate, Qt
 from PyQt5.QtWidgets import (
     QComboBox,
@@ -39,7 +40,7 @@ class GradeCrudView(QWidget):
         self.stack = QStackedWidget()
         self.layout.addWidget(self.stack)
 
-        # Page setup (indexes: 0=menu, 1=create, 2=read, 3=update, 4=delete)
+        # Page setup (indexes: 0=menu, 1=create, 2=read, 3=update, 4=delete, 5=sheet)
         self.menu_page = self.setup_menu_page()
         self.stack.addWidget(self.menu_page)
 
@@ -55,6 +56,29 @@ class GradeCrudView(QWidget):
         self.delete_page = self.setup_delete_page()
         self.stack.addWidget(self.delete_page)
 
+        self.sheet_page = self.setup_sheet_page()
+        self.stack.addWidget(self.sheet_page)
+
+        # Grade tables are filled page by page as they scroll
+        self.read_loader = PagedLoader(
+            self.grades_table,
+            lambda grades, first: self.show_grade_page(
+                self.grades_table, grades, first, "No grades found matching your criteria."
+            ),
+        )
+        self.update_loader = PagedLoader(
+            self.update_table,
+            lambda grades, first: self.show_grade_page(
+                self.update_table, grades, first, "No grades found. Add some grades first."
+            ),
+        )
+        self.delete_loader = PagedLoader(
+            self.delete_table,
+            lambda grades, first: self.show_grade_page(
+                self.delete_table, grades, first, "No grades found in database.", "No Data"
+            ),
+        )
+
         # Start with menu
         self.stack.setCurrentIndex(0)
 
@@ -81,6 +105,7 @@ class GradeCrudView(QWidget):
             ("View Grades", 0, 1, "#3498db"),
             ("Update Grade", 1, 0, "#f39c12"),
             ("Delete Grade", 1, 1, "#e74c3c"),
+            ("Grade Sheet", 2, 0, "#8e44ad"),
         ]
 
         for name, row, col, color in actions:
@@ -127,6 +152,9 @@ class GradeCrudView(QWidget):
         elif action_name == "Delete Grade":
             self.load_grades_for_delete()
             self.stack.setCurrentIndex(4)
+        elif action_name == "Grade Sheet":
+            self.load_sheet_combos()
+            self.stack.setCurrentIndex(5)
 
     def setup_create_page(self):
         """
@@ -408,102 +436,51 @@ class GradeCrudView(QWidget):
         semester_id = self.filter_semester_combo.currentData()
         grade_type = self.filter_type_combo.currentText()
 
-        # Fetch grades from database
-        grades = GradeQueries.get_all_grades(search_term, semester_id, grade_type)
-
         # Setup table
-        self.grades_table.setRowCount(len(grades))
         self.grades_table.setColumnCount(7)
         self.grades_table.setHorizontalHeaderLabels([
             "ID", "Student", "Course", "Type", "Value", "Max", "Weighted Avg"
         ])
 
-        # Populate table
-        for row_idx, grade in enumerate(grades):
-            # grade tuple: (grade_id, student_name, course_name, grade_type, grade_value, max_points)
-            for col_idx, value in enumerate(grade):
-                item = QTableWidgetItem(str(value))
-                item.setTextAlignment(Qt.AlignCenter)
-                self.grades_table.setItem(row_idx, col_idx, item)
+        # Grades with their weighted averages, one page at a time
+        self.read_loader.start(
+            GradeQueries.get_grades_with_avg_page,
+            search_term=search_term, semester_id=semester_id, grade_type=grade_type,
+        )
 
-            # Calculate and add weighted average
-            grade_id = grade[0]
-            avg = self.calculate_weighted_avg(grade_id)
-            avg_item = QTableWidgetItem(f"{avg:.2f}")
-            avg_item.setTextAlignment(Qt.AlignCenter)
-            self.grades_table.setItem(row_idx, 6, avg_item)
+    def show_grade_page(self, table, grades, first_page, empty_message, empty_title="No Results"):
+        """
+        Shows one page of get_grades_with_avg_page rows in a grade table.
+        The first page replaces the table, later pages are appended.
+        """
+        start = reserve_table_rows(table, grades, first_page)
+        self.populate_grade_rows(table, grades, start)
 
         # Resize columns to content
-        self.grades_table.resizeColumnsToContents()
+        table.resizeColumnsToContents()
 
         # Show message if no results
-        if not grades:
-            QMessageBox.information(
-                self,
-                "No Results",
-                "No grades found matching your criteria."
-            )
-    def calculate_weighted_avg(self, grade_id):
-        """
-        Calculates weighted average for a student's course grades.
-        Uses predefined weights for different grade types.
+        if first_page and not grades:
+            QMessageBox.information(self, empty_title, empty_message)
 
+    def populate_grade_rows(self, table, grades, start=0):
+        """
+        Fills a grade table from get_all_grades_with_avg rows.
         Args:
-            grade_id: ID of the grade record
-
-        Returns:
-            float: Weighted average (0-20 scale)
+            table: QTableWidget with 7 columns
+            grades: (grade_id, student_name, course_name, grade_type, grade_value, max_points, weighted_avg)
+            start: First table row to fill
         """
-        # Get full grade info
-        full_grade = GradeQueries.get_grade_by_id(grade_id)
-        if not full_grade:
-            return 0.0
-
-        student_id, course_id, department_id = full_grade[0], full_grade[1], full_grade[2]
-
-        # Get all grades for this student/course combination
-        grades = GradeQueries.get_grades_for_avg(student_id, course_id, department_id)
-        if not grades:
-            return 0.0
-
-        # Define weights for each grade type
-        weights = {
-            "Quiz": 0.10,
-            "Assignment": 0.10,
-            "Homework": 0.05,
-            "Project": 0.10,
-            "Midterm": 0.30,
-            "Final": 0.40,
-            "Practical Test": 0.10,
-            "Oral Exam": 0.15,
-            "Resit": 0.40,
-        }
-
-        total_weighted = 0.0
-        total_weight = 0.0
-
-        # Calculate weighted sum
-        for grade_type, value, max_points in grades:
-            try:
-                # 1. Convert DB values to float to handle Decimals or Strings safely
-                val_float = float(value) if value is not None else 0.0
-                max_float = float(max_points) if max_points is not None else 0.0
-            except (ValueError, TypeError):
-                continue  # Skip invalid data rows
-
-            if max_float > 0:
-                # 2. Normalize to 20-point scale using float values
-                normalized = (val_float / max_float) * 20
-
-                # 3. Get weight (default 0.0 if type not found)
-                weight = weights.get(grade_type, 0.0)
+        for row_idx, grade in enumerate(grades, start):
+            for col_idx, value in enumerate(grade[:6]):
+                item = QTableWidgetItem(str(value))
+                item.setTextAlignment(Qt.AlignCenter)
+                table.setItem(row_idx, col_idx, item)
 
-                # 4. Perform calculation (now float * float, preventing TypeError)
-                total_weighted += normalized * weight
-                total_weight += weight
+            avg_item = QTableWidgetItem(f"{float(grade[6]):.2f}")
+            avg_item.setTextAlignment(Qt.AlignCenter)
+            table.setItem(row_idx, 6, avg_item)
 
-        # Return weighted average
-        return (total_weighted / total_weight) if total_weight > 0 else 0.0
     def setup_update_page(self):
         """
         Creates the page for updating existing grades.
@@ -641,31 +618,17 @@ class GradeCrudView(QWidget):
         semester_id = self.filter_semester_combo.currentData()
         grade_type = self.filter_type_combo.currentText()
 
-        # Fetch grades
-        grades = GradeQueries.get_all_grades(search_term, semester_id, grade_type)
-
         # Setup table
-        self.update_table.setRowCount(len(grades))
-        self.update_table.setColumnCount(6)
+        self.update_table.setColumnCount(7)
         self.update_table.setHorizontalHeaderLabels([
-            "ID", "Student", "Course", "Type", "Value", "Max Points"
+            "ID", "Student", "Course", "Type", "Value", "Max Points", "Weighted Avg"
         ])
 
-        # Populate table
-        for row_idx, grade in enumerate(grades):
-            for col_idx, value in enumerate(grade):
-                item = QTableWidgetItem(str(value))
-                item.setTextAlignment(Qt.AlignCenter)
-                self.update_table.setItem(row_idx, col_idx, item)
-
-        self.update_table.resizeColumnsToContents()
-
-        if not grades:
-            QMessageBox.information(
-                self,
-                "No Results",
-                "No grades found. Add some grades first."
-            )
+        # Fetch grades page by page
+        self.update_loader.start(
+            GradeQueries.get_grades_with_avg_page,
+            search_term=search_term, semester_id=semester_id, grade_type=grade_type,
+        )
 
     def pre_fill_update(self, item):
         """
@@ -818,27 +781,16 @@ class GradeCrudView(QWidget):
         """
         Loads grades into delete table.
         """
-        # Fetch all grades (no filters for delete)
-        grades = GradeQueries.get_all_grades("", None, "All")
-
         # Setup table
-        self.delete_table.setRowCount(len(grades))
-        self.delete_table.setColumnCount(6)
+        self.delete_table.setColumnCount(7)
         self.delete_table.setHorizontalHeaderLabels([
-            "ID", "Student", "Course", "Type", "Value", "Max Points"
+            "ID", "Student", "Course", "Type", "Value", "Max Points", "Weighted Avg"
         ])
 
-        # Populate table
-        for row_idx, grade in enumerate(grades):
-            for col_idx, value in enumerate(grade):
-                item = QTableWidgetItem(str(value))
-                item.setTextAlignment(Qt.AlignCenter)
-                self.delete_table.setItem(row_idx, col_idx, item)
-
-        self.delete_table.resizeColumnsToContents()
-
-        if not grades:
-            QMessageBox.information(self, "No Data", "No grades found in database.")
+        # Fetch all grades (no filters for delete), page by page
+        self.delete_loader.start(
+            GradeQueries.get_grades_with_avg_page, search_term="", semester_id=None, grade_type="All"
+        )
 
     def confirm_delete(self):
         """
@@ -881,6 +833,189 @@ class GradeCrudView(QWidget):
             else:
                 QMessageBox.critical(self, "Error", "Failed to delete grade.")
 
+    def setup_sheet_page(self):
+        """
+        Creates the grade sheet page: one grade type / exam for every
+        student enrolled in a course, saved in a single statement.
+        Returns:
+            QWidget: Grade sheet page
+        """
+        page = QWidget()
+        layout = QVBoxLayout(page)
+
+        # Title
+        title = QLabel("Grade Sheet")
+        title.setStyleSheet("font-size: 14px; font-weight: bold;")
+        layout.addWidget(title)
+
+        # Sheet header: what is being graded
+        form = QFormLayout()
+
+        self.sheet_course_combo = QComboBox()
+        form.addRow("Course *:", self.sheet_course_combo)
+
+        self.sheet_department_spin = QSpinBox()
+        self.sheet_department_spin.setMinimum(1)
+        self.sheet_department_spin.setMaximum(999)
+        form.addRow("Department ID *:", self.sheet_department_spin)
+
+        self.sheet_semester_combo = QComboBox()
+        form.addRow("Semester *:", self.sheet_semester_combo)
+
+        self.sheet_exam_combo = QComboBox()
+        form.addRow("Exam (optional):", self.sheet_exam_combo)
+
+        self.sheet_grade_type_combo = QComboBox()
+        self.sheet_grade_type_combo.addItems([
+            "Quiz", "Midterm", "Final", "Assignment",
+            "Project", "Practical Test", "Homework",
+            "Oral Exam", "Resit"
+        ])
+        form.addRow("Grade Type *:", self.sheet_grade_type_combo)
+
+        self.sheet_grade_date = QDateEdit()
+        self.sheet_grade_date.setDate(QDate.currentDate())
+        self.sheet_grade_date.setCalendarPopup(True)
+        form.addRow("Grade Date *:", self.sheet_grade_date)
+
+        self.sheet_max_points_spin = QSpinBox()
+        self.sheet_max_points_spin.setMinimum(1)
+        self.sheet_max_points_spin.setMaximum(999)
+        self.sheet_max_points_spin.setValue(20)
+        form.addRow("Max Points *:", self.sheet_max_points_spin)
+
+        layout.addLayout(form)
+
+        btn_load = QPushButton("Load Enrolled Students")
+        btn_load.setStyleSheet("background-color: #3498db; color: white; padding: 8px;")
+        btn_load.clicked.connect(self.load_sheet_students)
+        layout.addWidget(btn_load)
+
+        # One row per student; Grade and Comments are editable, empty grades are skipped
+        self.sheet_table = QTableWidget()
+        self.sheet_table.setColumnCount(4)
+        self.sheet_table.setHorizontalHeaderLabels(["Student ID", "Student", "Grade", "Comments"])
+        self.sheet_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.sheet_table)
+
+        # Buttons
+        btn_layout = QHBoxLayout()
+
+        btn_submit = QPushButton("✓ Save Grade Sheet")
+        btn_submit.setStyleSheet("background-color: #27ae60; color: white; padding: 8px;")
+        btn_submit.clicked.connect(self.submit_sheet)
+        btn_layout.addWidget(btn_submit)
+
+        btn_back = QPushButton("← Back")
+        btn_back.setStyleSheet("background-color: #95a5a6; color: white; padding: 8px;")
+        btn_back.clicked.connect(lambda: self.stack.setCurrentIndex(0))
+        btn_layout.addWidget(btn_back)
+
+        layout.addLayout(btn_layout)
+
+        return page
+
+    def load_sheet_combos(self):
+        """
+        Populates the grade sheet dropdowns.
+        """
+        self.sheet_course_combo.clear()
+        for course_id, name in GradeQueries.get_courses():
+            self.sheet_course_combo.addItem(name, course_id)
+
+        self.sheet_semester_combo.clear()
+        for semester_id, name in GradeQueries.get_semesters():
+            self.sheet_semester_combo.addItem(name, semester_id)
+
+        self.sheet_exam_combo.clear()
+        self.sheet_exam_combo.addItem("None", None)
+        for exam_id, name in GradeQueries.get_exams():
+            self.sheet_exam_combo.addItem(name, exam_id)
+
+    def load_sheet_students(self):
+        """
+        Fills the sheet with the students enrolled in the selected course and semester.
+        """
+        course_id = self.sheet_course_combo.currentData()
+        semester_id = self.sheet_semester_combo.currentData()
+        if not course_id or not semester_id:
+            QMessageBox.warning(self, "Validation Error", "Select a course and a semester first.")
+            return
+
+        students = GradeQueries.get_enrolled_students(
+            course_id, self.sheet_department_spin.value(), semester_id
+        )
+        self.sheet_table.setRowCount(len(students))
+        for row, (student_id, name) in enumerate(students):
+            id_item = QTableWidgetItem(str(student_id))
+            id_item.setFlags(id_item.flags() & ~Qt.ItemIsEditable)
+            name_item = QTableWidgetItem(name)
+            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
+            self.sheet_table.setItem(row, 0, id_item)
+            self.sheet_table.setItem(row, 1, name_item)
+            self.sheet_table.setItem(row, 2, QTableWidgetItem(""))
+            self.sheet_table.setItem(row, 3, QTableWidgetItem(""))
+
+        if not students:
+            QMessageBox.information(
+                self, "No Students", "No students are enrolled in this course for the semester."
+            )
+
+    def submit_sheet(self):
+        """
+        Saves every filled-in grade of the sheet in one statement.
+        """
+        entries = []
+        for row in range(self.sheet_table.rowCount()):
+            grade_text = self.sheet_table.item(row, 2).text().strip().replace(",", ".")
+            if not grade_text:
+                continue
+            student_id = int(self.sheet_table.item(row, 0).text())
+            try:
+                grade_value = float(grade_text)
+            except ValueError:
+                QMessageBox.warning(
+                    self,
+                    "Validation Error",
+                    f"Grade '{grade_text}' for {self.sheet_table.item(row, 1).text()} is not a number."
+                )
+                return
+            entries.append((student_id, grade_value, self.sheet_table.item(row, 3).text().strip()))
+
+        if not entries:
+            QMessageBox.warning(self, "Validation Error", "Enter at least one grade.")
+            return
+
+        result = GradeQueries.create_grade_sheet(
+            self.sheet_course_combo.currentData(),
+            self.sheet_department_spin.value(),
+            self.sheet_semester_combo.currentData(),
+            self.sheet_exam_combo.currentData(),
+            self.sheet_grade_type_combo.currentText(),
+            self.sheet_grade_date.date().toString("yyyy-MM-dd"),
+            self.sheet_max_points_spin.value(),
+            entries,
+        )
+        if result is None:
+            QMessageBox.critical(
+                self,
+                "Error",
+                "Failed to save the grade sheet. Check database connection and logs."
+            )
+            return
+
+        inserted, skipped = result
+        message = f"{inserted} grades saved."
+        if skipped:
+            details = "\n".join(f"Student {student_id}: {reason}" for student_id, reason in skipped[:20])
+            if len(skipped) > 20:
+                details += f"\n... and {len(skipped) - 20} more"
+            message += f"\n\n{len(skipped)} skipped:\n{details}"
+        QMessageBox.information(self, "Grade Sheet", message)
+        if inserted and not skipped:
+            self.sheet_table.setRowCount(0)
+            self.stack.setCurrentIndex(0)
+
     def go_back_to_academic_menu(self):
         """
         Returns to the Academic Records menu.
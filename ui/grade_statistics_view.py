@@ -10,13 +10,16 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QPushButton,
     QStackedWidget,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
+from db.dashboard_refresh import refresh_dashboards
 from db.results_queries import ResultsQueries
+from ui.query_worker import BusyIndicator, QueryRunner
+from ui.report_exporter import ReportExporter
+from ui.result_table_model import ResultTableModel
 
 
 class GradeStatisticsView(QWidget):
@@ -33,6 +36,14 @@ class GradeStatisticsView(QWidget):
         self.stack = QStackedWidget()
         self.layout.addWidget(self.stack)
 
+        # Report functions run in the background
+        self.runner = QueryRunner(self)
+        self.layout.addWidget(BusyIndicator(self.runner, "Loading report..."))
+
+        # Exports re-run the report function shown in each table
+        self.exporter = ReportExporter(self)
+        self.report_sources = {}  # report_type -> (function_name, params)
+
         # Menu page (index 0)
         self.menu_page = self.create_menu_page()
         self.stack.addWidget(self.menu_page)
@@ -142,6 +153,10 @@ class GradeStatisticsView(QWidget):
         stats_layout.addWidget(self.stat_pass_rate, 1, 2)
 
         layout.addLayout(stats_layout)
+
+        # Statistics come from the dashboard snapshot
+        self.overview_as_of, freshness_layout = self.create_freshness_bar(self.load_overview_report)
+        layout.addLayout(freshness_layout)
         layout.addStretch()
 
         # Back button
@@ -179,6 +194,51 @@ class GradeStatisticsView(QWidget):
 
         return card
 
+    def create_freshness_bar(self, reload):
+        """
+        "Data as of" label with a button that refreshes the dashboard
+        snapshot and then calls reload.
+        Returns:
+            (QLabel, QHBoxLayout)
+        """
+        bar = QHBoxLayout()
+        label = QLabel("Data as of: -")
+        label.setStyleSheet("color: #7f8c8d; font-size: 11px;")
+        bar.addWidget(label)
+        bar.addStretch()
+
+        btn_refresh = QPushButton("↻ Refresh Data")
+        btn_refresh.setStyleSheet("padding: 4px 10px;")
+        btn_refresh.clicked.connect(lambda: self.refresh_snapshot(reload))
+        bar.addWidget(btn_refresh)
+        return label, bar
+
+    def refresh_snapshot(self, reload):
+
+        self.runner.submit(
+            refresh_dashboards,
+            on_result=lambda refreshed: self.snapshot_refreshed(refreshed, reload),
+            on_error=self.show_load_error,
+        )
+
+    def snapshot_refreshed(self, refreshed, reload):
+
+        if not refreshed:
+            QMessageBox.information(
+                self,
+                "Refresh",
+                "The statistics are being refreshed by another workstation. Try again shortly.",
+            )
+            return
+        reload()
+
+    def show_as_of(self, label, as_of):
+
+        if as_of is None:
+            label.setText("Data as of: not computed yet")
+        else:
+            label.setText(f"Data as of: {as_of.astimezone().strftime('%Y-%m-%d %H:%M')}")
+
     def create_comparison_page(self):
 
         page = QWidget()
@@ -203,14 +263,18 @@ class GradeStatisticsView(QWidget):
         layout.addLayout(filter_layout)
 
         # Table
-        self.comparison_table = QTableWidget()
-        self.comparison_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.comparison_table = QTableView()
+        self.comparison_table.setModel(ResultTableModel(alignment=Qt.AlignCenter))
+        self.comparison_table.setSelectionBehavior(QTableView.SelectRows)
         self.comparison_table.horizontalHeader().setSectionResizeMode(
             QHeaderView.Stretch
         )
-        self.comparison_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.comparison_table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.comparison_table)
 
+        self.comparison_as_of, freshness_layout = self.create_freshness_bar(self.load_comparison_report)
+        layout.addLayout(freshness_layout)
+
         # Export button
         btn_export = QPushButton("📄 Export to CSV")
         btn_export.setStyleSheet(
@@ -251,12 +315,13 @@ class GradeStatisticsView(QWidget):
         layout.addLayout(filter_layout)
 
         # Table
-        self.distribution_table = QTableWidget()
-        self.distribution_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.distribution_table = QTableView()
+        self.distribution_table.setModel(ResultTableModel(alignment=Qt.AlignCenter))
+        self.distribution_table.setSelectionBehavior(QTableView.SelectRows)
         self.distribution_table.horizontalHeader().setSectionResizeMode(
             QHeaderView.Stretch
         )
-        self.distribution_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.distribution_table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.distribution_table)
 
         # Export button
@@ -314,33 +379,46 @@ class GradeStatisticsView(QWidget):
                 )
                 return
 
-            results, columns = ResultsQueries.execute_function(
-                "get_semester_overview", (semester_id,)
+            self.runner.submit(
+                ResultsQueries.execute_function,
+                "get_semester_overview_snapshot",
+                (semester_id,),
+                on_result=self.show_overview,
+                on_error=self.show_load_error,
             )
 
-            if results and len(results) > 0:
-                row = results[0]
-                # Update stat cards
-                self.stat_total.findChild(QLabel, "value").setText(str(row[0]))
-                self.stat_passed.findChild(QLabel, "value").setText(str(row[1]))
-                self.stat_failed.findChild(QLabel, "value").setText(str(row[2]))
-                self.stat_resit.findChild(QLabel, "value").setText(str(row[3]))
-                self.stat_avg.findChild(QLabel, "value").setText(
-                    f"{float(row[4]):.2f}" if row[4] else "0.00"
-                )
-
-                # Calculate pass rate
-                total = int(row[0]) if row[0] else 0
-                passed = int(row[1]) if row[1] else 0
-                pass_rate = (passed / total * 100) if total > 0 else 0
-                self.stat_pass_rate.findChild(QLabel, "value").setText(
-                    f"{pass_rate:.1f}%"
-                )
-
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load overview: {str(e)}")
             print(f" Error loading overview: {e}")
 
+    def show_overview(self, payload):
+
+        results, columns = payload
+
+        if results and len(results) > 0:
+            row = results[0]
+            # Update stat cards
+            self.stat_total.findChild(QLabel, "value").setText(str(row[0]))
+            self.stat_passed.findChild(QLabel, "value").setText(str(row[1]))
+            self.stat_failed.findChild(QLabel, "value").setText(str(row[2]))
+            self.stat_resit.findChild(QLabel, "value").setText(str(row[3]))
+            self.stat_avg.findChild(QLabel, "value").setText(
+                f"{float(row[4]):.2f}" if row[4] else "0.00"
+            )
+
+            # Calculate pass rate
+            total = int(row[0]) if row[0] else 0
+            passed = int(row[1]) if row[1] else 0
+            pass_rate = (passed / total * 100) if total > 0 else 0
+            self.stat_pass_rate.findChild(QLabel, "value").setText(
+                f"{pass_rate:.1f}%"
+            )
+            self.show_as_of(self.overview_as_of, row[5])
+
+    def show_load_error(self, message):
+
+        QMessageBox.critical(self, "Error", f"Failed to load report: {message}")
+
     def load_comparison_report(self):
 
         try:
@@ -351,16 +429,29 @@ class GradeStatisticsView(QWidget):
                 )
                 return
 
-            results, columns = ResultsQueries.execute_function(
-                "get_course_comparison", (semester_id,)
+            self.report_sources["comparison"] = ("get_course_comparison_snapshot", (semester_id,))
+            self.runner.submit(
+                ResultsQueries.execute_function,
+                "get_course_comparison_snapshot",
+                (semester_id,),
+                on_result=self.show_comparison,
+                on_error=self.show_load_error,
             )
 
-            self.populate_table(self.comparison_table, results, columns)
-
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load comparison: {str(e)}")
             print(f" Error loading comparison: {e}")
 
+    def show_comparison(self, payload):
+
+        results, columns = payload
+        # The last column is the snapshot time, shown under the table
+        if results:
+            self.show_as_of(self.comparison_as_of, results[0][-1])
+        self.populate_table(
+            self.comparison_table, [row[:-1] for row in results], columns[:-1]
+        )
+
     def load_distribution_report(self):
 
         try:
@@ -373,12 +464,17 @@ class GradeStatisticsView(QWidget):
 
             course_id, dept_id = course_data
 
-            results, columns = ResultsQueries.execute_function(
-                "get_grade_distribution", (course_id, dept_id)
+            self.report_sources["distribution"] = ("get_grade_distribution", (course_id, dept_id))
+            self.runner.submit(
+                ResultsQueries.execute_function,
+                "get_grade_distribution",
+                (course_id, dept_id),
+                on_result=lambda payload: self.populate_table(
+                    self.distribution_table, *payload
+                ),
+                on_error=self.show_load_error,
             )
 
-            self.populate_table(self.distribution_table, results, columns)
-
         except Exception as e:
             QMessageBox.critical(
                 self, "Error", f"Failed to load distribution: {str(e)}"
@@ -387,16 +483,7 @@ class GradeStatisticsView(QWidget):
 
     def populate_table(self, table, results, columns):
 
-        table.setRowCount(len(results))
-        table.setColumnCount(len(columns))
-        table.setHorizontalHeaderLabels(columns)
-
-        for row_idx, row in enumerate(results):
-            for col_idx, value in enumerate(row):
-                item = QTableWidgetItem(str(value) if value is not None else "")
-                item.setTextAlignment(Qt.AlignCenter)
-                table.setItem(row_idx, col_idx, item)
-
+        table.model().set_rows(results, columns)
         table.resizeColumnsToContents()
 
         if not results:
@@ -404,49 +491,22 @@ class GradeStatisticsView(QWidget):
 
     def export_report(self, report_type):
 
-        from PyQt5.QtWidgets import QFileDialog
-        import csv
-
         table = (
             self.comparison_table
             if report_type == "comparison"
             else self.distribution_table
         )
 
-        if table.rowCount() == 0:
+        if table.model().rowCount() == 0 or report_type not in self.report_sources:
             QMessageBox.warning(self, "No Data", "No data to export.")
             return
 
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Export Report", f"{report_type}_report.csv", "CSV Files (*.csv)"
-        )
-
-        if not file_path:
-            return
-
-        try:
-            with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.writer(csvfile)
-                headers = [
-                    table.horizontalHeaderItem(i).text()
-                    for i in range(table.columnCount())
-                ]
-                writer.writerow(headers)
-
-                for row in range(table.rowCount()):
-                    row_data = [
-                        table.item(row, col).text() if table.item(row, col) else ""
-                        for col in range(table.columnCount())
-                    ]
-                    writer.writerow(row_data)
-
-            QMessageBox.information(
-                self, "Export Successful", f"Report exported to:\n{file_path}"
-            )
-        except Exception as e:
-            QMessageBox.critical(self, "Export Failed", f"Failed to export: {str(e)}")
+        # Streams the full result to the file in the background
+        function_name, params = self.report_sources[report_type]
+        self.exporter.export(function_name, params, f"{report_type}_report")
 
     def go_back_to_results_menu(self):
 
+        self.runner.cancel_all()
         if self.results_parent:
            self.results_parent.show_menu()
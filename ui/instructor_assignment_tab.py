@@ -1,9 +1,10 @@
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
     QPushButton, QLabel, QComboBox, QHeaderView, QMessageBox, QGroupBox
 )
 from db import reservation_queries
+from ui.result_table_model import ResultTableModel, short_time
 
 
 class InstructorAssignmentTab(QWidget):
@@ -57,14 +58,17 @@ class InstructorAssignmentTab(QWidget):
         layout.addWidget(workload_group)
         
         # Assignments table
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "Date", "Start", "End", "Hours", "Course", "Activity", "Room"
-        ])
+        self.table = QTableView()
+        # Row format: date, start_time, end_time, course_name, activity_type, building, roomno, hours
+        self.model = ResultTableModel(
+            columns=["Date", "Start", "End", "Hours", "Course", "Activity", "Room"],
+            accessors=[0, 1, 2, 7, 3, 4, lambda row: f"{row[5]}{row[6]}"],
+            formatters={1: short_time, 2: short_time},
+        )
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.table)
     
     def load_instructors(self):
@@ -111,24 +115,4 @@ class InstructorAssignmentTab(QWidget):
             instructor_id, start_date, end_date
         )
         
-        self.table.setRowCount(0)
-        
-        for row_data in assignments:
-            row_num = self.table.rowCount()
-            self.table.insertRow(row_num)
-            
-            # Format data: date, start_time, end_time, course_name, activity_type, building, roomno, hours
-            display_data = [
-                str(row_data[0]),  # date
-                str(row_data[1])[:5],  # start time (HH:MM)
-                str(row_data[2])[:5],  # end time (HH:MM)
-                str(row_data[7]),  # hours
-                str(row_data[3]),  # course name
-                str(row_data[4]),  # activity type
-                f"{row_data[5]}{row_data[6]}"  # building + room
-            ]
-            
-            for col_num, data in enumerate(display_data):
-                item = QTableWidgetItem(data)
-                item.setFlags(item.flags() ^ Qt.ItemIsEditable)
-                self.table.setItem(row_num, col_num, item)
+        self.model.set_rows(assignments)
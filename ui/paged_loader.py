@@ -0,0 +1,143 @@
+# ui/paged_loader.py
+# Purpose: Fetch-on-scroll for the keyset-paginated listing queries.
+# The first page is shown right away; the next one is requested when the
+# table's vertical scroll bar nears the bottom (or while the rows shown do
+# not fill the view yet).
+#
+# Usage from a view:
+#     self.loader = PagedLoader(self.table, on_rows=self.add_rows, runner=self.runner)
+#     self.loader.start(ReservationQueries.get_reservations_page, sort_by="reserv_date")
+# where add_rows(rows, first_page) replaces (first_page) or extends the table.
+# A page that fails to load is reported (on_error) and not treated as the end
+# of the data: the next scroll, or retry(), requests it again.
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QMessageBox
+
+from db.pagination import DEFAULT_PAGE_SIZE
+
+# Rows from the bottom at which the next page is requested
+PREFETCH_ROWS = 20
+
+
+class PagedLoader(QObject):
+    def __init__(self, view, on_rows, runner=None, page_size=DEFAULT_PAGE_SIZE, parent=None,
+                 on_error=None):
+        """
+        Args:
+            view: QTableView / QTableWidget whose scrolling drives the paging
+            on_rows: callable(rows, first_page)
+            runner: Optional QueryRunner; pages are fetched on the GUI thread without one
+            page_size: Rows per page
+            on_error: Optional callable(message) for a failed page; a warning box by default
+        """
+        super().__init__(parent or view)
+        self.view = view
+        self.on_rows = on_rows
+        self.on_error = on_error or self.show_error
+        self.runner = runner
+        self.page_size = page_size
+        self.fetch_page = None
+        self.kwargs = {}
+        self.after = None
+        self.loading = False
+        self.exhausted = True
+        self.failed = False  # last page failed: wait for a scroll or retry()
+        self.generation = 0  # bumped on start(); late pages of an old listing are dropped
+        view.verticalScrollBar().valueChanged.connect(self.on_user_scrolled)
+        view.verticalScrollBar().rangeChanged.connect(lambda *_: self.on_scrolled())
+
+    def start(self, fetch_page, **kwargs):
+        """
+        Starts a new listing. fetch_page(**kwargs, page_size=, after=) must
+        return (rows, next_after) like the db get_*_page methods.
+        """
+        self.generation += 1
+        self.fetch_page = fetch_page
+        self.kwargs = kwargs
+        self.after = None
+        self.loading = False
+        self.exhausted = False
+        self.failed = False
+        if self.runner:
+            self.runner.cancel_all()
+        self.fetch_next()
+
+    def has_more(self):
+        return not self.exhausted
+
+    def retry(self):
+        """Requests the page that failed again."""
+        self.failed = False
+        self.fetch_next()
+
+    def fetch_next(self):
+        if self.loading or self.exhausted or self.fetch_page is None:
+            return
+        self.loading = True
+        first_page = self.after is None
+        generation = self.generation
+        kwargs = dict(self.kwargs, page_size=self.page_size, after=self.after)
+
+        if self.runner is None:
+            self.page_loaded(self.fetch_page(**kwargs), first_page, generation)
+            return
+        self.runner.submit(
+            self.fetch_page,
+            on_result=lambda page: self.page_loaded(page, first_page, generation),
+            on_error=lambda message: self.page_failed(generation, message),
+            on_cancelled=lambda: self.page_failed(generation),
+            **kwargs,
+        )
+
+    def page_loaded(self, page, first_page, generation):
+        if generation != self.generation:
+            return
+        if page is None:
+            self.page_failed(generation, "The page could not be loaded.")
+            return
+        rows, next_after = page
+        self.loading = False
+        self.after = next_after
+        self.exhausted = next_after is None
+        self.on_rows(rows, first_page)
+        # The new rows may still not fill the view: check once layout has settled
+        QTimer.singleShot(0, self.on_scrolled)
+
+    def page_failed(self, generation, message=None):
+        """Stops automatic paging; message is None for a cancelled page."""
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.failed = True
+        if message:
+            self.on_error(message)
+
+    def show_error(self, message):
+        QMessageBox.warning(
+            self.view,
+            "Loading Failed",
+            f"Could not load more rows: {message}\nScroll down or refresh to try again.",
+        )
+
+    def on_user_scrolled(self, *_):
+        self.failed = False
+        self.on_scrolled()
+
+    def on_scrolled(self, *_):
+        if self.loading or self.exhausted or self.failed or not self.view.isVisible():
+            return  # hidden tables (other stacked pages) resume once shown
+        bar = self.view.verticalScrollBar()
+        rows_left = (bar.maximum() - bar.value()) / max(1, bar.singleStep())
+        if bar.maximum() == 0 or rows_left <= PREFETCH_ROWS:
+            self.fetch_next()
+
+
+def reserve_table_rows(table, rows, first_page):
+    """
+    Sizes a QTableWidget for a page of rows and returns the index of the
+    first row to fill: 0 for a first page (replacing), else after the last.
+    """
+    start = 0 if first_page else table.rowCount()
+    table.setRowCount(start + len(rows))
+    return start
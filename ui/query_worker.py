@@ -0,0 +1,212 @@
+# ui/query_worker.py
+# Purpose: Run db query calls on a QThreadPool so Qt slots never block the GUI.
+# Results and errors are delivered back on the GUI thread through signals.
+#
+# Usage from a view:
+#     self.runner = QueryRunner(self)
+#     self.runner.submit(ResultsQueries.execute_function, "fn", params,
+#                        on_result=self.show_results)
+#
+# Generators (e.g. ResultsQueries.stream_function) go through submit_stream:
+# each yielded item is delivered to on_batch as soon as it is produced.
+
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import QHBoxLayout, QLabel, QProgressBar, QPushButton, QWidget
+
+from db import connection
+
+_thread_pool = None
+
+
+def query_thread_pool():
+    """
+    Shared thread pool. MainWindow keeps one pooled connection checked out
+    for its lifetime, so the workers get the rest of the pool; they can still
+    wait on a checkout while GUI-thread queries hold connections.
+    """
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = QThreadPool()
+        _thread_pool.setMaxThreadCount(max(1, connection.POOL_MAX_SIZE - 1))
+    return _thread_pool
+
+
+class QueryJobSignals(QObject):
+    # Created on the GUI thread, so connected slots run there (queued connection)
+    result = pyqtSignal(object)
+    batch = pyqtSignal(object)  # StreamJob only
+    progress = pyqtSignal(object)  # jobs submitted with on_progress
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+
+class QueryJob(QRunnable):
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = QueryJobSignals()
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._thread_ident = None
+        self.setAutoDelete(False)  # QueryRunner keeps the reference until finished
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        """
+        Marks the job cancelled. If it is already running, a cancel request is
+        sent on the connection(s) its worker thread has checked out.
+        """
+        with self._lock:
+            self._cancelled = True
+            # Under the lock: once run() clears _thread_ident the worker may
+            # pick up another job whose query must not be cancelled
+            if self._thread_ident is not None:
+                connection.cancel_thread_queries(self._thread_ident)
+
+    def execute(self):
+        return self.fn(*self.args, **self.kwargs)
+
+    def run(self):
+        with self._lock:
+            if self._cancelled:
+                self.signals.cancelled.emit()
+                self.signals.finished.emit()
+                return
+            self._thread_ident = threading.get_ident()
+
+        try:
+            result = self.execute()
+        except Exception as e:
+            if self._cancelled:
+                self.signals.cancelled.emit()
+            else:
+                print(f"❌ Error in background query {getattr(self.fn, '__name__', self.fn)}: {e}")
+                self.signals.error.emit(str(e))
+        else:
+            if self._cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.result.emit(result)
+        finally:
+            with self._lock:
+                self._thread_ident = None
+            self.signals.finished.emit()
+
+
+class StreamJob(QueryJob):
+    """
+    Runs a generator function and emits every yielded item through the
+    batch signal. The result is the number of items. Cancelling stops at the
+    next item and closes the generator, so its cleanup (cursor, connection)
+    runs on the worker thread.
+    """
+
+    def execute(self):
+        generator = self.fn(*self.args, **self.kwargs)
+        count = 0
+        try:
+            for item in generator:
+                if self._cancelled:
+                    break
+                self.signals.batch.emit(item)
+                count += 1
+        finally:
+            generator.close()
+        return count
+
+
+class QueryRunner(QObject):
+    """
+    Per-view front end for background queries. Tracks the view's jobs so it
+    can report busy state and cancel everything when the view goes away.
+    """
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._jobs = set()
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_cancelled=None,
+               on_progress=None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) on the pool. With on_progress, fn also gets a
+        progress=callable keyword; whatever it is called with on the worker
+        thread is passed to on_progress on the GUI thread.
+        """
+        job = QueryJob(fn, *args, **kwargs)
+        if on_progress:
+            job.signals.progress.connect(on_progress)
+            job.kwargs["progress"] = job.signals.progress.emit
+        return self._start(job, on_result, on_error, on_cancelled)
+
+    def submit_stream(self, fn, *args, on_batch=None, on_result=None, on_error=None,
+                      on_cancelled=None, **kwargs):
+        """Like submit() for a generator function; on_batch gets each yielded item."""
+        job = StreamJob(fn, *args, **kwargs)
+        if on_batch:
+            job.signals.batch.connect(on_batch)
+        return self._start(job, on_result, on_error, on_cancelled)
+
+    def _start(self, job, on_result, on_error, on_cancelled):
+        if on_result:
+            job.signals.result.connect(on_result)
+        if on_error:
+            job.signals.error.connect(on_error)
+        if on_cancelled:
+            job.signals.cancelled.connect(on_cancelled)
+        job.signals.finished.connect(lambda j=job: self._job_finished(j))
+
+        was_busy = self.is_busy()
+        self._jobs.add(job)
+        if not was_busy:
+            self.busy_changed.emit(True)
+
+        query_thread_pool().start(job)
+        return job
+
+    def is_busy(self):
+        return bool(self._jobs)
+
+    def cancel_all(self):
+        for job in list(self._jobs):
+            job.cancel()
+
+    def _job_finished(self, job):
+        self._jobs.discard(job)
+        if not self._jobs:
+            self.busy_changed.emit(False)
+
+
+class BusyIndicator(QWidget):
+    """Indeterminate progress bar with a Cancel button, shown while a runner is busy."""
+
+    def __init__(self, runner, text="Loading...", parent=None):
+        super().__init__(parent)
+        self.runner = runner
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.label = QLabel(text)
+        layout.addWidget(self.label)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)  # Busy mode
+        self.progress.setTextVisible(False)
+        self.progress.setMaximumHeight(12)
+        layout.addWidget(self.progress)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.runner.cancel_all)
+        layout.addWidget(self.cancel_button)
+
+        self.runner.busy_changed.connect(self.setVisible)
+        self.setVisible(False)
@@ -8,13 +8,17 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QSpinBox,
     QStackedWidget,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from db import results_queries  # Import the database query class
+from ui.query_worker import BusyIndicator, QueryRunner
+from ui.result_table_model import ResultTableModel
+
+# Rows kept in the results table; larger results stop streaming there
+MAX_DISPLAY_ROWS = 100000
 
 
 class Report_analytics(QWidget):
@@ -24,6 +28,9 @@ class Report_analytics(QWidget):
 
         super().__init__(parent)
         self.current_query = None  # Tracks which query is active (a-j)
+        self.stream_generation = 0  # Batches of an abandoned query are ignored
+        self.streamed_rows = 0
+        self.runner = QueryRunner(self)  # Runs report functions off the GUI thread
         self.initUI()
 
     def initUI(self):
@@ -149,35 +156,53 @@ class Report_analytics(QWidget):
         btn_run.setStyleSheet("background-color: #27ae60; color: white; padding: 10px;")
         btn_run.clicked.connect(self.run_query)
         layout.addWidget(btn_run)
+        self.btn_run = btn_run
+
+        # Shown while a report function is running
+        layout.addWidget(BusyIndicator(self.runner, "Running query..."))
+        self.runner.busy_changed.connect(lambda busy: self.btn_run.setEnabled(not busy))
 
         # Results table
-        self.result_table = QTableWidget()
+        self.result_table = QTableView()
+        self.result_model = ResultTableModel()
+        self.result_table.setModel(self.result_model)
         # Auto-resize columns to fit content
         self.result_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         # Allow selecting entire rows
-        self.result_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.result_table.setSelectionBehavior(QTableView.SelectRows)
         layout.addWidget(self.result_table)
 
+        # Rows received so far while a report streams in
+        self.row_count_label = QLabel("")
+        layout.addWidget(self.row_count_label)
+
         # Back button
         btn_back = QPushButton("Back to Menu")
         btn_back.setStyleSheet(
             "background-color: #34495e; color: white; padding: 10px;"
         )
-        btn_back.clicked.connect(lambda: self.stack.setCurrentIndex(0))
+        btn_back.clicked.connect(self.back_to_menu)
         layout.addWidget(btn_back)
 
         return screen
 
+    def back_to_menu(self):
+        # Leaving the results screen abandons any query still running
+        self.runner.cancel_all()
+        self.stack.setCurrentIndex(0)
+
     def show_result(self, query_name):
 
+        # A result still running for the previous query is no longer wanted
+        self.runner.cancel_all()
+
         # Extract query identifier (first letter: a-j)
         self.current_query = query_name.lower()[0]
         self.result_title.setText(query_name)
 
         # CLEAR PREVIOUS TABLE DATA - This was missing!
-        self.result_table.setRowCount(0)  # Remove all rows
-        self.result_table.setColumnCount(0)  # Remove all columns
-        self.result_table.clear()  # Clear any remaining data
+        self.result_model.clear()
+        self.row_count_label.setText("")
 
         # Clear parameter form safely
         while self.param_form.count():
@@ -286,13 +311,49 @@ class Report_analytics(QWidget):
             params.append(self.course_id_input.value())
             params.append(self.department_id_input.value())
 
-        # Execute query and get results
-        results, columns = results_queries.ResultsQueries.execute_function(
-            function_name, tuple(params)
+        # Stream the result in the background: rows come in batches from a
+        # server-side cursor and are appended on the GUI thread as they arrive
+        self.runner.cancel_all()
+        self.stream_generation += 1
+        generation = self.stream_generation
+        self.streamed_rows = 0
+        self.row_count_label.setText("")
+        self.runner.submit_stream(
+            results_queries.ResultsQueries.stream_function,
+            function_name,
+            tuple(params),
+            on_batch=lambda batch: self.show_query_batch(batch, generation),
+            on_result=lambda _: self.show_query_results(generation),
+            on_error=lambda message: QMessageBox.critical(self, "Error", message),
         )
 
+    def show_query_batch(self, batch, generation):
+        if generation != self.stream_generation:
+            return  # from a query that was re-run or abandoned
+        rows, columns = batch
+        rows = rows[:MAX_DISPLAY_ROWS - self.streamed_rows]
+
+        # Populate table with results (None is shown as an empty cell)
+        if self.streamed_rows == 0:
+            self.result_model.set_rows(rows, columns)
+        else:
+            self.result_model.append_rows(rows)
+        self.streamed_rows += len(rows)
+        self.row_count_label.setText(f"{self.streamed_rows} rows loaded...")
+
+        if self.streamed_rows >= MAX_DISPLAY_ROWS:
+            # Enough to browse; stop reading the rest on the server
+            self.runner.cancel_all()
+            self.stream_generation += 1
+            self.row_count_label.setText(f"Showing the first {self.streamed_rows} rows")
+
+    def show_query_results(self, generation):
+        if generation != self.stream_generation:
+            return
+
         # Handle empty results
-        if not results:
+        if not self.streamed_rows:
+            self.row_count_label.setText("")
             QMessageBox.information(
                 self,
                 "No Results",
@@ -300,18 +361,7 @@ class Report_analytics(QWidget):
             )
             return
 
-        # Populate table with results
-        self.result_table.setColumnCount(len(columns))
-        self.result_table.setRowCount(len(results))
-        self.result_table.setHorizontalHeaderLabels(columns)
-
-        for row_idx, row in enumerate(results):
-            for col_idx, value in enumerate(row):
-                # Convert None to empty string for display
-                display_value = str(value) if value is not None else ""
-                self.result_table.setItem(
-                    row_idx, col_idx, QTableWidgetItem(display_value)
-                )
+        self.row_count_label.setText(f"{self.streamed_rows} rows")
 
         # Reset all input fields to 0 for better UX
         self.course_id_input.setValue(0)
@@ -0,0 +1,81 @@
+# ui/report_exporter.py
+# Purpose: Export dialog shared by the report views.
+# The view says which report function (and parameters) its table came from;
+# the export re-runs that function on the server and streams the full result
+# to the chosen file in the background (db/report_export.py), independent of
+# how many rows the table has rendered.
+
+from PyQt5.QtCore import QObject, Qt
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+
+from db.report_export import PARQUET_AVAILABLE, export_report
+from ui.query_worker import QueryRunner
+
+
+class ReportExporter(QObject):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent_widget = parent
+        self.runner = QueryRunner(self)
+        self.progress_dialog = None
+
+    def export(self, function_name, params, default_name, search=None):
+        """
+        Asks for a file and exports function_name(*params) to it.
+
+        Args:
+            default_name: Suggested file name without extension
+            search: Optional (column_names, term) row filter, as shown in the view
+        """
+        if self.runner.is_busy():
+            QMessageBox.warning(self.parent_widget, "Export Running", "An export is already running.")
+            return
+
+        filters = "CSV Files (*.csv)"
+        if PARQUET_AVAILABLE:
+            filters += ";;Parquet Files (*.parquet)"
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self.parent_widget, "Export Report", f"{default_name}.csv", filters
+        )
+        if not file_path:
+            return
+        if "parquet" in selected_filter.lower() and not file_path.lower().endswith(".parquet"):
+            file_path = file_path.rsplit(".", 1)[0] + ".parquet"
+
+        self.progress_dialog = QProgressDialog("Exporting report...", "Cancel", 0, 0, self.parent_widget)
+        self.progress_dialog.setWindowTitle("Export")
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.setMinimumDuration(500)  # quick exports never show it
+        self.progress_dialog.canceled.connect(self.runner.cancel_all)
+
+        self.runner.submit(
+            export_report,
+            file_path,
+            function_name,
+            tuple(params),
+            search,
+            on_progress=self.show_progress,
+            on_result=lambda rows: self.finished(file_path, rows),
+            on_error=self.failed,
+            on_cancelled=self.close_progress,
+        )
+
+    def show_progress(self, rows):
+        if self.progress_dialog:
+            self.progress_dialog.setLabelText(f"Exporting report... {rows} rows written")
+
+    def close_progress(self):
+        if self.progress_dialog:
+            self.progress_dialog.reset()
+            self.progress_dialog.deleteLater()
+            self.progress_dialog = None
+
+    def finished(self, file_path, rows):
+        self.close_progress()
+        QMessageBox.information(
+            self.parent_widget, "Export Successful", f"{rows} rows exported to:\n{file_path}"
+        )
+
+    def failed(self, message):
+        self.close_progress()
+        QMessageBox.critical(self.parent_widget, "Export Failed", f"Failed to export report:\n{message}")
@@ -1,12 +1,16 @@
 from PyQt5.QtCore import Qt, QDate, QTime
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
     QPushButton, QLabel, QLineEdit, QComboBox, QFormLayout, QDialog,
     QDialogButtonBox, QMessageBox, QHeaderView, QDateEdit, QTimeEdit,
     QSpinBox, QGroupBox
 )
 from datetime import datetime, timedelta
 from db import reservation_queries
+from db.reservation_index import reservation_index
+from ui.paged_loader import PagedLoader
+from ui.query_worker import BusyIndicator, QueryRunner
+from ui.result_table_model import ResultTableModel
 
 
 class ReservationCRUDTab(QWidget):
@@ -14,6 +18,7 @@ class ReservationCRUDTab(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.runner = QueryRunner(self)
         self.initUI()
         self.load_reservations()
     
@@ -59,16 +64,19 @@ class ReservationCRUDTab(QWidget):
         layout.addLayout(filter_layout)
         
         # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(11)
-        self.table.setHorizontalHeaderLabels([
+        self.table = QTableView()
+        # Rows keep all 14 fetched fields; only the first 11 are shown
+        self.model = ResultTableModel(columns=[
             "ID", "Date", "Start", "End", "Hours", "Course", "Department",
             "Activity", "Instructor", "Building", "Room"
         ])
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(self.table)
+        layout.addWidget(BusyIndicator(self.runner, "Loading reservations..."))
+        self.loader = PagedLoader(self.table, self.show_page, runner=self.runner)
         
         # Action buttons
         btn_layout = QHBoxLayout()
@@ -106,20 +114,17 @@ class ReservationCRUDTab(QWidget):
         sort_by = sort_map.get(self.sort_combo.currentText(), "reserv_date")
         sort_order = self.sort_order_combo.currentText()
         
-        reservations = reservation_queries.ReservationQueries.get_all_reservations(
-            sort_by=sort_by, sort_order=sort_order
+        self.loader.start(
+            reservation_queries.ReservationQueries.get_reservations_page,
+            sort_by=sort_by,
+            sort_order=sort_order,
         )
-        
-        self.table.setRowCount(0)
-        
-        for row_data in reservations:
-            row_num = self.table.rowCount()
-            self.table.insertRow(row_num)
-            
-            for col_num, data in enumerate(row_data[:11]):
-                item = QTableWidgetItem(str(data) if data is not None else "")
-                item.setFlags(item.flags() ^ Qt.ItemIsEditable)
-                self.table.setItem(row_num, col_num, item)
+
+    def show_page(self, rows, first_page):
+        if first_page:
+            self.model.set_rows(rows)
+        else:
+            self.model.append_rows(rows)
     
     def on_search(self):
         """Search reservations"""
@@ -150,23 +155,13 @@ class ReservationCRUDTab(QWidget):
         sort_by = sort_map.get(self.sort_combo.currentText(), "reserv_date")
         sort_order = self.sort_order_combo.currentText()
         
-        reservations = reservation_queries.ReservationQueries.get_all_reservations(
+        self.loader.start(
+            reservation_queries.ReservationQueries.get_reservations_page,
             search_field=search_field,
             search_value=search_value,
             sort_by=sort_by,
-            sort_order=sort_order
+            sort_order=sort_order,
         )
-        
-        self.table.setRowCount(0)
-        
-        for row_data in reservations:
-            row_num = self.table.rowCount()
-            self.table.insertRow(row_num)
-            
-            for col_num, data in enumerate(row_data[:11]):
-                item = QTableWidgetItem(str(data) if data is not None else "")
-                item.setFlags(item.flags() ^ Qt.ItemIsEditable)
-                self.table.setItem(row_num, col_num, item)
     
     def create_reservation(self):
         """Open dialog to create new reservation"""
@@ -182,7 +177,7 @@ class ReservationCRUDTab(QWidget):
             QMessageBox.warning(self, "No Selection", "Please select a reservation to update.")
             return
         
-        reservation_id = int(self.table.item(selected_rows[0].row(), 0).text())
+        reservation_id = self.model.row_data(selected_rows[0].row())[0]
         
         dialog = ReservationDialog(self, reservation_id=reservation_id)
         if dialog.exec_() == QDialog.Accepted:
@@ -196,7 +191,7 @@ class ReservationCRUDTab(QWidget):
             QMessageBox.warning(self, "No Selection", "Please select a reservation to delete.")
             return
         
-        reservation_id = int(self.table.item(selected_rows[0].row(), 0).text())
+        reservation_id = self.model.row_data(selected_rows[0].row())[0]
         
         reply = QMessageBox.question(
             self, "Confirm Delete",
@@ -296,11 +291,21 @@ class ReservationDialog(QDialog):
         form.addRow("Hours:", self.hours_label)
         
         layout.addLayout(form)
-        
-        # Check conflicts button
+
+        # Recurrence (new reservations only)
+        if not self.is_update:
+            layout.addWidget(self.create_repeat_group())
+
+        # Conflict helpers (answered from the in-memory reservation index)
+        check_layout = QHBoxLayout()
         check_btn = QPushButton("Check Conflicts")
         check_btn.clicked.connect(self.check_conflicts)
-        layout.addWidget(check_btn)
+        check_layout.addWidget(check_btn)
+
+        next_slot_btn = QPushButton("Find Next Free Slot")
+        next_slot_btn.clicked.connect(self.find_next_free_slot)
+        check_layout.addWidget(next_slot_btn)
+        layout.addLayout(check_layout)
         
         # Dialog buttons
         btn_box = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
@@ -308,6 +313,68 @@ class ReservationDialog(QDialog):
         btn_box.rejected.connect(self.reject)
         layout.addWidget(btn_box)
     
+    def create_repeat_group(self):
+        """Weekly / bi-weekly series over a semester or custom date range"""
+        group = QGroupBox("Repeat")
+        repeat_form = QFormLayout(group)
+
+        self.repeat_combo = QComboBox()
+        self.repeat_combo.addItems(["Does not repeat", "Weekly", "Every 2 weeks"])
+        self.repeat_combo.currentIndexChanged.connect(self.on_repeat_changed)
+        repeat_form.addRow("Repeat:", self.repeat_combo)
+
+        self.semester_combo = QComboBox()
+        self.semester_combo.addItem("Custom range")
+        self.semester_data = {}
+        for semester_id, name, start_date, end_date in reservation_queries.ReservationQueries.get_all_semesters():
+            self.semester_combo.addItem(name)
+            self.semester_data[name] = (start_date, end_date)
+        self.semester_combo.currentTextChanged.connect(self.on_semester_changed)
+        repeat_form.addRow("Semester:", self.semester_combo)
+
+        self.until_edit = QDateEdit()
+        self.until_edit.setCalendarPopup(True)
+        self.until_edit.setDate(QDate.currentDate().addDays(7 * 15))
+        repeat_form.addRow("Until:", self.until_edit)
+
+        self.exceptions_input = QLineEdit()
+        self.exceptions_input.setPlaceholderText("Skip dates, e.g. 2025-11-01, 2025-12-20")
+        repeat_form.addRow("Except:", self.exceptions_input)
+
+        self.on_repeat_changed()
+        return group
+
+    def on_repeat_changed(self):
+        repeating = self.repeat_combo.currentIndex() > 0
+        for widget in (self.semester_combo, self.until_edit, self.exceptions_input):
+            widget.setEnabled(repeating)
+
+    def on_semester_changed(self, name):
+        """Spans the series over the selected semester, keeping the chosen weekday"""
+        if name not in self.semester_data:
+            return
+        start_date, end_date = self.semester_data[name]
+        weekday = self.date_edit.date().toPyDate().weekday()
+        first = start_date + timedelta(days=(weekday - start_date.weekday()) % 7)
+        self.date_edit.setDate(QDate(first.year, first.month, first.day))
+        self.until_edit.setDate(QDate(end_date.year, end_date.month, end_date.day))
+
+    def is_series(self):
+        return not self.is_update and self.repeat_combo.currentIndex() > 0
+
+    def series_dates(self):
+        """Occurrence dates of the series; raises ValueError on a malformed exception date"""
+        exceptions = [
+            datetime.strptime(text.strip(), "%Y-%m-%d").date()
+            for text in self.exceptions_input.text().split(",") if text.strip()
+        ]
+        return reservation_queries.series_dates(
+            self.date_edit.date().toPyDate(),
+            self.until_edit.date().toPyDate(),
+            interval_weeks=self.repeat_combo.currentIndex(),
+            exceptions=exceptions,
+        )
+
     def on_course_changed(self):
         """Update activity types when course changes"""
         course_text = self.course_combo.currentText()
@@ -343,14 +410,16 @@ class ReservationDialog(QDialog):
         end = self.end_time_edit.time().toString("HH:mm:ss")
         
         exclude_id = self.reservation_id if self.is_update else None
-        
-        # Check room conflict
-        room_conflicts = reservation_queries.ReservationQueries.check_room_conflict(
+
+        if self.is_series():
+            self.check_series_conflicts(building, roomno, instructor_id, start, end)
+            return
+
+        # Answered from memory; the exclusion constraints re-check on save
+        room_conflicts = reservation_index.room_conflicts(
             building, roomno, date, start, end, exclude_id
         )
-        
-        # Check instructor conflict
-        instructor_conflicts = reservation_queries.ReservationQueries.check_instructor_conflict(
+        instructor_conflicts = reservation_index.instructor_conflicts(
             instructor_id, date, start, end, exclude_id
         )
         
@@ -371,6 +440,67 @@ class ReservationDialog(QDialog):
         else:
             QMessageBox.information(self, "No Conflicts", "✅ No scheduling conflicts found!")
     
+    def check_series_conflicts(self, building, roomno, instructor_id, start, end):
+        """Checks every occurrence of the series with one query"""
+        try:
+            dates = self.series_dates()
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Date", "Exception dates must be written as yyyy-MM-dd.")
+            return
+        if not dates:
+            QMessageBox.warning(self, "Empty Series", "The selected range contains no occurrences.")
+            return
+
+        conflicts = reservation_queries.ReservationQueries.check_series_conflicts(
+            building, roomno, instructor_id, dates, start, end
+        )
+        if conflicts is None:
+            QMessageBox.critical(self, "Error", "Could not check the series for conflicts.")
+            return
+        if not conflicts:
+            QMessageBox.information(
+                self, "No Conflicts", f"✅ All {len(dates)} occurrences are free!"
+            )
+            return
+
+        messages = [f"❌ {len({row[0] for row in conflicts})} of {len(dates)} occurrences clash:"]
+        for day, conflict_type, _, c_start, c_end, course_name, c_building, c_roomno in conflicts:
+            messages.append(
+                f"  - {day} {conflict_type}: {course_name} in {c_building}{c_roomno} "
+                f"from {c_start} to {c_end}"
+            )
+        QMessageBox.warning(self, "Conflicts Found", "\n".join(messages))
+
+    def find_next_free_slot(self):
+        """Moves date/time to the next slot where both room and instructor are free"""
+        building, roomno = self.room_data[self.room_combo.currentText()]
+        instructor_id = self.instructor_data[self.instructor_combo.currentText()]
+
+        start = self.start_time_edit.time()
+        duration = start.secsTo(self.end_time_edit.time()) // 60
+        if duration <= 0:
+            QMessageBox.warning(self, "Invalid Time", "End time must be after start time!")
+            return
+
+        try:
+            slot = reservation_index.next_available(
+                self.date_edit.date().toString("yyyy-MM-dd"), duration,
+                building=building, room_no=roomno, instructor_id=instructor_id,
+                earliest=start.toString("HH:mm:ss"),
+                exclude_id=self.reservation_id if self.is_update else None,
+            )
+        except RuntimeError as e:
+            QMessageBox.critical(self, "Error", f"Could not look for a free slot: {e}")
+            return
+        if slot is None:
+            QMessageBox.information(self, "No Free Slot", "No free slot found in the next weeks.")
+            return
+
+        day, slot_start, slot_end = slot
+        self.date_edit.setDate(QDate(day.year, day.month, day.day))
+        self.start_time_edit.setTime(QTime(slot_start.hour, slot_start.minute))
+        self.end_time_edit.setTime(QTime(slot_end.hour, slot_end.minute))
+
     def load_reservation_data(self):
         """Load existing reservation data for update"""
         data = reservation_queries.ReservationQueries.get_reservation_by_id(self.reservation_id)
@@ -432,6 +562,22 @@ class ReservationDialog(QDialog):
                     activity_type, instructor_id, date, start, end, hours
                 )
                 QMessageBox.information(self, "Success", "Reservation updated successfully!")
+            elif self.is_series():
+                try:
+                    dates = self.series_dates()
+                except ValueError:
+                    QMessageBox.warning(self, "Invalid Date", "Exception dates must be written as yyyy-MM-dd.")
+                    return
+                if not dates:
+                    QMessageBox.warning(self, "Empty Series", "The selected range contains no occurrences.")
+                    return
+                new_ids = reservation_queries.ReservationQueries.create_reservation_series(
+                    building, roomno, course_id, dept_id, activity_type,
+                    instructor_id, dates, start, end, hours
+                )
+                QMessageBox.information(
+                    self, "Success", f"{len(new_ids)} reservations created successfully!"
+                )
             else:
                 reservation_queries.ReservationQueries.create_reservation(
                     building, roomno, course_id, dept_id, activity_type,
@@ -3,6 +3,7 @@ from ui.reservation_crud_tab import ReservationCRUDTab
 from ui.instructor_assignment_tab import InstructorAssignmentTab
 from ui.availability_checker_tab import AvailabilityCheckerTab
 from ui.schedule_viewer_tab import ScheduleViewerTab
+from ui.timetable_generator_tab import TimetableGeneratorTab
 
 
 class ReservationView(QWidget):
@@ -23,10 +24,12 @@ class ReservationView(QWidget):
         self.assignment_tab = InstructorAssignmentTab()
         self.availability_tab = AvailabilityCheckerTab()
         self.schedule_tab = ScheduleViewerTab()
+        self.timetable_tab = TimetableGeneratorTab()
         
         self.tabs.addTab(self.crud_tab, "Reservations")
         self.tabs.addTab(self.assignment_tab, "Instructor Assignments")
         self.tabs.addTab(self.availability_tab, "Room Availability")
         self.tabs.addTab(self.schedule_tab, "Schedules")
+        self.tabs.addTab(self.timetable_tab, "Timetable Generator")
         
         layout.addWidget(self.tabs)
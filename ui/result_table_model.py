@@ -0,0 +1,118 @@
+# ui/result_table_model.py
+# Purpose: Read-only table model over raw fetched row tuples.
+# Cells are formatted lazily in data(), so a QTableView only pays for the
+# cells it actually paints instead of one QTableWidgetItem per cell.
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+def default_format(value):
+    return str(value) if value is not None else ""
+
+
+def short_time(value):
+    """HH:MM:SS -> HH:MM"""
+    return str(value)[:5] if value is not None else ""
+
+
+class ResultTableModel(QAbstractTableModel):
+    def __init__(self, rows=None, columns=None, accessors=None, formatters=None,
+                 alignment=None, parent=None):
+        """
+        Args:
+            rows: List of row tuples as returned by cursor.fetchall()
+            columns: Header labels
+            accessors: Optional per-column source, either a tuple index or a
+                       callable(row) -> value. Defaults to column i -> row[i].
+            formatters: Optional {column: callable(value) -> str}
+            alignment: Optional Qt alignment applied to every cell
+        """
+        super().__init__(parent)
+        self._rows = []
+        self._columns = []
+        self._accessors = []
+        self._formatters = {}
+        self._alignment = alignment
+        self.set_rows(rows or [], columns or [], accessors, formatters)
+
+    # ---------- data loading ----------
+
+    def set_rows(self, rows, columns=None, accessors=None, formatters=None):
+        """Replaces the whole result set. Keeps the current columns if none are given."""
+        self.beginResetModel()
+        self._rows = rows if isinstance(rows, list) else list(rows)
+        if columns is not None:
+            self._columns = list(columns)
+            self._accessors = list(accessors) if accessors else list(range(len(self._columns)))
+            self._formatters = dict(formatters or {})
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """Appends a batch of rows (used by incremental loaders)."""
+        rows = list(rows)
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def clear(self):
+        self.set_rows([], [])
+
+    # ---------- raw access ----------
+
+    def headers(self):
+        return list(self._columns)
+
+    def row_data(self, row):
+        """Raw tuple behind a view row (e.g. to read hidden IDs)."""
+        return self._rows[row]
+
+    def rows(self):
+        return self._rows
+
+    def value(self, row, column):
+        accessor = self._accessors[column]
+        source = self._rows[row]
+        if callable(accessor):
+            return accessor(source)
+        return source[accessor] if accessor < len(source) else None
+
+    def display_text(self, row, column):
+        formatter = self._formatters.get(column, default_format)
+        return formatter(self.value(row, column))
+
+    def display_rows(self):
+        """Yields every row as a list of display strings (for exports)."""
+        for row in range(len(self._rows)):
+            yield [self.display_text(row, col) for col in range(len(self._columns))]
+
+    # ---------- QAbstractTableModel ----------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.display_text(index.row(), index.column())
+        if role == Qt.TextAlignmentRole and self._alignment is not None:
+            return int(self._alignment)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._columns[section] if section < len(self._columns) else None
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
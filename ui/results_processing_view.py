@@ -57,6 +57,7 @@ class ResultsProcessingView(QWidget):
             (" Course\nAnalysis", 0, 1, "#e67e22"),
             (" Grade\nStatistics", 1, 0, "#9b59b6"),
             (" Admin\nActions", 1, 1, "#27ae60"),
+            (" Semester\nDashboard", 2, 0, "#16a085"),
         ]
 
         for name, row, col, color in categories:
@@ -117,6 +118,8 @@ class ResultsProcessingView(QWidget):
             self.show_grade_statistics()
         elif "Admin" in category_name:
             self.show_admin_actions()
+        elif "Dashboard" in category_name:
+            self.show_semester_dashboard()
 
     def show_student_status_reports(self):
 
@@ -150,6 +153,14 @@ class ResultsProcessingView(QWidget):
         self.stack.addWidget(admin_view)
         self.stack.setCurrentWidget(admin_view)
 
+    def show_semester_dashboard(self):
+
+        from ui.semester_dashboard_view import SemesterDashboardView
+
+        dashboard_view = SemesterDashboardView(parent=self)
+        self.stack.addWidget(dashboard_view)
+        self.stack.setCurrentWidget(dashboard_view)
+
     def go_back_to_main(self):
 
         main_window = self.window()
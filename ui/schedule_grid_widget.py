@@ -0,0 +1,169 @@
+from PyQt5.QtCore import QRectF, QSize, Qt
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen
+from PyQt5.QtWidgets import QToolTip, QWidget
+
+from ui.theme_manager import ThemeManager
+
+ACTIVITY_COLORS = {
+    "Lecture": ThemeManager.COLORS['primary'],
+    "Tutorial": ThemeManager.COLORS['success'],
+    "Practical": ThemeManager.COLORS['warning'],
+}
+
+
+class ScheduleGridWidget(QWidget):
+    """
+    Painted calendar grid: one row per room/instructor, one column per day.
+    Reservations are bars positioned by time of day and stacked in the lanes
+    precomputed by ScheduleLayout. Only the exposed rows/columns are painted,
+    so large ranges stay cheap; put the widget in a QScrollArea.
+    """
+
+    LABEL_WIDTH = 140
+    HEADER_HEIGHT = 28
+    LANE_HEIGHT = 18
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout_data = None
+        self.describe = lambda row: ""  # tooltip text for a source row
+        self.label_of = lambda row: ""  # text drawn inside a bar
+        self.category_of = lambda row: None  # key into ACTIVITY_COLORS
+        self.day_width = 120
+        self.row_heights = []
+        self.row_tops = []
+        self.setMouseTracking(True)
+
+    def set_layout(self, layout_data, describe=None, label_of=None, category_of=None):
+        self.layout_data = layout_data
+        if describe:
+            self.describe = describe
+        if label_of:
+            self.label_of = label_of
+        if category_of:
+            self.category_of = category_of
+        days = len(layout_data.days) if layout_data else 0
+        # Week ranges get wide cells; months shrink to keep the grid readable
+        self.day_width = 160 if days <= 7 else 60
+
+        self.row_heights = []
+        self.row_tops = []
+        top = self.HEADER_HEIGHT
+        for lanes in (layout_data.row_lanes if layout_data else []):
+            height = lanes * self.LANE_HEIGHT + 6
+            self.row_tops.append(top)
+            self.row_heights.append(height)
+            top += height
+
+        self.updateGeometry()
+        self.resize(self.sizeHint())
+        self.update()
+
+    def sizeHint(self):
+        if not self.layout_data:
+            return QSize(400, 200)
+        width = self.LABEL_WIDTH + self.day_width * len(self.layout_data.days)
+        height = (self.row_tops[-1] + self.row_heights[-1]) if self.row_tops else self.HEADER_HEIGHT
+        return QSize(width, height)
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    # ---------- geometry ----------
+
+    def row_at(self, y):
+        for row, top in enumerate(self.row_tops):
+            if top <= y < top + self.row_heights[row]:
+                return row
+        return None
+
+    def minute_x(self, minute):
+        data = self.layout_data
+        span = max(1, data.day_end - data.day_start)
+        return (minute - data.day_start) / span * (self.day_width - 4) + 2
+
+    # ---------- painting ----------
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        colors = ThemeManager.COLORS
+        painter.fillRect(event.rect(), QColor(colors['bg_dark']))
+        data = self.layout_data
+        if not data or not data.row_keys:
+            painter.setPen(QColor(colors['text_secondary']))
+            painter.drawText(self.rect(), Qt.AlignCenter, "No schedule loaded")
+            return
+
+        exposed = event.rect()
+        first_day = max(0, (exposed.left() - self.LABEL_WIDTH) // self.day_width)
+        last_day = min(len(data.days) - 1, (exposed.right() - self.LABEL_WIDTH) // self.day_width)
+        grid_pen = QPen(QColor(colors['border']))
+        text_pen = QPen(QColor(colors['text']))
+        small = QFont(self.font())
+        small.setPointSize(7)
+
+        # Day headers
+        painter.setPen(text_pen)
+        for day in range(first_day, last_day + 1):
+            x = self.LABEL_WIDTH + day * self.day_width
+            fmt = "%a %d/%m" if self.day_width > 100 else "%d/%m"
+            painter.drawText(QRectF(x, 0, self.day_width, self.HEADER_HEIGHT),
+                             Qt.AlignCenter, data.days[day].strftime(fmt))
+
+        for row, top in enumerate(self.row_tops):
+            height = self.row_heights[row]
+            if top > exposed.bottom() or top + height < exposed.top():
+                continue
+
+            painter.setPen(text_pen)
+            painter.drawText(QRectF(4, top, self.LABEL_WIDTH - 8, height),
+                             Qt.AlignVCenter | Qt.AlignLeft, data.row_labels[row])
+            painter.setPen(grid_pen)
+            painter.drawLine(0, top, self.width(), top)
+
+            for day in range(first_day, last_day + 1):
+                x = self.LABEL_WIDTH + day * self.day_width
+                painter.setPen(grid_pen)
+                painter.drawLine(x, top, x, top + height)
+                for item in data.events_in(row, day):
+                    lane_height = (height - 6) / item.lanes
+                    rect = QRectF(
+                        x + self.minute_x(item.start),
+                        top + 3 + item.lane * lane_height,
+                        max(2.0, self.minute_x(item.end) - self.minute_x(item.start)),
+                        lane_height - 1,
+                    )
+                    color = QColor(ACTIVITY_COLORS.get(self.category_of(item.data), colors['accent']))
+                    painter.fillRect(rect, color)
+                    if item.conflict:
+                        painter.setPen(QPen(QColor(colors['danger']), 2))
+                        painter.drawRect(rect)
+                    if rect.width() > 30:
+                        painter.setPen(text_pen)
+                        painter.setFont(small)
+                        painter.drawText(rect.adjusted(2, 0, -2, 0),
+                                         Qt.AlignVCenter | Qt.AlignLeft, self.label_of(item.data))
+                        painter.setFont(self.font())
+
+    # ---------- tooltips ----------
+
+    def mouseMoveEvent(self, event):
+        data = self.layout_data
+        if not data:
+            return
+        pos = event.pos()
+        row = self.row_at(pos.y())
+        day = (pos.x() - self.LABEL_WIDTH) // self.day_width
+        if row is None or pos.x() < self.LABEL_WIDTH or not 0 <= day < len(data.days):
+            QToolTip.hideText()
+            return
+
+        x_in_cell = pos.x() - self.LABEL_WIDTH - day * self.day_width
+        span = max(1, data.day_end - data.day_start)
+        minute = data.day_start + (x_in_cell - 2) / max(1, self.day_width - 4) * span
+        lane_fraction = (pos.y() - self.row_tops[row] - 3) / max(1, self.row_heights[row] - 6)
+        item = data.event_at(row, day, minute, min(max(lane_fraction, 0), 0.999))
+        if item:
+            QToolTip.showText(event.globalPos(), self.describe(item.data), self)
+        else:
+            QToolTip.hideText()
@@ -0,0 +1,113 @@
+# ui/schedule_layout.py
+# Purpose: Geometry-free layout of reservations for the schedule grid.
+# Rows are resources (rooms or instructors), columns are days. Inside each
+# (row, day) cell overlapping reservations are spread over lanes, computed
+# once when the data arrives so painting only has to scale numbers.
+
+import heapq
+from datetime import timedelta
+
+from db.reservation_index import to_minutes
+
+
+class LaidOutEvent:
+    """One reservation placed in the grid"""
+
+    __slots__ = ("row", "day", "start", "end", "lane", "lanes", "conflict", "data")
+
+    def __init__(self, row, day, start, end, data):
+        self.row = row
+        self.day = day
+        self.start = start  # minutes since midnight
+        self.end = end
+        self.lane = 0
+        self.lanes = 1  # lanes used by the overlap cluster it belongs to
+        self.conflict = False
+        self.data = data  # source row
+
+
+class ScheduleLayout:
+    def __init__(self, row_keys, row_labels, start_date, end_date, rows, key_of,
+                 day_start=8 * 60, day_end=18 * 60):
+        """
+        Args:
+            row_keys: Resource keys in display order
+            row_labels: Label per row
+            start_date, end_date: Inclusive date range (columns)
+            rows: Reservation rows; row[1] is the date, row[2]/row[3] start/end times
+            key_of: callable(row) -> resource key
+            day_start, day_end: Visible part of a day in minutes; grows to fit
+                                reservations outside it
+        """
+        self.row_keys = list(row_keys)
+        self.row_labels = list(row_labels)
+        self.start_date = start_date
+        self.days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        self.day_start = day_start
+        self.day_end = day_end
+        self.cells = {}  # (row, day) -> [LaidOutEvent] sorted by start
+        self.conflicts = 0
+
+        row_index = {key: i for i, key in enumerate(self.row_keys)}
+        for data in rows:
+            row = row_index.get(key_of(data))
+            day = (data[1] - start_date).days
+            if row is None or not 0 <= day < len(self.days):
+                continue
+            event = LaidOutEvent(row, day, to_minutes(data[2]), to_minutes(data[3]), data)
+            self.cells.setdefault((row, day), []).append(event)
+            self.day_start = min(self.day_start, int(event.start // 60) * 60)
+            self.day_end = max(self.day_end, int(-(-event.end // 60)) * 60)
+
+        for events in self.cells.values():
+            self.assign_lanes(events)
+
+        self.row_lanes = [1] * len(self.row_keys)  # lanes needed by the busiest day
+        for (row, _), events in self.cells.items():
+            self.row_lanes[row] = max(self.row_lanes[row], max(e.lanes for e in events))
+
+    def assign_lanes(self, events):
+        """Interval partitioning: each event takes the lowest lane free at its start."""
+        events.sort(key=lambda e: (e.start, e.end))
+        cluster = []
+        cluster_end = None
+        running = []  # heap of (end, lane) of events still running
+        free = []  # heap of lane numbers released inside the cluster
+        on_lane = {}  # lane -> event currently on it
+
+        for event in events:
+            if cluster and event.start >= cluster_end:
+                self.close_cluster(cluster)
+                cluster, running, free, on_lane = [], [], [], {}
+            while running and running[0][0] <= event.start:
+                heapq.heappush(free, heapq.heappop(running)[1])
+            event.lane = heapq.heappop(free) if free else len(running) + len(free)
+            if running:
+                # Overlaps every reservation still running
+                event.conflict = True
+                for _, lane in running:
+                    on_lane[lane].conflict = True
+            heapq.heappush(running, (event.end, event.lane))
+            on_lane[event.lane] = event
+            cluster.append(event)
+            cluster_end = event.end if cluster_end is None else max(cluster_end, event.end)
+        if cluster:
+            self.close_cluster(cluster)
+
+    def close_cluster(self, cluster):
+        lanes = max(event.lane for event in cluster) + 1
+        for event in cluster:
+            event.lanes = lanes
+            if event.conflict:
+                self.conflicts += 1
+
+    def events_in(self, row, day):
+        return self.cells.get((row, day), ())
+
+    def event_at(self, row, day, minute, lane_fraction):
+        """Event under a point of a cell (lane_fraction: 0..1 from the top)."""
+        for event in self.events_in(row, day):
+            if event.start <= minute < event.end:
+                if int(lane_fraction * event.lanes) == event.lane:
+                    return event
+        return None
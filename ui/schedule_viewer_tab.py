@@ -1,11 +1,36 @@
 from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
     QPushButton, QLabel, QComboBox, QDateEdit, QHeaderView, QGroupBox,
-    QFormLayout, QRadioButton, QButtonGroup
+    QFormLayout, QRadioButton, QButtonGroup, QListWidget, QAbstractItemView,
+    QStackedWidget, QScrollArea
 )
 from datetime import datetime, timedelta
 from db import reservation_queries
+from ui.query_worker import BusyIndicator, QueryRunner
+from ui.result_table_model import ResultTableModel, short_time
+from ui.schedule_grid_widget import ScheduleGridWidget
+from ui.schedule_layout import ScheduleLayout
+
+
+def load_schedule_grid(start_date, end_date, row_keys, row_labels, by_room):
+    """Runs on a worker thread: one range fetch, then lanes/overlaps are laid out"""
+    if by_room:
+        rows = reservation_queries.ReservationQueries.get_schedule_grid(
+            start_date, end_date, rooms=row_keys
+        )
+        key_of = lambda row: (row[4], row[5])
+    else:
+        rows = reservation_queries.ReservationQueries.get_schedule_grid(
+            start_date, end_date, instructor_ids=row_keys
+        )
+        key_of = lambda row: row[6]
+    return ScheduleLayout(
+        row_keys, row_labels,
+        datetime.strptime(start_date, "%Y-%m-%d").date(),
+        datetime.strptime(end_date, "%Y-%m-%d").date(),
+        rows, key_of,
+    )
 
 
 class ScheduleViewerTab(QWidget):
@@ -13,6 +38,7 @@ class ScheduleViewerTab(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.runner = QueryRunner(self)
         self.initUI()
     
     def initUI(self):
@@ -44,6 +70,18 @@ class ScheduleViewerTab(QWidget):
         view_type_layout.addWidget(self.room_radio)
         view_type_layout.addStretch()
         
+        # Display mode: flat list of one schedule, or a calendar grid of many
+        self.display_group = QButtonGroup()
+        self.list_radio = QRadioButton("List")
+        self.list_radio.setChecked(True)
+        self.grid_radio = QRadioButton("Calendar Grid")
+        self.grid_radio.toggled.connect(self.on_view_type_changed)
+        self.display_group.addButton(self.list_radio)
+        self.display_group.addButton(self.grid_radio)
+        view_type_layout.addWidget(QLabel("Display:"))
+        view_type_layout.addWidget(self.list_radio)
+        view_type_layout.addWidget(self.grid_radio)
+
         view_type_group.setLayout(view_type_layout)
         layout.addWidget(view_type_group)
         
@@ -72,6 +110,15 @@ class ScheduleViewerTab(QWidget):
         self.room_combo.setEnabled(False)
         criteria_layout.addRow("Room:", self.room_combo)
 
+        # Grid mode: several rooms / instructors at once (none selected = all)
+        self.grid_selection = QListWidget()
+        self.grid_selection.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.grid_selection.setMaximumHeight(100)
+        self.grid_selection_label = QLabel("Compare:")
+        criteria_layout.addRow(self.grid_selection_label, self.grid_selection)
+        self.grid_selection.setVisible(False)
+        self.grid_selection_label.setVisible(False)
+
         
         # Date range
         self.start_date_edit = QDateEdit()
@@ -110,22 +157,47 @@ class ScheduleViewerTab(QWidget):
         view_btn = QPushButton("View Schedule")
         view_btn.clicked.connect(self.view_schedule)
         layout.addWidget(view_btn)
+        layout.addWidget(BusyIndicator(self.runner, "Loading schedule..."))
         
         # Schedule table
-        self.table = QTableWidget()
+        self.table = QTableView()
+        self.model = ResultTableModel()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        layout.addWidget(self.table)
-    
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+
+        # Schedule grid
+        self.grid = ScheduleGridWidget()
+        self.grid_scroll = QScrollArea()
+        self.grid_scroll.setWidget(self.grid)
+        self.grid_summary = QLabel()
+
+        grid_page = QWidget()
+        grid_layout = QVBoxLayout(grid_page)
+        grid_layout.setContentsMargins(0, 0, 0, 0)
+        grid_layout.addWidget(self.grid_summary)
+        grid_layout.addWidget(self.grid_scroll)
+
+        self.results_stack = QStackedWidget()
+        self.results_stack.addWidget(self.table)
+        self.results_stack.addWidget(grid_page)
+        layout.addWidget(self.results_stack)
+
     def on_view_type_changed(self):
-        """Toggle between instructor and room view"""
-        if self.instructor_radio.isChecked():
-            self.instructor_combo.setEnabled(True)
-            self.room_combo.setEnabled(False)
-        else:
-            self.instructor_combo.setEnabled(False)
-            self.room_combo.setEnabled(True)
+        """Toggle between instructor and room view, list and grid display"""
+        grid = self.grid_radio.isChecked()
+        by_instructor = self.instructor_radio.isChecked()
+        self.instructor_combo.setEnabled(by_instructor and not grid)
+        self.room_combo.setEnabled(not by_instructor and not grid)
+        self.grid_selection.setVisible(grid)
+        self.grid_selection_label.setVisible(grid)
+        self.results_stack.setCurrentIndex(1 if grid else 0)
+
+        if grid:
+            names = self.instructor_data if by_instructor else self.room_data
+            self.grid_selection.clear()
+            self.grid_selection.addItems(list(names))
     
     def set_today(self):
         """Set date range to today"""
@@ -161,10 +233,48 @@ class ScheduleViewerTab(QWidget):
         start_date = self.start_date_edit.date().toString("yyyy-MM-dd")
         end_date = self.end_date_edit.date().toString("yyyy-MM-dd")
         
-        if self.instructor_radio.isChecked():
+        if self.grid_radio.isChecked():
+            self.view_schedule_grid(start_date, end_date)
+        elif self.instructor_radio.isChecked():
             self.view_instructor_schedule(start_date, end_date)
         else:
             self.view_room_schedule(start_date, end_date)
+
+    def view_schedule_grid(self, start_date, end_date):
+        """Calendar grid of the selected (or all) rooms / instructors"""
+        if self.start_date_edit.date() > self.end_date_edit.date():
+            return
+        by_room = self.room_radio.isChecked()
+        names = self.room_data if by_room else self.instructor_data
+        labels = [item.text() for item in self.grid_selection.selectedItems()] or list(names)
+        keys = [names[label] for label in labels]
+        if by_room:
+            # Short labels: building + room number
+            labels = [f"{building}{roomno}" for building, roomno in keys]
+
+        self.runner.cancel_all()
+        self.runner.submit(
+            load_schedule_grid,
+            start_date, end_date, keys, labels, by_room,
+            on_result=self.show_schedule_grid,
+        )
+
+    def show_schedule_grid(self, layout_data):
+        by_room = self.room_radio.isChecked()
+        self.grid.set_layout(
+            layout_data,
+            describe=lambda row: (
+                f"{row[8]} ({row[9]})\n{row[1]} {short_time(row[2])}-{short_time(row[3])}\n"
+                f"Room {row[4]}{row[5]} - {row[7]}"
+            ),
+            label_of=(lambda row: row[8]) if by_room else (lambda row: f"{row[4]}{row[5]} {row[8]}"),
+            category_of=lambda row: row[9],
+        )
+        events = sum(len(events) for events in layout_data.cells.values())
+        summary = f"{events} reservations, {len(layout_data.row_keys)} rows, {len(layout_data.days)} days"
+        if layout_data.conflicts:
+            summary += f" - ⚠️ {layout_data.conflicts} overlapping (outlined in red)"
+        self.grid_summary.setText(summary)
     
     def view_instructor_schedule(self, start_date, end_date):
         """View instructor schedule"""
@@ -174,37 +284,19 @@ class ScheduleViewerTab(QWidget):
         
         instructor_id = self.instructor_data.get(instructor_name)
         
-        schedule = reservation_queries.ReservationQueries.get_instructor_schedule(
-            instructor_id, start_date, end_date
-        )
-        
         # Configure table for instructor view
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "Date", "Start", "End", "Hours", "Course", "Activity", "Room"
-        ])
-        
-        self.table.setRowCount(0)
-        
-        for row_data in schedule:
-            row_num = self.table.rowCount()
-            self.table.insertRow(row_num)
-            
-            # Format: date, start_time, end_time, course_name, activity_type, building, roomno, hours
-            display_data = [
-                str(row_data[0]),  # date
-                str(row_data[1])[:5],  # start time
-                str(row_data[2])[:5],  # end time
-                str(row_data[7]),  # hours
-                str(row_data[3]),  # course name
-                str(row_data[4]),  # activity type
-                f"{row_data[5]}{row_data[6]}"  # room
-            ]
-            
-            for col_num, data in enumerate(display_data):
-                item = QTableWidgetItem(data)
-                item.setFlags(item.flags() ^ Qt.ItemIsEditable)
-                self.table.setItem(row_num, col_num, item)
+        # Row format: date, start_time, end_time, course_name, activity_type, building, roomno, hours
+        self.runner.cancel_all()
+        self.runner.submit(
+            reservation_queries.ReservationQueries.get_instructor_schedule,
+            instructor_id, start_date, end_date,
+            on_result=lambda schedule: self.model.set_rows(
+                schedule,
+                ["Date", "Start", "End", "Hours", "Course", "Activity", "Room"],
+                accessors=[0, 1, 2, 7, 3, 4, lambda row: f"{row[5]}{row[6]}"],
+                formatters={1: short_time, 2: short_time},
+            ),
+        )
     
     def view_room_schedule(self, start_date, end_date):
         """View room schedule"""
@@ -214,34 +306,16 @@ class ScheduleViewerTab(QWidget):
         
         building, roomno = self.room_data.get(room_text)
         
-        schedule = reservation_queries.ReservationQueries.get_room_schedule(
-            building, roomno, start_date, end_date
-        )
-        
         # Configure table for room view
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "Date", "Start", "End", "Hours", "Course", "Activity", "Instructor"
-        ])
-        
-        self.table.setRowCount(0)
-        
-        for row_data in schedule:
-            row_num = self.table.rowCount()
-            self.table.insertRow(row_num)
-            
-            # Format: date, start_time, end_time, course_name, activity_type, instructor_name, hours
-            display_data = [
-                str(row_data[0]),  # date
-                str(row_data[1])[:5],  # start time
-                str(row_data[2])[:5],  # end time
-                str(row_data[6]),  # hours
-                str(row_data[3]),  # course name
-                str(row_data[4]),  # activity type
-                str(row_data[5])  # instructor name
-            ]
-            
-            for col_num, data in enumerate(display_data):
-                item = QTableWidgetItem(data)
-                item.setFlags(item.flags() ^ Qt.ItemIsEditable)
-                self.table.setItem(row_num, col_num, item)
+        # Row format: date, start_time, end_time, course_name, activity_type, instructor_name, hours
+        self.runner.cancel_all()
+        self.runner.submit(
+            reservation_queries.ReservationQueries.get_room_schedule,
+            building, roomno, start_date, end_date,
+            on_result=lambda schedule: self.model.set_rows(
+                schedule,
+                ["Date", "Start", "End", "Hours", "Course", "Activity", "Instructor"],
+                accessors=[0, 1, 2, 6, 3, 4, 5],
+                formatters={1: short_time, 2: short_time},
+            ),
+        )
@@ -0,0 +1,201 @@
+# ui/semester_dashboard_view.py
+# Purpose: Semester dashboard - the overview, comparison, distribution,
+# failing, resit and excluded reports on one page.
+# All reports are submitted at once; the shared query thread pool runs them
+# concurrently, each on its own pooled connection, and every panel fills in
+# as soon as its own report finishes. Opening the dashboard therefore takes
+# as long as the slowest report, not the sum of all of them.
+
+import time
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QComboBox,
+    QGridLayout,
+    QGroupBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from db.results_queries import ResultsQueries
+from ui.query_worker import BusyIndicator, QueryRunner
+from ui.result_table_model import ResultTableModel
+
+# (key, panel title, report function, parameter scope)
+# Scope "semester" takes (semester_id,), "course" takes (course_id, department_id).
+# Snapshot functions end with a data_as_of column, shown in the panel status.
+DASHBOARD_REPORTS = [
+    ("overview", "Semester Overview", "get_semester_overview_snapshot", "semester"),
+    ("comparison", "Course Comparison", "get_course_comparison_snapshot", "semester"),
+    ("distribution", "Grade Distribution", "get_grade_distribution", "course"),
+    ("failing", "Failing Students", "get_students_failing_module", "course"),
+    ("resit", "Resit Eligible", "get_students_resit_eligible", "course"),
+    ("excluded", "Excluded Students", "get_students_excluded_from_module", "course"),
+]
+
+PANEL_COLUMNS = 2
+
+
+class SemesterDashboardView(QWidget):
+    def __init__(self, parent=None):
+
+        super().__init__(parent)
+        # The stack re-parents this widget; keep the results view for "Back"
+        self.results_parent = parent
+        self.generation = 0  # bumped per load; results of an older load are dropped
+        self.panels = {}  # key -> (status QLabel, QTableView)
+
+        layout = QVBoxLayout(self)
+
+        # Title
+        title = QLabel("Semester Dashboard")
+        title.setStyleSheet("font-size: 16px; font-weight: bold; color: #2c3e50;")
+        title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title)
+
+        # Filter section
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Semester:"))
+        self.semester_combo = QComboBox()
+        filter_layout.addWidget(self.semester_combo)
+        filter_layout.addWidget(QLabel("Course:"))
+        self.course_combo = QComboBox()
+        filter_layout.addWidget(self.course_combo, 1)
+
+        btn_load = QPushButton("🔍 Load Dashboard")
+        btn_load.setStyleSheet("background-color: #3498db; color: white; padding: 5px;")
+        btn_load.clicked.connect(self.load_dashboard)
+        filter_layout.addWidget(btn_load)
+        layout.addLayout(filter_layout)
+
+        self.runner = QueryRunner(self)
+        layout.addWidget(BusyIndicator(self.runner, "Loading reports..."))
+
+        # Report panels
+        grid = QGridLayout()
+        for i, (key, panel_title, _, _) in enumerate(DASHBOARD_REPORTS):
+            grid.addWidget(
+                self.create_panel(key, panel_title), i // PANEL_COLUMNS, i % PANEL_COLUMNS
+            )
+        layout.addLayout(grid, 1)
+
+        # Back button
+        btn_back = QPushButton("← Back to Results Menu")
+        btn_back.setStyleSheet(
+            """
+            background-color: #34495e;
+            color: white;
+            padding: 10px;
+            border-radius: 5px;
+        """
+        )
+        btn_back.clicked.connect(self.go_back_to_results_menu)
+        layout.addWidget(btn_back)
+
+        self.load_filters()
+
+    def create_panel(self, key, panel_title):
+
+        box = QGroupBox(panel_title)
+        box_layout = QVBoxLayout(box)
+
+        status = QLabel("-")
+        status.setStyleSheet("color: #7f8c8d; font-size: 11px;")
+        box_layout.addWidget(status)
+
+        table = QTableView()
+        table.setModel(ResultTableModel(alignment=Qt.AlignCenter))
+        table.setSelectionBehavior(QTableView.SelectRows)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.setEditTriggers(QTableView.NoEditTriggers)
+        box_layout.addWidget(table)
+
+        self.panels[key] = (status, table)
+        return box
+
+    def load_filters(self):
+
+        self.semester_combo.clear()
+        self.semester_combo.addItem("-- Select Semester --", None)
+        for semester_id, name in ResultsQueries.get_semesters():
+            self.semester_combo.addItem(name, semester_id)
+
+        self.course_combo.clear()
+        self.course_combo.addItem("-- Select Course --", None)
+        for course_id, dept_id, name in ResultsQueries.get_courses():
+            self.course_combo.addItem(f"{name} (Dept {dept_id})", (course_id, dept_id))
+
+    def load_dashboard(self):
+
+        semester_id = self.semester_combo.currentData()
+        course_data = self.course_combo.currentData()
+        if not semester_id and not course_data:
+            QMessageBox.warning(
+                self, "Selection Required", "Please select a semester and/or a course."
+            )
+            return
+
+        # Drop whatever an earlier load is still running
+        self.runner.cancel_all()
+        self.generation += 1
+        generation = self.generation
+
+        params_by_scope = {
+            "semester": (semester_id,) if semester_id else None,
+            "course": tuple(course_data) if course_data else None,
+        }
+        for key, _, function_name, scope in DASHBOARD_REPORTS:
+            status, table = self.panels[key]
+            table.model().clear()
+            params = params_by_scope[scope]
+            if params is None:
+                status.setText(f"Select a {scope} to see this report.")
+                continue
+
+            status.setText("Loading...")
+            started = time.monotonic()
+            self.runner.submit(
+                ResultsQueries.execute_function,
+                function_name,
+                params,
+                on_result=lambda payload, k=key, f=function_name, t=started: self.show_panel(
+                    generation, k, f, t, *payload
+                ),
+                on_error=lambda message, k=key: self.show_panel_error(generation, k, message),
+            )
+
+    def show_panel(self, generation, key, function_name, started, results, columns):
+
+        if generation != self.generation:
+            return
+        status, table = self.panels[key]
+        elapsed = time.monotonic() - started
+        text = f"{len(results)} rows in {elapsed:.2f}s"
+
+        if function_name.endswith("_snapshot") and columns:
+            # Snapshot data carries its refresh time in the last column
+            columns = columns[:-1]
+            if results and results[0][-1] is not None:
+                text += f" · data as of {results[0][-1].astimezone().strftime('%Y-%m-%d %H:%M')}"
+
+        table.model().set_rows(results, columns)
+        status.setText(text)
+
+    def show_panel_error(self, generation, key, message):
+
+        if generation != self.generation:
+            return
+        status, _ = self.panels[key]
+        status.setText(f"Failed: {message}")
+
+    def go_back_to_results_menu(self):
+
+        self.runner.cancel_all()
+        if self.results_parent:
+            self.results_parent.show_menu()
@@ -17,12 +17,17 @@ from PyQt5.QtWidgets import (
     QDateEdit,
 )
 from db import student_crud_queries
+from ui.paged_loader import PagedLoader, reserve_table_rows
 
 
 class StudentView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.initUI()
+        self.loaders = {
+            table: PagedLoader(table, lambda rows, first, t=table: self.fill_table(t, rows, first))
+            for table in (self.read_table, self.update_table, self.delete_table)
+        }
 
     def initUI(self):
         main_layout = QVBoxLayout(self)
@@ -248,11 +253,15 @@ class StudentView(QWidget):
     def perform_search(self, target_table=None):
         if not target_table:
             target_table = self.read_table
-        results = student_crud_queries.StudentCRUD.get_all_students(
-            self.search_field.currentText(), self.search_input.text()
+        self.loaders[target_table].start(
+            student_crud_queries.StudentCRUD.get_students_page,
+            search_field=self.search_field.currentText(),
+            search_value=self.search_input.text(),
         )
-        target_table.setRowCount(len(results))
-        for row, data in enumerate(results):
+
+    def fill_table(self, target_table, results, first_page):
+        start = reserve_table_rows(target_table, results, first_page)
+        for row, data in enumerate(results, start):
             for col, val in enumerate(data):
                 target_table.setItem(
                     row, col, QTableWidgetItem(str(val) if val is not None else "")
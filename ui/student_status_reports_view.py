@@ -12,13 +12,15 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QPushButton,
     QStackedWidget,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
 from db.results_queries import ResultsQueries
+from ui.query_worker import BusyIndicator, QueryRunner
+from ui.report_exporter import ReportExporter
+from ui.result_table_model import ResultTableModel
 
 
 class StudentStatusReportsView(QWidget):
@@ -34,6 +36,14 @@ class StudentStatusReportsView(QWidget):
         self.stack = QStackedWidget()
         self.layout.addWidget(self.stack)
 
+        # Report functions run in the background
+        self.runner = QueryRunner(self)
+        self.layout.addWidget(BusyIndicator(self.runner, "Loading report..."))
+
+        # Exports re-run the report function shown in each table
+        self.exporter = ReportExporter(self)
+        self.report_sources = {}  # report_type -> (function_name, params)
+
         # Menu page (index 0)
         self.menu_page = self.create_menu_page()
         self.stack.addWidget(self.menu_page)
@@ -147,12 +157,13 @@ class StudentStatusReportsView(QWidget):
         layout.addLayout(filter_layout)
 
         # Table
-        table = QTableWidget()
+        table = QTableView()
         table.setObjectName(f"{report_type}_table")
-        table.setSelectionBehavior(QTableWidget.SelectRows)
-        table.setSelectionMode(QTableWidget.SingleSelection)
+        table.setModel(ResultTableModel(alignment=Qt.AlignCenter))
+        table.setSelectionBehavior(QTableView.SelectRows)
+        table.setSelectionMode(QTableView.SingleSelection)
         table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setEditTriggers(QTableView.NoEditTriggers)
         layout.addWidget(table)
         setattr(self, f"{report_type}_table", table)
 
@@ -212,9 +223,6 @@ class StudentStatusReportsView(QWidget):
     def load_report_data(self, report_type):
 
         try:
-            results = []
-            columns = []
-
             if report_type == "passed":
                 semester_combo = getattr(self, f"{report_type}_semester_combo")
                 semester_id = semester_combo.currentData()
@@ -225,11 +233,9 @@ class StudentStatusReportsView(QWidget):
                     )
                     return
 
-                results, columns = ResultsQueries.execute_function(
-                    "get_student_passed_semester", (semester_id,)
-                )
+                function_name, params = "get_student_passed_semester", (semester_id,)
 
-            elif report_type == "failed":
+            elif report_type in ["failed", "resit", "excluded"]:
                 course_combo = getattr(self, f"{report_type}_course_combo")
                 course_data = course_combo.currentData()
 
@@ -241,78 +247,56 @@ class StudentStatusReportsView(QWidget):
 
                 course_id, dept_id = course_data
 
-                results, columns = ResultsQueries.execute_function(
-                    "get_students_failing_module", (course_id, dept_id)
-                )
-
-            elif report_type == "resit":
-                course_combo = getattr(self, f"{report_type}_course_combo")
-                course_data = course_combo.currentData()
-
-                if not course_data:
-                    QMessageBox.warning(
-                        self, "Selection Required", "Please select a course."
-                    )
-                    return
-
-                course_id, dept_id = course_data
-
-                results, columns = ResultsQueries.execute_function(
-                    "get_students_resit_eligible", (course_id, dept_id)
-                )
-
-            elif report_type == "excluded":
-                course_combo = getattr(self, f"{report_type}_course_combo")
-                course_data = course_combo.currentData()
-
-                if not course_data:
-                    QMessageBox.warning(
-                        self, "Selection Required", "Please select a course."
-                    )
-                    return
-
-                course_id, dept_id = course_data
+                function_name = {
+                    "failed": "get_students_failing_module",
+                    "resit": "get_students_resit_eligible",
+                    "excluded": "get_students_excluded_from_module",
+                }[report_type]
+                params = (course_id, dept_id)
+
+            else:
+                return
+
+            # Run the report function in the background
+            self.report_sources[report_type] = (function_name, params)
+            self.runner.submit(
+                ResultsQueries.execute_function,
+                function_name,
+                params,
+                on_result=lambda payload: self.show_report_data(report_type, *payload),
+                on_error=lambda message: QMessageBox.critical(
+                    self, "Error", f"Failed to load report: {message}"
+                ),
+            )
 
-                results, columns = ResultsQueries.execute_function(
-                    "get_students_excluded_from_module", (course_id, dept_id)
-                )
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load report: {str(e)}")
+            print(f"❌ Error loading {report_type} report: {e}")
 
-            # Filter by search term
-            search_input = getattr(self, f"{report_type}_search")
-            search_term = search_input.text().strip().lower()
+    def show_report_data(self, report_type, results, columns):
 
-            if search_term and len(results) > 0:
-                # Filter results by student name (usually in columns 1 and 2)
-                results = [
-                    row
-                    for row in results
-                    if (len(row) > 1 and search_term in str(row[1]).lower())
-                    or (len(row) > 2 and search_term in str(row[2]).lower())
-                ]
+        # Filter by search term
+        search_input = getattr(self, f"{report_type}_search")
+        search_term = search_input.text().strip().lower()
 
-            # Display in table
-            self.populate_table(report_type, results, columns)
+        if search_term and len(results) > 0:
+            # Filter results by student name (usually in columns 1 and 2)
+            results = [
+                row
+                for row in results
+                if (len(row) > 1 and search_term in str(row[1]).lower())
+                or (len(row) > 2 and search_term in str(row[2]).lower())
+            ]
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load report: {str(e)}")
-            print(f"❌ Error loading {report_type} report: {e}")
+        # Display in table
+        self.populate_table(report_type, results, columns)
 
     def populate_table(self, report_type, results, columns):
 
         table = getattr(self, f"{report_type}_table")
 
-        # Setup table
-        table.setRowCount(len(results))
-        table.setColumnCount(len(columns))
-        table.setHorizontalHeaderLabels(columns)
-
-        # Populate data
-        for row_idx, row in enumerate(results):
-            for col_idx, value in enumerate(row):
-                item = QTableWidgetItem(str(value) if value is not None else "")
-                item.setTextAlignment(Qt.AlignCenter)
-                table.setItem(row_idx, col_idx, item)
-
+        # Hand the raw rows to the model; cells are formatted on paint
+        table.model().set_rows(results, columns)
         table.resizeColumnsToContents()
 
         # Show message if no results
@@ -323,57 +307,25 @@ class StudentStatusReportsView(QWidget):
 
     def export_report(self, report_type):
 
-        from PyQt5.QtWidgets import QFileDialog
-        import csv
-
         table = getattr(self, f"{report_type}_table")
 
-        if table.rowCount() == 0:
+        model = table.model()
+        if model.rowCount() == 0 or report_type not in self.report_sources:
             QMessageBox.warning(
                 self, "No Data", "No data to export. Please load a report first."
             )
             return
 
-        # Get file path
-        file_path, _ = QFileDialog.getSaveFileName(
-            self,
-            "Export Report",
-            f"{report_type}_students_report.csv",
-            "CSV Files (*.csv)",
-        )
-
-        if not file_path:
-            return
-
-        try:
-            with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.writer(csvfile)
-
-                # Write headers
-                headers = [
-                    table.horizontalHeaderItem(i).text()
-                    for i in range(table.columnCount())
-                ]
-                writer.writerow(headers)
-
-                # Write data
-                for row in range(table.rowCount()):
-                    row_data = [
-                        table.item(row, col).text() if table.item(row, col) else ""
-                        for col in range(table.columnCount())
-                    ]
-                    writer.writerow(row_data)
+        # Same name filter as show_report_data (columns 1 and 2), applied in SQL
+        search_term = getattr(self, f"{report_type}_search").text().strip()
+        search = (model.headers()[1:3], search_term) if search_term else None
 
-            QMessageBox.information(
-                self, "Export Successful", f"Report exported to:\n{file_path}"
-            )
-
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Export Failed", f"Failed to export report:\n{str(e)}"
-            )
+        # Streams the full result to the file in the background
+        function_name, params = self.report_sources[report_type]
+        self.exporter.export(function_name, params, f"{report_type}_students_report", search)
 
     def go_back_to_results_menu(self):
 
+        self.runner.cancel_all()
         if self.results_parent:
             self.results_parent.show_menu()
@@ -0,0 +1,142 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+    QPushButton, QLabel, QComboBox, QHeaderView, QMessageBox
+)
+from db import reservation_queries
+from db.timetable_generator import DAY_NAMES, TimetableGenerator
+from ui.query_worker import BusyIndicator, QueryRunner
+from ui.result_table_model import ResultTableModel, short_time
+
+
+class TimetableGeneratorTab(QWidget):
+    """Tab for generating a semester timetable and saving it as reservations"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.runner = QueryRunner(self)
+        self.generator = None
+        self.initUI()
+        self.load_semesters()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+
+        # Header
+        header = QLabel("Timetable Generator")
+        header.setStyleSheet("font-size: 18px; font-weight: bold;")
+        header.setAlignment(Qt.AlignCenter)
+        layout.addWidget(header)
+
+        # Controls
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Semester:"))
+
+        self.semester_combo = QComboBox()
+        controls.addWidget(self.semester_combo)
+
+        self.generate_btn = QPushButton("Generate")
+        self.generate_btn.clicked.connect(self.generate)
+        controls.addWidget(self.generate_btn)
+
+        self.save_btn = QPushButton("Save Reservations")
+        self.save_btn.setEnabled(False)
+        self.save_btn.clicked.connect(self.save)
+        controls.addWidget(self.save_btn)
+
+        controls.addStretch()
+        layout.addLayout(controls)
+        layout.addWidget(BusyIndicator(self.runner, "Working..."))
+
+        self.summary_label = QLabel("Choose a semester and click Generate.")
+        layout.addWidget(self.summary_label)
+
+        # Proposed weekly timetable
+        self.table = QTableView()
+        self.model = ResultTableModel(
+            columns=["Day", "Start", "End", "Course", "Activity", "Instructor ID", "Building", "Room", "Students"],
+            accessors=[
+                lambda p: DAY_NAMES[p[1]],
+                lambda p: p[2],
+                lambda p: p[3],
+                lambda p: p[0].course_name,
+                lambda p: p[0].activity_type,
+                lambda p: p[0].instructor_id,
+                lambda p: p[4],
+                lambda p: p[5],
+                lambda p: p[0].size,
+            ],
+            formatters={1: short_time, 2: short_time},
+        )
+        self.table.setModel(self.model)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        layout.addWidget(self.table)
+
+    def load_semesters(self):
+        self.semester_data = {}
+        self.semester_combo.clear()
+        for semester_id, name, start_date, end_date in reservation_queries.ReservationQueries.get_all_semesters():
+            self.semester_combo.addItem(name)
+            self.semester_data[name] = (semester_id, start_date, end_date)
+
+    def generate(self):
+        name = self.semester_combo.currentText()
+        if name not in self.semester_data:
+            QMessageBox.warning(self, "No Semester", "Please select a semester.")
+            return
+
+        semester_id, start_date, end_date = self.semester_data[name]
+        self.generator = TimetableGenerator(semester_id, start_date, end_date)
+        self.save_btn.setEnabled(False)
+        self.generate_btn.setEnabled(False)
+        self.model.set_rows([])
+        self.runner.submit(
+            self.generator.generate,
+            on_result=self.show_timetable,
+            on_error=self.show_error,
+            on_cancelled=lambda: self.generate_btn.setEnabled(True),
+        )
+
+    def show_timetable(self, result):
+        placements, unplaced = result
+        self.generate_btn.setEnabled(True)
+        self.model.set_rows(placements)
+        self.save_btn.setEnabled(bool(placements))
+
+        summary = f"{len(placements)} weekly sessions placed"
+        if unplaced:
+            missing = sorted({f"{s.course_name} ({s.activity_type})" for s in unplaced})
+            summary += f", {len(unplaced)} could not be placed: " + ", ".join(missing[:10])
+            if len(missing) > 10:
+                summary += ", ..."
+        self.summary_label.setText(summary)
+
+    def save(self):
+        if self.generator is None:
+            return
+        reply = QMessageBox.question(
+            self, "Save Timetable",
+            f"Create reservations for {self.model.rowCount()} weekly sessions "
+            f"for every week of the semester?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        self.save_btn.setEnabled(False)
+        self.runner.submit(
+            self.generator.save,
+            on_result=self.show_saved,
+            on_error=self.show_error,
+        )
+
+    def show_saved(self, new_ids):
+        QMessageBox.information(self, "Success", f"{len(new_ids)} reservations created successfully!")
+        self.summary_label.setText(f"Saved {len(new_ids)} reservations.")
+
+    def show_error(self, message):
+        self.generate_btn.setEnabled(True)
+        self.save_btn.setEnabled(self.generator is not None and self.generator.model is not None)
+        QMessageBox.critical(self, "Error", f"Timetable generation failed:\n{message}")
@@ -0,0 +1,108 @@
+# ui/view_cache.py
+# Purpose: Keep one live view per MainWindow section instead of creating a
+# new widget on every sidebar click. Least recently used views are evicted
+# once the cache holds more than max_views, or when the process grows past
+# an optional memory budget.
+
+import os
+from collections import OrderedDict
+
+from ui.query_worker import QueryRunner
+
+
+def current_rss_mb():
+    """Resident memory of this process in MB, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class ViewCache:
+    def __init__(self, stack, max_views=4, memory_budget_mb=None):
+        """
+        Args:
+            stack: QStackedWidget the views live in
+            max_views: Maximum number of cached section views (LRU eviction)
+            memory_budget_mb: Optional process RSS budget; LRU views are evicted
+                              while it is exceeded (the visible view is kept)
+        """
+        self.stack = stack
+        self.max_views = max_views
+        self.memory_budget_mb = memory_budget_mb
+        self._factories = {}
+        self._views = OrderedDict()  # key -> view, least recently used first
+
+    def register(self, key, factory):
+        """factory() must return a new view widget for the section."""
+        self._factories[key] = factory
+
+    def get(self, key):
+        return self._views.get(key)
+
+    def show(self, key):
+        """Shows the cached view for a section, creating it on first use."""
+        view = self._views.get(key)
+        if view is None:
+            view = self._factories[key]()
+            self.stack.addWidget(view)
+            self._views[key] = view
+        self._views.move_to_end(key)
+        self.stack.setCurrentWidget(view)
+        self._enforce_limits()
+        return view
+
+    def refresh(self, key):
+        """
+        Reloads a section. Views that define refresh() reload their data in
+        place; anything else is rebuilt from its factory.
+        """
+        view = self._views.get(key)
+        if view is None:
+            return self.show(key)
+        if callable(getattr(view, "refresh", None)):
+            view.refresh()
+            return view
+        visible = self.stack.currentWidget() is view
+        self.evict(key)
+        return self.show(key) if visible else None
+
+    def evict(self, key):
+        view = self._views.pop(key, None)
+        if view is None:
+            return
+        # Drop any background queries whose results would land in a dead widget
+        for runner in view.findChildren(QueryRunner):
+            runner.cancel_all()
+        self.stack.removeWidget(view)
+        view.deleteLater()
+
+    def clear(self):
+        for key in list(self._views):
+            self.evict(key)
+
+    def keys(self):
+        return list(self._views)
+
+    def _enforce_limits(self):
+        current = self.stack.currentWidget()
+
+        while len(self._views) > self.max_views:
+            if not self._evict_oldest(current):
+                break
+
+        # deleteLater() frees memory only after the event loop runs, so RSS cannot
+        # be re-measured right away: evict one view per navigation while over budget
+        if self.memory_budget_mb and len(self._views) > 1:
+            rss = current_rss_mb()
+            if rss is not None and rss > self.memory_budget_mb:
+                self._evict_oldest(current)
+
+    def _evict_oldest(self, keep):
+        for key, view in self._views.items():
+            if view is not keep:
+                self.evict(key)
+                return True
+        return False